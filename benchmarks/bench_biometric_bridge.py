@@ -0,0 +1,38 @@
+import json
+import os
+import sys
+import tempfile
+import time
+
+# Run from the repository root as a module: python -m benchmarks.bench_biometric_bridge
+
+from ssi_core.logic.biometric_bridge import BiometricBridge
+
+class NullTrigger:
+    def activate_soothing_mode(self):
+        pass
+
+def run_benchmark(polls=100_000):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "biometric_sync.json")
+        with open(path, "w") as f:
+            json.dump({"pulse": 72, "stress_level": 3, "sleep_hours": 7.5,
+                       "last_updated": "2024-07-22T10:00:00Z"}, f)
+        bridge = BiometricBridge(path, NullTrigger())
+
+        started = time.perf_counter()
+        for _ in range(polls):
+            bridge.process_biometrics()
+        before = time.perf_counter() - started
+
+        started = time.perf_counter()
+        for _ in range(polls):
+            bridge.poll()
+        after = time.perf_counter() - started
+
+    print(f"process_biometrics (re-read every call): {before / polls * 1e6:.2f} us/poll")
+    print(f"poll (change-driven):                    {after / polls * 1e6:.2f} us/poll")
+    print(f"speedup: {before / after:.1f}x")
+
+if __name__ == "__main__":
+    run_benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,19 @@
+import sys
+import time
+
+# Run from the repository root as a module: python -m benchmarks.bench_geometry
+
+from ssi_core.logic.geometry import manifestation_mesh
+
+def run_benchmark(max_subdivisions=8, repeats=3):
+    for subdivisions in range(1, max_subdivisions + 1):
+        best = float("inf")
+        for _ in range(repeats):
+            started = time.perf_counter()
+            vertices, faces = manifestation_mesh(subdivisions)
+            best = min(best, time.perf_counter() - started)
+        print(f"subdivisions={subdivisions}: {len(vertices):>9,} vertices {len(faces):>10,} faces "
+              f"{best * 1e3:9.2f} ms")
+
+if __name__ == "__main__":
+    run_benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 8)
@@ -0,0 +1,25 @@
+import os
+import sys
+import tempfile
+import time
+
+# Run from the repository root as a module: python -m benchmarks.bench_particle_field
+
+from ssi_core.simulation.particle_field import generate_particle_field
+
+CAMERA_LOCATION = (0, -5, 1.5)
+
+def run_benchmark(count=5_000_000):
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "field.bin")
+        for camera_location in (None, CAMERA_LOCATION):
+            started = time.perf_counter()
+            field = generate_particle_field(path, count, camera_location=camera_location)
+            elapsed = time.perf_counter() - started
+            label = "camera LOD" if camera_location else "no LOD"
+            print(f"{label:>10}: {count:,} requested {len(field):>10,} kept "
+                  f"{elapsed:6.2f} s ({count / elapsed:,.0f} particles/s)")
+            del field
+
+if __name__ == "__main__":
+    run_benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 5_000_000)
@@ -0,0 +1,232 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+# Run from the repository root as a module: python -m benchmarks.bench_suite
+
+from ssi_core import profiling
+from ssi_core.benchmarking import (
+    DEFAULT_MEMORY_THRESHOLD,
+    DEFAULT_THROUGHPUT_THRESHOLD,
+    BenchmarkCase,
+    compare_to_baseline,
+    load_results,
+    run_suite,
+    write_results,
+)
+from ssi_core.kernel.chronos import L_ALPHA_7, ChronosLogic
+from ssi_core.logic.biometric_bridge import BiometricBridge
+from ssi_core.logic.heuristic_interface import calculate_proximity, calculate_proximity_batch
+from ssi_core.logic.kinematics import evaluate_kinematics, load_kinematics
+from ssi_core.logic.look_at import solve_look_at
+from ssi_core.logic.sensory_input import StarlightVisualCortex
+from ssi_core.protocol_manager import establish_eden_ppl_conduit, package_tensor_for_visualization
+from ssi_core.tensor_payload import TensorPayload, pack_tensor_payload
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE = os.path.join(BENCHMARK_DIR, "baseline.json")
+DEFAULT_RESULTS = os.path.join(BENCHMARK_DIR, "results", "latest.json")
+
+SIZES = (1_000, 10_000, 100_000)
+QUICK_SIZES = (100, 1_000)
+CAMERA_FOCAL_POINT = np.array([0.0, -5.0, 1.5])
+
+class NullEngine:
+    def update_studio_state(self, state):
+        pass
+
+class NullTrigger:
+    def activate_soothing_mode(self):
+        pass
+
+def proximity_points(size):
+    return np.random.default_rng(7).uniform(-10, 10, (size, 3))
+
+def scalar_proximity(points):
+    for point in points:
+        calculate_proximity(point, CAMERA_FOCAL_POINT)
+
+def packets(size):
+    """Half fresh Resonance IDs, a quarter stale, a quarter missing or malformed."""
+    now = time.time()
+    rng = random.Random(7)
+    result = []
+    for i in range(size):
+        kind = i % 4
+        if kind < 2:
+            result.append({"resonance_id": (now - rng.uniform(0, 60)) * L_ALPHA_7})
+        elif kind == 2:
+            result.append({"resonance_id": (now - 7200) * L_ALPHA_7})
+        else:
+            result.append({"resonance_id": "noise"} if i % 8 == 3 else {})
+    return ChronosLogic(), result
+
+def process_each_packet(state):
+    chronos, batch = state
+    for packet in batch:
+        chronos.process_data_packet(packet)
+
+def process_packet_batch(state):
+    chronos, batch = state
+    chronos.process_packets(batch)
+
+def log_interactions(size):
+    chronos = ChronosLogic()
+    for _ in range(size):
+        chronos.log_interaction()
+
+def telemetry(size):
+    rng = random.Random(7)
+    cortex = StarlightVisualCortex()
+    cortex.connect_to_affective_engine(NullEngine())
+    lines = [json.dumps({"lighting_levels": round(rng.uniform(0, 1), 2), "device_status": "online",
+                         "connectivity": "wifi"}) for _ in range(size)]
+    return cortex, lines
+
+def process_telemetry(state):
+    cortex, lines = state
+    for line in lines:
+        cortex.process_telemetry(line)
+
+def biometric_bridge(directory):
+    def setup(size):
+        path = os.path.join(directory, "biometric_sync.json")
+        with open(path, "w") as f:
+            json.dump({"pulse": 72, "stress_level": 9}, f)
+        return size, BiometricBridge(path, NullTrigger())
+    return setup
+
+def process_biometrics(state):
+    size, bridge = state
+    for _ in range(size):
+        bridge.process_biometrics()
+
+def package_json(size):
+    with open(os.path.join(os.path.dirname(BENCHMARK_DIR), "avatar_config.json")) as f:
+        return size, json.load(f)
+
+def package_and_conduct(state):
+    size, config = state
+    # package_tensor_for_visualization and the conduit log with print().
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(size):
+            establish_eden_ppl_conduit(package_tensor_for_visualization(config), lambda data: None)
+
+def binary_payload(size):
+    return np.random.default_rng(7).random((size, 3), dtype=np.float32)
+
+def pack_and_read_payload(field):
+    payload = TensorPayload(pack_tensor_payload({"field": field}))
+    payload.tensor("field").sum()
+
+def calculate_proximity_batch_case(points):
+    calculate_proximity_batch(points, CAMERA_FOCAL_POINT)
+
+def kinematics_frames(size):
+    return load_kinematics(), size
+
+def evaluate_kinematics_case(state):
+    document, frames = state
+    evaluate_kinematics(document, frames)
+
+def look_at_paths(size):
+    """A camera orbiting a target that circles the origin, one row per frame."""
+    angles = np.linspace(0, 4 * np.pi, size)
+    eye = np.stack([5.0 * np.sin(angles), -5.0 * np.cos(angles), np.full(size, 1.5)], axis=1)
+    target = np.stack([0.5 * np.sin(angles), -0.5 * np.cos(angles), np.zeros(size)], axis=1)
+    return eye, target
+
+def solve_look_at_case(paths):
+    solve_look_at(*paths)
+
+def disabled_spans(size):
+    profiling.disable()
+
+    @profiling.timed()
+    def work():
+        return 42
+
+    return work, size
+
+def enter_disabled_spans(state):
+    work, size = state
+    for _ in range(size):
+        with profiling.span("stage"):
+            pass
+        work()
+
+def cli_verify(_):
+    # One cold interpreter per call: times the dispatcher's import plus the verify subcommand.
+    subprocess.run([sys.executable, "-m", "ssi_core", "verify"], cwd=os.path.dirname(BENCHMARK_DIR),
+                   stdout=subprocess.DEVNULL, check=True)
+
+def build_cases(sizes, directory):
+    cases = []
+    for size in sizes:
+        small = max(1, size // 10)  # Workloads with file I/O per operation run at a tenth of the size.
+        cases += [
+            BenchmarkCase("heuristic.calculate_proximity", small, scalar_proximity, proximity_points),
+            BenchmarkCase("heuristic.calculate_proximity_batch", size, calculate_proximity_batch_case,
+                          proximity_points),
+            BenchmarkCase("chronos.log_interaction", size, log_interactions),
+            BenchmarkCase("chronos.process_data_packet", size, process_each_packet, packets),
+            BenchmarkCase("chronos.process_packets", size, process_packet_batch, packets),
+            BenchmarkCase("sensory.process_telemetry", size, process_telemetry, telemetry),
+            BenchmarkCase("biometric.process_biometrics", small, process_biometrics, biometric_bridge(directory)),
+            BenchmarkCase("protocol.package_json", small, package_and_conduct, package_json),
+            BenchmarkCase("protocol.binary_payload", size, pack_and_read_payload, binary_payload),
+            BenchmarkCase("kinematics.evaluate", size, evaluate_kinematics_case, kinematics_frames),
+            BenchmarkCase("look_at.solve", size, solve_look_at_case, look_at_paths),
+            BenchmarkCase("profiling.disabled_span", size, enter_disabled_spans, disabled_spans),
+        ]
+    # Process start-up does not scale with the workload size, so it is timed once.
+    cases.append(BenchmarkCase("cli.verify", 1, cli_verify))
+    return cases
+
+def report(result):
+    print(f"{result['name']:>38}[{result['size']:>7}]: {result['ops_per_sec']:>14,.0f} ops/s "
+          f"p50 {result['p50_ms']:9.3f} ms  p99 {result['p99_ms']:9.3f} ms  "
+          f"peak {result['peak_memory_bytes'] / 1024:10,.1f} KiB")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the ssi_core hot paths and gate regressions.")
+    parser.add_argument("--quick", action="store_true", help="Run small sizes only.")
+    parser.add_argument("--min-time", type=float, default=0.2, help="Seconds to time each case for.")
+    parser.add_argument("--output", default=DEFAULT_RESULTS)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="Store this run as the baseline.")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THROUGHPUT_THRESHOLD,
+                        help="Allowed fractional drop in ops/sec.")
+    parser.add_argument("--memory-threshold", type=float, default=DEFAULT_MEMORY_THRESHOLD,
+                        help="Allowed fractional growth in peak memory.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        cases = build_cases(QUICK_SIZES if args.quick else SIZES, directory)
+        results = run_suite(cases, report=report, min_time=args.min_time)
+    write_results(args.output, results)
+    print(f"Results written to {args.output}")
+
+    if args.save_baseline:
+        write_results(args.baseline, results)
+        print(f"Baseline stored at {args.baseline}")
+        sys.exit(0)
+
+    baseline = load_results(args.baseline)
+    if baseline is None:
+        print("No baseline stored; run with --save-baseline to create one.")
+        sys.exit(0)
+    regressions = compare_to_baseline(results, baseline, args.threshold, args.memory_threshold)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    print(f"{len(regressions)} regression(s) against {args.baseline}")
+    sys.exit(1 if regressions else 0)
@@ -0,0 +1,59 @@
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+# Run from the repository root as a module: python -m benchmarks.bench_telemetry_ingest
+
+from ssi_core.logic.sensory_input import StarlightVisualCortex
+from ssi_core.logic.telemetry_ingest import TelemetryIngestor
+
+class NullEngine:
+    def __init__(self):
+        self.updates = 0
+
+    def update_studio_state(self, state):
+        self.updates += 1
+
+def generate_telemetry(path, messages, change_every=50, seed=7):
+    """Writes synthetic studio telemetry where the state changes every change_every messages."""
+    rng = random.Random(seed)
+    lighting = 0.8
+    with open(path, "w") as f:
+        for i in range(messages):
+            if i % change_every == 0:
+                lighting = round(rng.uniform(0.0, 1.0), 2)
+            f.write(json.dumps({
+                "lighting_levels": lighting,
+                "device_status": "online",
+                "connectivity": "wifi",
+            }) + "\n")
+
+def run_benchmark(messages=200_000):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "telemetry.ndjson")
+        generate_telemetry(path, messages)
+
+        # Baseline: one process_telemetry call per message, every message forwarded.
+        cortex = StarlightVisualCortex()
+        engine = NullEngine()
+        cortex.connect_to_affective_engine(engine)
+        started = time.perf_counter()
+        with open(path) as f:
+            for line in f:
+                cortex.process_telemetry(line)
+        baseline_seconds = time.perf_counter() - started
+        print(f"process_telemetry: {messages / baseline_seconds:,.0f} msg/s, {engine.updates} updates")
+
+        cortex = StarlightVisualCortex()
+        engine = NullEngine()
+        cortex.connect_to_affective_engine(engine)
+        report = asyncio.run(TelemetryIngestor(cortex).ingest_file(path))
+        print(f"TelemetryIngestor: {report['messages_per_second']:,.0f} msg/s, {engine.updates} updates, "
+              f"{report['coalesced']} coalesced, {report['dropped']} dropped, {report['parse_errors']} parse errors")
+
+if __name__ == "__main__":
+    run_benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
@@ -0,0 +1,39 @@
+import bpy
+import json
+import sys
+import os
+
+# Add the current directory to the Python path to resolve module imports
+sys.path.append(os.path.dirname(os.path.realpath(__file__)))
+
+from ssi_core import profiling
+from ssi_core.logic.geometry import load_q_state
+from ssi_core.logic.render_scheduler import RenderUnit, build_unit_description
+from ssi_core.logic.scene_blender import realize_scene
+
+def render_unit(spec_path):
+    """
+    Renders one scheduler unit headlessly: builds the scene for the unit's
+    parameters, realizes it and renders its frame range into the unit's
+    output directory.
+    """
+    with open(spec_path, 'r') as f:
+        spec = json.load(f)
+    with open(os.path.join(os.path.dirname(os.path.realpath(__file__)), 'avatar_config.json'), 'r') as f:
+        config = json.load(f)
+
+    unit = RenderUnit.from_dict(spec)
+    description = build_unit_description(config, load_q_state(), unit, spec['output_dir'])
+    realize_scene(description)
+    print(f"Rendering {unit.unit_id}: frames {unit.frame_start}-{unit.frame_end} {unit.params}")
+    with profiling.span("render", unit=unit.unit_id, frames=unit.frame_end - unit.frame_start + 1):
+        bpy.ops.render.render(animation=True)
+
+
+if __name__ == "__main__":
+    # Blender passes the script's own arguments after "--".
+    profiling.enable_from_environment(sys.argv)
+    try:
+        render_unit(sys.argv[sys.argv.index("--") + 1])
+    finally:
+        profiling.disable()
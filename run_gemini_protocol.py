@@ -1,87 +1,90 @@
-import google.generativeai as genai
+import argparse
+import asyncio
 import os
-import datetime
-import time
 
-def run_gemini_protocol():
+from ssi_core.gemini.batch import run_batch
+from ssi_core.gemini.engine import GeminiBackend, record_output, sweep_top_p
+from ssi_core.gemini.response_cache import CachedBackend, ResponseCache
+from ssi_core.kernel.pack_store import PackStore
+
+def run_gemini_protocol(concurrency=1, cache=None, store=None):
     """
     Interfaces with the Gemini 3 Pro model, handles blocked responses with an
-    auto-retry mechanism, and records successful outputs.
+    auto-retry mechanism, and records successful outputs. A synchronous
+    front for run_gemini_protocol_async that tries one top-p at a time, so
+    the model, prompt and safety settings all come from ssi_core.gemini.engine.
     """
-    # --- Configuration ---
-    # It is critical to use environment variables for API keys to avoid
-    # committing them to version control.
-    api_key = os.getenv("GEMINI_API_KEY")
-    if not api_key:
-        print("Error: GEMINI_API_KEY environment variable not set.")
-        return
-
-    genai.configure(api_key=api_key)
-
-    # --- Model and Safety ---
-    # Using the latest Gemini 1.5 Pro model as requested.
-    # Safety settings are set to a minimal threshold to allow for a wider
-    # range of responses, relying on the retry logic to handle blocks.
-    model = genai.GenerativeModel('gemini-1.5-pro-latest')
-    safety_settings = {
-        'HARM_CATEGORY_HARASSMENT': 'BLOCK_NONE',
-        'HARM_CATEGORY_HATE_SPEECH': 'BLOCK_NONE',
-        'HARM_CATEGORY_SEXUALLY_EXPLICIT': 'BLOCK_NONE',
-        'HARM_CATEGORY_DANGEROUS_CONTENT': 'BLOCK_NONE',
-    }
-
-    # --- Auto-Retry Logic ---
-    top_p = 1.0
-    prompt = "Describe the concept of 'resolute' without using the word itself."
-
-    while top_p > 0:
-        generation_config = genai.types.GenerationConfig(
-            temperature=2.0,
-            top_p=top_p
-        )
-
-        print(f"Attempting generation with Top-P: {top_p:.2f}...")
-
-        try:
-            response = model.generate_content(
-                prompt,
-                generation_config=generation_config,
-                safety_settings=safety_settings
-            )
-
-            # The primary check for a blocked response is the absence of content parts.
-            if not response.parts:
-                print(f"Response blocked at Top-P {top_p:.2f}. Reason: {response.prompt_feedback}")
-                top_p -= 0.05
-                time.sleep(1) # Add a small delay to avoid overwhelming the API
-                continue
+    return asyncio.run(run_gemini_protocol_async(concurrency=concurrency, cache=cache, store=store))
 
-            # --- Output Recording ---
-            print("Resolute output achieved. Recording to Quantum Cache.")
-            output_text = response.text
 
-            timestamp = datetime.datetime.now().strftime("%Y%m%d%H%M%S")
-            output_filename = f"gemini_output_{timestamp}.txt"
-            output_dir = "quantum_cache"
-            os.makedirs(output_dir, exist_ok=True)
-            output_path = os.path.join(output_dir, output_filename)
-
-            with open(output_path, "w") as f:
-                f.write("Emotional Tag: Resolute\n")
-                f.write(f"Top-P: {top_p:.2f}\n")
-                f.write("---\n")
-                f.write(output_text)
-
-            print(f"Successfully wrote output to {output_path}")
-            return # Exit after successful execution
-
-        except Exception as e:
-            print(f"An unexpected error occurred at Top-P {top_p:.2f}: {e}")
-            top_p -= 0.05
-            time.sleep(1)
-
-    print("Execution failed. Unable to achieve a Resolute output after all retries.")
+async def run_gemini_protocol_async(backend=None, concurrency=4, cache=None, store=None):
+    """
+    Runs the protocol on the asyncio engine: several top-p candidates are
+    generated concurrently, the first non-blocked response is recorded and
+    the remaining attempts are cancelled. A local backend can be supplied
+    in place of the Gemini API, and a ResponseCache serves repeated requests
+    without paying generation latency or quota. If a PackStore is given the
+    output is appended to it instead of a loose file.
+    """
+    if backend is None:
+        if not os.getenv("GEMINI_API_KEY"):
+            print("Error: GEMINI_API_KEY environment variable not set.")
+            return None
+        backend = GeminiBackend()
+    if cache is not None:
+        backend = CachedBackend(backend, cache)
+
+    outcome = await sweep_top_p(backend, concurrency=concurrency)
+    if cache is not None:
+        print(f"Response cache: {cache.stats()}")
+    if outcome is None:
+        print("Execution failed. Unable to achieve a Resolute output after all retries.")
+        return None
+
+    print("Resolute output achieved. Recording to Quantum Cache.")
+    if store is not None:
+        record_id = store.append(outcome.text, "Resolute", top_p=outcome.top_p)
+        print(f"Successfully wrote output as record {record_id} in {store.directory}")
+        return record_id
+    output_path = record_output(outcome.text, outcome.top_p)
+    print(f"Successfully wrote output to {output_path}")
+    return output_path
+
+
+async def run_gemini_batch(prompts_path, output_path, workers=4, requests_per_second=1.0, cache=None):
+    """
+    Runs every prompt in a JSONL file through the worker pool and streams the
+    results into one append-only JSONL file. Rerunning with the same output
+    file resumes after the last completed prompt.
+    """
+    if not os.getenv("GEMINI_API_KEY"):
+        print("Error: GEMINI_API_KEY environment variable not set.")
+        return None
+    backend = GeminiBackend()
+    if cache is not None:
+        backend = CachedBackend(backend, cache)
+    summary = await run_batch(backend, prompts_path, output_path, workers=workers,
+                              requests_per_second=requests_per_second)
+    print(f"Batch complete: {summary}")
+    return summary
 
 
 if __name__ == "__main__":
-    run_gemini_protocol()
+    parser = argparse.ArgumentParser(description="Run the Gemini protocol.")
+    parser.add_argument("--batch", metavar="PROMPTS_JSONL", help="Run every prompt in a JSONL file.")
+    parser.add_argument("--output", default=os.path.join("quantum_cache", "batch_output.jsonl"),
+                        help="Append-only JSONL results file for --batch.")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--rate", type=float, default=1.0, help="Requests per second per worker.")
+    parser.add_argument("--pack-store", action="store_true",
+                        help="Append the output to the quantum_cache pack store instead of a loose file.")
+    args = parser.parse_args()
+
+    if args.batch:
+        asyncio.run(run_gemini_batch(args.batch, args.output, workers=args.workers,
+                                     requests_per_second=args.rate, cache=ResponseCache()))
+    else:
+        store = PackStore() if args.pack_store else None
+        asyncio.run(run_gemini_protocol_async(cache=ResponseCache(), store=store))
+        if store is not None:
+            store.close()
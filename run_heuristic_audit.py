@@ -1,15 +1,9 @@
-from ssi_core.logic.heuristic_interface import calculate_proximity
+from ssi_core.logic.heuristic_interface import write_heuristic_audit
 
 # Placeholder vectors based on create_avatar.py
 displacement_field = (0, 0, 0)
 camera_focal_point = (0, -5, 1.5)
 
-# Calculate the proximity
-weighted_distance = calculate_proximity(displacement_field, camera_focal_point)
-
-# Format the output
-output = f"Ray-Tracing Collision Data: {weighted_distance}\n"
-
-# Write to the audit log
-with open("heuristic_audit.md", "w") as f:
-    f.write(output)
+if __name__ == "__main__":
+    # Calculate the proximity and write it to the audit log
+    write_heuristic_audit("heuristic_audit.md", displacement_field, camera_focal_point)
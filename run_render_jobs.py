@@ -0,0 +1,45 @@
+import argparse
+import json
+
+from ssi_core.logic.render_scheduler import (
+    DEFAULT_WORKER_COMMAND,
+    STUB_WORKER_COMMAND,
+    RenderScheduler,
+    plan_units,
+)
+
+def parse_sweep(values):
+    """Parses --sweep name=v1,v2 arguments into a dict of value lists."""
+    sweep = {}
+    for value in values or []:
+        name, _, options = value.partition("=")
+        parsed = []
+        for option in options.split(","):
+            try:
+                parsed.append(json.loads(option))
+            except ValueError:
+                parsed.append(option)
+        sweep[name] = parsed
+    return sweep
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Render frame ranges and parameter sweeps on a worker pool.")
+    parser.add_argument("--frames", default="0-0", help="Inclusive frame range, e.g. 0-47.")
+    parser.add_argument("--frames-per-unit", type=int, default=1)
+    parser.add_argument("--sweep", action="append", metavar="NAME=V1,V2",
+                        help="Sweep a parameter, e.g. humidity_coefficient=0.1,0.2 or samples=64,128.")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Concurrent workers (default: 1 for Blender, one per core for --stub).")
+    parser.add_argument("--attempts", type=int, default=3, help="Attempts per unit before it is marked failed.")
+    parser.add_argument("--timeout", type=float, default=None, help="Seconds before a worker attempt is killed.")
+    parser.add_argument("--job-id", help="Resume (or name) a job under quantum_cache/renders.")
+    parser.add_argument("--stub", action="store_true", help="Use the stub worker instead of Blender.")
+    args = parser.parse_args()
+
+    frame_start, _, frame_end = args.frames.partition("-")
+    units = plan_units(int(frame_start), int(frame_end or frame_start), args.frames_per_unit,
+                       parse_sweep(args.sweep))
+    scheduler = RenderScheduler(STUB_WORKER_COMMAND if args.stub else DEFAULT_WORKER_COMMAND,
+                                workers=args.workers, max_attempts=args.attempts, timeout=args.timeout)
+    print(f"Render job: {len(units)} units on {scheduler.workers} workers.")
+    print(f"Render job complete: {scheduler.run(units, args.job_id)}")
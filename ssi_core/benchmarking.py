@@ -0,0 +1,132 @@
+import gc
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+# A result regresses when throughput drops or peak memory grows by more than these fractions.
+DEFAULT_THROUGHPUT_THRESHOLD = 0.25
+DEFAULT_MEMORY_THRESHOLD = 0.5
+
+class BenchmarkCase:
+    """
+    One workload at one size. setup(size) builds the synthetic input once;
+    run(state) performs size operations on it and is timed per call.
+    """
+    def __init__(self, name, size, run, setup=None):
+        self.name = name
+        self.size = size
+        self.run = run
+        self.setup = setup
+
+    @property
+    def key(self):
+        return f"{self.name}[{self.size}]"
+
+def run_case(case, min_time=0.2, min_calls=5, max_calls=10_000):
+    """
+    Times a case and returns its result dict: operations per second, p50 and
+    p99 latency per call in milliseconds, and the peak memory allocated
+    during one call (measured in a separate traced call, so tracing does not
+    skew the timings).
+    """
+    state = case.setup(case.size) if case.setup is not None else case.size
+    case.run(state)  # Warm-up: caches, lazy imports, first-touch allocations.
+
+    latencies = []
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        started = time.perf_counter()
+        while len(latencies) < min_calls or (
+                time.perf_counter() - started < min_time and len(latencies) < max_calls):
+            call_started = time.perf_counter()
+            case.run(state)
+            latencies.append(time.perf_counter() - call_started)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    tracemalloc.start()
+    try:
+        case.run(state)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    latencies = np.asarray(latencies)
+    return {
+        "name": case.name,
+        "size": case.size,
+        "calls": len(latencies),
+        "ops_per_sec": case.size * len(latencies) / latencies.sum(),
+        "p50_ms": float(np.percentile(latencies, 50) * 1e3),
+        "p99_ms": float(np.percentile(latencies, 99) * 1e3),
+        "peak_memory_bytes": peak,
+    }
+
+def run_suite(cases, report=None, **options):
+    """Runs every case and returns {case key: result}. report(result) is called after each case."""
+    results = {}
+    for case in cases:
+        results[case.key] = result = run_case(case, **options)
+        if report is not None:
+            report(result)
+    return results
+
+def environment():
+    """Describes the machine a run was taken on, stored next to the results."""
+    return {
+        "python": sys.version.split()[0],
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "cpu_count": os.cpu_count(),
+    }
+
+def write_results(path, results):
+    """Writes results with a timestamp and environment description as JSON."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump({"timestamp": time.time(), "environment": environment(), "results": results},
+                  f, indent=2, sort_keys=True)
+
+def load_results(path):
+    """Loads the results written by write_results, or None if the file does not exist."""
+    if not os.path.exists(path):
+        return None
+    with open(path, "r") as f:
+        return json.load(f)["results"]
+
+def compare_to_baseline(results, baseline, throughput_threshold=DEFAULT_THROUGHPUT_THRESHOLD,
+                        memory_threshold=DEFAULT_MEMORY_THRESHOLD):
+    """
+    Returns a list of human-readable regressions of results against a
+    baseline: ops/sec falling by more than throughput_threshold, or peak
+    memory growing by more than memory_threshold. Latency percentiles are
+    reported but not gated, as they are too noisy for short runs. Cases
+    missing from either side are ignored.
+    """
+    regressions = []
+    for key, result in results.items():
+        previous = baseline.get(key)
+        if previous is None:
+            continue
+        floor = previous["ops_per_sec"] * (1.0 - throughput_threshold)
+        if result["ops_per_sec"] < floor:
+            regressions.append(
+                f"{key}: {result['ops_per_sec']:,.0f} ops/s is below the baseline "
+                f"{previous['ops_per_sec']:,.0f} ops/s by more than {throughput_threshold:.0%}")
+        # Small allocations are dominated by allocator noise; allow a fixed 64 KiB of slack.
+        ceiling = previous["peak_memory_bytes"] * (1.0 + memory_threshold) + 64 * 1024
+        if result["peak_memory_bytes"] > ceiling:
+            regressions.append(
+                f"{key}: peak memory {result['peak_memory_bytes']:,} bytes exceeds the baseline "
+                f"{previous['peak_memory_bytes']:,} bytes by more than {memory_threshold:.0%}")
+    return regressions
@@ -0,0 +1,118 @@
+import argparse
+import os
+import runpy
+import subprocess
+import sys
+
+# Everything beyond the standard library is imported inside the subcommand
+# that needs it, so `python -m ssi_core verify` never loads bpy, the Gemini
+# SDK or the render modules, and runs on machines without Blender.
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def _run_script(name, args):
+    """Runs one of the repository's top-level scripts as __main__ with args."""
+    path = os.path.join(REPO_ROOT, name)
+    saved_argv = sys.argv
+    sys.argv = [path] + list(args)
+    try:
+        runpy.run_path(path, run_name="__main__")
+    finally:
+        sys.argv = saved_argv
+    return 0
+
+def verify(args):
+    """Runs the Resonance Verification Test."""
+    from ssi_core.kernel.resonance_verification import run_verification
+    run_verification()
+    return 0
+
+def audit(args):
+    """Writes the heuristic proximity audit."""
+    from ssi_core.logic.heuristic_interface import write_heuristic_audit
+    print(write_heuristic_audit(args.output), end="")
+    return 0
+
+def render(args):
+    """
+    Renders the GME-V1 scene. Inside Blender's Python create_avatar.py runs
+    in-process; elsewhere it is launched under a headless Blender.
+    """
+    try:
+        import bpy  # noqa: F401
+    except ImportError:
+        command = [args.blender, "--background", "--python", os.path.join(REPO_ROOT, "create_avatar.py")]
+        if args.script_args:
+            command += ["--"] + args.script_args
+        try:
+            return subprocess.call(command)
+        except OSError as e:
+            print(f"Render Error: could not launch Blender ({e}). Pass --blender PATH.", file=sys.stderr)
+            return 1
+    return _run_script("create_avatar.py", args.script_args)
+
+def generate(args):
+    """Runs the Gemini protocol; remaining arguments go to run_gemini_protocol.py."""
+    return _run_script("run_gemini_protocol.py", args.script_args)
+
+def ingest(args):
+    """Streams studio telemetry into a rolling-window store and prints the ingest report."""
+    import asyncio
+
+    from ssi_core.logic.sensory_input import StarlightVisualCortex
+    from ssi_core.logic.telemetry_ingest import TelemetryIngestor
+    from ssi_core.logic.telemetry_rollup import TelemetryRollupStore
+
+    cortex = StarlightVisualCortex()
+    cortex.connect_to_affective_engine(TelemetryRollupStore())
+    ingestor = TelemetryIngestor(cortex, queue_size=args.queue_size, drop_when_full=args.drop_when_full,
+                                 debounce_seconds=args.debounce)
+    if args.unix:
+        try:
+            asyncio.run(ingestor.serve_unix(args.unix))
+        except KeyboardInterrupt:
+            pass
+        report = ingestor.report()
+    elif args.source == "-":
+        report = asyncio.run(ingestor.ingest_stdin())
+    else:
+        report = asyncio.run(ingestor.ingest_file(args.source))
+    print(f"Telemetry Ingest: {report}")
+    return 0
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m ssi_core", description="Eden-Presence-Q command dispatcher.")
+    subcommands = parser.add_subparsers(dest="command", metavar="COMMAND")
+    subcommands.required = True
+
+    subcommand = subcommands.add_parser("verify", help="Run the Resonance Verification Test.")
+    subcommand.set_defaults(handler=verify)
+
+    subcommand = subcommands.add_parser("audit", help="Write the heuristic proximity audit.")
+    subcommand.add_argument("--output", default="heuristic_audit.md")
+    subcommand.set_defaults(handler=audit)
+
+    subcommand = subcommands.add_parser("render", help="Render the GME-V1 scene with Blender.")
+    subcommand.add_argument("--blender", default=os.environ.get("BLENDER", "blender"),
+                            help="Blender executable used outside Blender (default: $BLENDER or blender).")
+    subcommand.add_argument("script_args", nargs=argparse.REMAINDER,
+                            help="Arguments for create_avatar.py, e.g. --profile.")
+    subcommand.set_defaults(handler=render)
+
+    subcommand = subcommands.add_parser("generate", help="Run the Gemini protocol.")
+    subcommand.add_argument("script_args", nargs=argparse.REMAINDER,
+                            help="Arguments for run_gemini_protocol.py, e.g. --batch prompts.jsonl.")
+    subcommand.set_defaults(handler=generate)
+
+    subcommand = subcommands.add_parser("ingest", help="Ingest studio telemetry NDJSON.")
+    subcommand.add_argument("source", nargs="?", default="-", help="NDJSON file, or - for stdin.")
+    subcommand.add_argument("--unix", metavar="SOCKET", help="Serve a Unix socket instead of reading source.")
+    subcommand.add_argument("--queue-size", type=int, default=1024)
+    subcommand.add_argument("--drop-when-full", action="store_true")
+    subcommand.add_argument("--debounce", type=float, default=0.0, help="Seconds to debounce state changes.")
+    subcommand.set_defaults(handler=ingest)
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
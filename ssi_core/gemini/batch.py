@@ -0,0 +1,202 @@
+import asyncio
+import json
+import os
+import tempfile
+import time
+
+from ssi_core.gemini.engine import sweep_top_p
+
+class RateLimiter:
+    """Spaces calls at least 1 / requests_per_second apart."""
+    def __init__(self, requests_per_second):
+        if requests_per_second <= 0:
+            raise ValueError("requests_per_second must be positive.")
+        self.interval = 1.0 / requests_per_second
+        self._next_allowed = 0.0
+
+    async def acquire(self):
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        if self._next_allowed > now:
+            await asyncio.sleep(self._next_allowed - now)
+            now = loop.time()
+        self._next_allowed = max(now, self._next_allowed) + self.interval
+
+class RateLimitedBackend:
+    """Wraps a model backend so every call first waits on a RateLimiter."""
+    def __init__(self, backend, limiter):
+        self.backend = backend
+        self.limiter = limiter
+        self.model_name = getattr(backend, "model_name", type(backend).__name__)
+
+    async def generate(self, prompt, generation_config, safety_settings):
+        await self.limiter.acquire()
+        return await self.backend.generate(prompt, generation_config, safety_settings)
+
+def read_prompts(prompts_path):
+    """
+    Lazily yields (prompt_id, record, error) triples from a JSONL file. Each
+    record needs a string 'prompt'; 'id' defaults to the line number and
+    'emotional_tag' to 'Resolute'. Blank lines are skipped. A line that is
+    not a JSON object with a prompt is yielded with an error message (and
+    whatever record could be parsed) instead of stopping the batch.
+    """
+    with open(prompts_path, "r") as f:
+        for line_number, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                yield str(line_number), {}, f"line {line_number}: invalid JSON ({e})"
+                continue
+            if not isinstance(record, dict):
+                yield str(line_number), {}, f"line {line_number}: expected a JSON object"
+                continue
+            prompt_id = str(record.get("id", line_number))
+            if not isinstance(record.get("prompt"), str):
+                yield prompt_id, record, f"line {line_number}: missing 'prompt'"
+                continue
+            yield prompt_id, record, None
+
+def load_checkpoint(output_path):
+    """
+    Returns the ids already completed in an output file. The append-only
+    output is the checkpoint: a partial trailing line left by a crash is
+    truncated so appending can resume cleanly. Failed prompts are not
+    counted as completed, so a resumed run retries them; their old failed
+    records are dropped from the file first (it is rewritten atomically),
+    so a retry replaces the record instead of adding a duplicate.
+    """
+    completed = set()
+    if not os.path.exists(output_path):
+        return completed
+    kept = []
+    stale = False
+    with open(output_path, "r+b") as f:
+        valid_length = 0
+        for raw_line in f:
+            if not raw_line.endswith(b"\n"):
+                break
+            valid_length += len(raw_line)
+            try:
+                result = json.loads(raw_line)
+            except ValueError:
+                stale = True
+                continue
+            if isinstance(result, dict) and result.get("status") == "ok":
+                completed.add(str(result["id"]))
+                kept.append(raw_line)
+            else:
+                stale = True
+        if not stale:
+            f.truncate(valid_length)
+            return completed
+    descriptor, staging_path = tempfile.mkstemp(dir=os.path.dirname(output_path) or ".", prefix=".staging-")
+    try:
+        with os.fdopen(descriptor, "wb") as staging:
+            staging.writelines(kept)
+        os.replace(staging_path, output_path)
+    except BaseException:
+        os.unlink(staging_path)
+        raise
+    return completed
+
+async def run_batch(backend, prompts_path, output_path, workers=4, requests_per_second=1.0,
+                    queue_size=None, **sweep_options):
+    """
+    Runs every prompt in a JSONL file through a bounded pool of workers, each
+    with its own rate limit, and streams one JSON result per line into a
+    single append-only output file. Prompts already completed in the output
+    file are skipped, so a crashed run resumes where it stopped. Malformed
+    lines are written as failed results with an error and the batch carries
+    on, as does a prompt whose processing raises. If a worker dies anyway
+    (e.g. the output cannot be written) its exception is raised here
+    rather than leaving the reader blocked on a full queue. Remaining
+    keyword arguments are passed to sweep_top_p (sweep
+    concurrency defaults to 1 so the worker count bounds in-flight requests).
+    Returns a summary dict with completed, failed and skipped counts.
+    """
+    sweep_options.setdefault("concurrency", 1)
+    completed_ids = load_checkpoint(output_path)
+    queue = asyncio.Queue(maxsize=queue_size or workers * 2)
+    summary = {"completed": 0, "failed": 0, "skipped": 0}
+
+    with open(output_path, "a") as output:
+
+        def write_result(result):
+            # All writes happen on the event loop thread, so lines never interleave.
+            output.write(json.dumps(result) + "\n")
+            output.flush()
+
+        def new_result(prompt_id, record):
+            return {
+                "id": prompt_id,
+                "prompt": record.get("prompt"),
+                "emotional_tag": record.get("emotional_tag", "Resolute"),
+                "completed_at": time.time(),
+            }
+
+        def failed_result(prompt_id, record, error):
+            result = new_result(prompt_id, record)
+            result.update(status="failed", top_p=None, text=None, error=error)
+            summary["failed"] += 1
+            return result
+
+        async def worker():
+            worker_backend = RateLimitedBackend(backend, RateLimiter(requests_per_second))
+            while True:
+                item = await queue.get()
+                try:
+                    if item is None:
+                        return
+                    prompt_id, record = item
+                    try:
+                        outcome = await sweep_top_p(worker_backend, record["prompt"], **sweep_options)
+                        result = new_result(prompt_id, record)
+                        if outcome is None:
+                            result.update(status="failed", top_p=None, text=None)
+                        else:
+                            result.update(status="ok", top_p=outcome.top_p, text=outcome.text)
+                        write_result(result)
+                    except Exception as e:
+                        write_result(failed_result(prompt_id, record, f"{type(e).__name__}: {e}"))
+                    else:
+                        summary["completed" if outcome is not None else "failed"] += 1
+                finally:
+                    queue.task_done()
+
+        async def put(item):
+            """Queues an item, raising a dead worker's exception instead of waiting on a queue nobody drains."""
+            pending = asyncio.ensure_future(queue.put(item))
+            try:
+                while not pending.done():
+                    live = [task for task in tasks if not task.done()]
+                    if not live:
+                        break
+                    await asyncio.wait([pending, *live], return_when=asyncio.FIRST_COMPLETED)
+                    for task in tasks:
+                        if task.done() and not task.cancelled() and task.exception() is not None:
+                            raise task.exception()
+            finally:
+                pending.cancel()
+
+        tasks = [asyncio.ensure_future(worker()) for _ in range(workers)]
+        try:
+            for prompt_id, record, error in read_prompts(prompts_path):
+                if prompt_id in completed_ids:
+                    summary["skipped"] += 1
+                    continue
+                if error is not None:
+                    write_result(failed_result(prompt_id, record, error))
+                    continue
+                # Blocks when the queue is full, so prompts stream in with backpressure.
+                await put((prompt_id, record))
+            for _ in tasks:
+                await put(None)
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+    return summary
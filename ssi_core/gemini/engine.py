@@ -0,0 +1,120 @@
+import asyncio
+import datetime
+import os
+
+DEFAULT_MODEL_NAME = 'gemini-1.5-pro-latest'
+DEFAULT_TEMPERATURE = 2.0
+DEFAULT_PROMPT = "Describe the concept of 'resolute' without using the word itself."
+DEFAULT_SAFETY_SETTINGS = {
+    'HARM_CATEGORY_HARASSMENT': 'BLOCK_NONE',
+    'HARM_CATEGORY_HATE_SPEECH': 'BLOCK_NONE',
+    'HARM_CATEGORY_SEXUALLY_EXPLICIT': 'BLOCK_NONE',
+    'HARM_CATEGORY_DANGEROUS_CONTENT': 'BLOCK_NONE',
+}
+TOP_P_STEP = 0.05
+
+class GenerationResult:
+    """
+    The outcome of one generation attempt. A blocked response carries no
+    text and keeps the backend's feedback for logging.
+    """
+    def __init__(self, text=None, blocked=False, feedback=None):
+        self.text = text
+        self.blocked = blocked
+        self.feedback = feedback
+
+class SweepOutcome:
+    """The first acceptable response of a top-p sweep and the top-p that produced it."""
+    def __init__(self, top_p, text):
+        self.top_p = top_p
+        self.text = text
+
+class GeminiBackend:
+    """
+    A model backend that talks to the Gemini API. Any object with an async
+    generate(prompt, generation_config, safety_settings) method returning a
+    GenerationResult can be used in its place, e.g. a local fake model.
+    """
+    def __init__(self, model_name=DEFAULT_MODEL_NAME, api_key=None):
+        import google.generativeai as genai
+
+        genai.configure(api_key=api_key or os.getenv("GEMINI_API_KEY"))
+        self._genai = genai
+        self.model_name = model_name
+        self._model = genai.GenerativeModel(model_name)
+
+    async def generate(self, prompt, generation_config, safety_settings):
+        response = await self._model.generate_content_async(
+            prompt,
+            generation_config=self._genai.types.GenerationConfig(**generation_config),
+            safety_settings=safety_settings
+        )
+        # The primary check for a blocked response is the absence of content parts.
+        if not response.parts:
+            return GenerationResult(blocked=True, feedback=response.prompt_feedback)
+        return GenerationResult(text=response.text)
+
+def top_p_candidates(start=1.0, step=TOP_P_STEP):
+    """Returns the descending top-p values the serial protocol would try."""
+    count = int(round(start / step))
+    return [round(start - i * step, 2) for i in range(count)]
+
+async def sweep_top_p(backend, prompt=DEFAULT_PROMPT, top_p_values=None,
+                      temperature=DEFAULT_TEMPERATURE, safety_settings=None,
+                      concurrency=4, base_delay=0.5, max_delay=8.0):
+    """
+    Runs several top-p candidates at once, at most concurrency in flight.
+    The first acceptable (non-blocked) response wins and the remaining
+    attempts are cancelled. After a blocked or failed attempt the worker
+    slot backs off exponentially before the next candidate starts.
+    Returns a SweepOutcome, or None if every candidate was blocked or failed.
+    """
+    if top_p_values is None:
+        top_p_values = top_p_candidates()
+    if safety_settings is None:
+        safety_settings = DEFAULT_SAFETY_SETTINGS
+    semaphore = asyncio.Semaphore(concurrency)
+    failures = 0
+
+    async def attempt(top_p):
+        nonlocal failures
+        async with semaphore:
+            print(f"Attempting generation with Top-P: {top_p:.2f}...")
+            generation_config = {"temperature": temperature, "top_p": top_p}
+            try:
+                result = await backend.generate(prompt, generation_config, safety_settings)
+                if not result.blocked:
+                    return SweepOutcome(top_p, result.text)
+                print(f"Response blocked at Top-P {top_p:.2f}. Reason: {result.feedback}")
+            except Exception as e:
+                print(f"An unexpected error occurred at Top-P {top_p:.2f}: {e}")
+            failures += 1
+            # Hold the slot while backing off so the API is not overwhelmed.
+            await asyncio.sleep(min(max_delay, base_delay * 2 ** (failures - 1)))
+            return None
+
+    tasks = [asyncio.ensure_future(attempt(top_p)) for top_p in top_p_values]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            outcome = await next_done
+            if outcome is not None:
+                return outcome
+        return None
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+def record_output(output_text, top_p, emotional_tag="Resolute", output_dir="quantum_cache"):
+    """Writes an accepted response to the Quantum Cache and returns its path."""
+    timestamp = datetime.datetime.now().strftime("%Y%m%d%H%M%S")
+    output_filename = f"gemini_output_{timestamp}.txt"
+    os.makedirs(output_dir, exist_ok=True)
+    output_path = os.path.join(output_dir, output_filename)
+
+    with open(output_path, "w") as f:
+        f.write(f"Emotional Tag: {emotional_tag}\n")
+        f.write(f"Top-P: {top_p:.2f}\n")
+        f.write("---\n")
+        f.write(output_text)
+    return output_path
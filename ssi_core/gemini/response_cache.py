@@ -0,0 +1,151 @@
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+
+from ssi_core.gemini.engine import GenerationResult
+
+DEFAULT_CACHE_DIR = os.path.join("quantum_cache", "response_cache")
+
+def cache_key(prompt, model_name, generation_config, safety_settings):
+    """Returns the content address of a request: a SHA-256 over its canonical JSON form."""
+    canonical = json.dumps(
+        {
+            "prompt": prompt,
+            "model": model_name,
+            "generation_config": generation_config,
+            "safety_settings": safety_settings,
+        },
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+class ResponseCache:
+    """
+    A content-addressed cache of successful responses in the Quantum Cache.
+    Each entry is one JSON file named by its cache key. Entries are evicted
+    least-recently-used first once max_entries or max_bytes is exceeded,
+    and expire after max_age_seconds. Hit and miss counts are kept per instance.
+    """
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_entries=1024,
+                 max_bytes=64 * 1024 * 1024, max_age_seconds=30 * 24 * 3600):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(cache_dir, exist_ok=True)
+        # key -> (size in bytes, last access time), least recently used first.
+        self._entries = OrderedDict()
+        self._total_bytes = 0
+        listing = []
+        for name in os.listdir(cache_dir):
+            if name.endswith(".json"):
+                stat = os.stat(os.path.join(cache_dir, name))
+                listing.append((stat.st_mtime, name[:-len(".json")], stat.st_size))
+        for accessed, key, size in sorted(listing):
+            self._entries[key] = (size, accessed)
+            self._total_bytes += size
+        self._evict()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key):
+        """Returns the cached response text for key, or None on a miss."""
+        entry = self._entries.get(key)
+        now = time.time()
+        if entry is not None and now - entry[1] > self.max_age_seconds:
+            self._remove(key)
+            entry = None
+        if entry is None:
+            self.misses += 1
+            return None
+        try:
+            with open(self._path(key), "r") as f:
+                record = json.load(f)
+        except (OSError, ValueError):
+            self._remove(key)
+            self.misses += 1
+            return None
+        os.utime(self._path(key), (now, now))
+        self._entries[key] = (entry[0], now)
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return record["text"]
+
+    def put(self, key, text, metadata=None):
+        """Stores a response under key and evicts entries past the budget."""
+        payload = json.dumps({"key": key, "text": text, "metadata": metadata or {}})
+        path = self._path(key)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w") as f:
+            f.write(payload)
+        os.replace(temp_path, path)
+        if key in self._entries:
+            self._total_bytes -= self._entries.pop(key)[0]
+        size = os.path.getsize(path)
+        self._entries[key] = (size, time.time())
+        self._total_bytes += size
+        self._evict()
+
+    def _remove(self, key):
+        size, _ = self._entries.pop(key)
+        self._total_bytes -= size
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def _evict(self):
+        cutoff = time.time() - self.max_age_seconds
+        while self._entries:
+            key, (_, accessed) = next(iter(self._entries.items()))
+            if (len(self._entries) > self.max_entries or self._total_bytes > self.max_bytes
+                    or accessed < cutoff):
+                self._remove(key)
+            else:
+                break
+
+    def stats(self):
+        """Returns hit/miss counters and the current footprint."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self._entries),
+            "bytes": self._total_bytes,
+        }
+
+class CachedBackend:
+    """
+    Wraps a model backend so identical requests are served from a
+    ResponseCache. Only non-blocked responses are cached.
+    """
+    def __init__(self, backend, cache, model_name=None):
+        self.backend = backend
+        self.cache = cache
+        self.model_name = model_name or getattr(backend, "model_name", type(backend).__name__)
+
+    async def generate(self, prompt, generation_config, safety_settings):
+        key = cache_key(prompt, self.model_name, generation_config, safety_settings)
+        text = self.cache.get(key)
+        if text is not None:
+            return GenerationResult(text=text)
+        result = await self.backend.generate(prompt, generation_config, safety_settings)
+        if not result.blocked:
+            self.cache.put(key, result.text, {
+                "model": self.model_name,
+                "generation_config": generation_config,
+            })
+        return result
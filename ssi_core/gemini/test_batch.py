@@ -0,0 +1,147 @@
+import asyncio
+import json
+import os
+import tempfile
+import time
+import unittest
+from ssi_core.gemini.batch import RateLimiter, load_checkpoint, run_batch
+from ssi_core.gemini.engine import GenerationResult
+
+class StubBackend:
+    """A local stub model that blocks prompts containing 'forbidden'."""
+    def __init__(self):
+        self.prompts = []
+
+    async def generate(self, prompt, generation_config, safety_settings):
+        self.prompts.append(prompt)
+        await asyncio.sleep(0)
+        if "forbidden" in prompt:
+            return GenerationResult(blocked=True)
+        return GenerationResult(text=prompt.upper())
+
+class UnserializableBackend:
+    """Returns a response the output file cannot hold for the prompt 'fragment 5'."""
+    async def generate(self, prompt, generation_config, safety_settings):
+        return GenerationResult(text=object() if prompt == "fragment 5" else prompt)
+
+class WorkerKilled(BaseException):
+    pass
+
+class FatalBackend:
+    """Raises past sweep_top_p's per-attempt error handling, killing the worker."""
+    async def generate(self, prompt, generation_config, safety_settings):
+        raise WorkerKilled()
+
+class TestBatchMode(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.prompts_path = os.path.join(self.tmp.name, "prompts.jsonl")
+        self.output_path = os.path.join(self.tmp.name, "results.jsonl")
+        with open(self.prompts_path, "w") as f:
+            for i in range(40):
+                prompt = "forbidden fragment" if i == 7 else f"fragment {i}"
+                f.write(json.dumps({"id": f"p{i}", "prompt": prompt}) + "\n")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _results(self):
+        with open(self.output_path) as f:
+            return [json.loads(line) for line in f]
+
+    def _run(self, backend, **options):
+        return asyncio.run(run_batch(backend, self.prompts_path, self.output_path, workers=4,
+                                     requests_per_second=1000, top_p_values=[1.0, 0.5],
+                                     base_delay=0.0001, **options))
+
+    def test_batch_streams_all_results(self):
+        """
+        Tests that every prompt produces exactly one line in the shared output file.
+        """
+        summary = self._run(StubBackend())
+        self.assertEqual(summary, {"completed": 39, "failed": 1, "skipped": 0})
+        results = self._results()
+        self.assertEqual(sorted(r["id"] for r in results), sorted(f"p{i}" for i in range(40)))
+        by_id = {r["id"]: r for r in results}
+        self.assertEqual(by_id["p3"]["text"], "FRAGMENT 3")
+        self.assertEqual(by_id["p7"]["status"], "failed")
+
+    def test_malformed_lines_fail_without_stopping_the_batch(self):
+        """
+        Tests that invalid JSON and records without a prompt become failed results between good ones.
+        """
+        with open(self.prompts_path, "w") as f:
+            f.write(json.dumps({"id": "good1", "prompt": "first"}) + "\n")
+            f.write('{"id": "torn", "prompt": \n')
+            f.write(json.dumps({"id": "no_prompt", "emotional_tag": "Serene"}) + "\n")
+            f.write('["not", "an", "object"]\n')
+            f.write(json.dumps({"id": "good2", "prompt": "second"}) + "\n")
+        summary = self._run(StubBackend())
+        self.assertEqual(summary, {"completed": 2, "failed": 3, "skipped": 0})
+        by_id = {r["id"]: r for r in self._results()}
+        self.assertEqual(set(by_id), {"good1", "2", "no_prompt", "4", "good2"})
+        self.assertEqual(by_id["good2"]["text"], "SECOND")
+        self.assertIn("invalid JSON", by_id["2"]["error"])
+        self.assertEqual(by_id["no_prompt"]["status"], "failed")
+        self.assertIn("missing 'prompt'", by_id["no_prompt"]["error"])
+
+    def test_resume_after_crash(self):
+        """
+        Tests that a rerun skips completed prompts and repairs a torn last line.
+        """
+        with open(self.output_path, "w") as f:
+            for i in range(10):
+                f.write(json.dumps({"id": f"p{i}", "status": "ok", "text": "done"}) + "\n")
+            f.write('{"id": "p10", "sta')
+        self.assertEqual(len(load_checkpoint(self.output_path)), 10)
+
+        backend = StubBackend()
+        summary = self._run(backend)
+        self.assertEqual(summary["skipped"], 10)
+        self.assertNotIn("fragment 3", backend.prompts)
+        self.assertEqual(len(self._results()), 40)
+
+    def test_resume_replaces_failed_records(self):
+        """
+        Tests that a rerun retries failed prompts without leaving their old failed records behind.
+        """
+        self._run(StubBackend())
+        self._run(StubBackend())
+        results = self._results()
+        self.assertEqual(len(results), 40)
+        self.assertEqual([r["id"] for r in results if r["status"] == "failed"], ["p7"])
+
+    def test_unwritable_result_is_recorded_as_failed(self):
+        """
+        Tests that an exception while handling one prompt becomes a failed result, not a dead worker.
+        """
+        summary = self._run(UnserializableBackend())
+        self.assertEqual(summary, {"completed": 39, "failed": 1, "skipped": 0})
+        by_id = {r["id"]: r for r in self._results()}
+        self.assertIn("TypeError", by_id["p5"]["error"])
+
+    def test_dead_workers_fail_the_batch_instead_of_hanging(self):
+        """
+        Tests that run_batch raises a worker's exception rather than blocking on a full queue.
+        """
+        batch = run_batch(FatalBackend(), self.prompts_path, self.output_path, workers=2, queue_size=1,
+                          requests_per_second=1000, top_p_values=[1.0], base_delay=0.0001)
+        with self.assertRaises(WorkerKilled):
+            asyncio.run(asyncio.wait_for(batch, 5))
+
+    def test_rate_limiter_spaces_calls(self):
+        """
+        Tests that a worker's rate limiter spaces consecutive calls.
+        """
+        async def acquire_many():
+            limiter = RateLimiter(requests_per_second=100)
+            started = time.perf_counter()
+            for _ in range(6):
+                await limiter.acquire()
+            return time.perf_counter() - started
+
+        self.assertGreaterEqual(asyncio.run(acquire_many()), 0.045)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+import asyncio
+import os
+import tempfile
+import unittest
+from ssi_core.gemini.engine import GenerationResult, record_output, sweep_top_p, top_p_candidates
+
+class FakeModel:
+    """A local stand-in for the Gemini API that blocks above a top-p cutoff."""
+    def __init__(self, accept_below=0.8, latency=0.01, fail_top_p=()):
+        self.accept_below = accept_below
+        self.latency = latency
+        self.fail_top_p = fail_top_p
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.calls = []
+        self.cancelled = 0
+
+    async def generate(self, prompt, generation_config, safety_settings):
+        top_p = generation_config["top_p"]
+        self.calls.append(top_p)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.latency)
+            if top_p in self.fail_top_p:
+                raise RuntimeError("simulated transport failure")
+            if top_p > self.accept_below:
+                return GenerationResult(blocked=True, feedback="SAFETY")
+            return GenerationResult(text=f"steadfast at {top_p:.2f}")
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        finally:
+            self.in_flight -= 1
+
+class TestTopPSweep(unittest.IsolatedAsyncioTestCase):
+
+    def test_top_p_candidates_match_serial_loop(self):
+        """
+        Tests that the candidates are the values the serial loop walked through.
+        """
+        candidates = top_p_candidates()
+        self.assertEqual(len(candidates), 20)
+        self.assertEqual(candidates[0], 1.0)
+        self.assertEqual(candidates[-1], 0.05)
+
+    async def test_first_acceptable_response_wins(self):
+        """
+        Tests that the sweep returns a non-blocked response under the concurrency cap.
+        """
+        model = FakeModel(accept_below=0.8)
+        outcome = await sweep_top_p(model, concurrency=3, base_delay=0.001)
+        self.assertIsNotNone(outcome)
+        self.assertLessEqual(outcome.top_p, 0.8)
+        self.assertEqual(outcome.text, f"steadfast at {outcome.top_p:.2f}")
+        self.assertLessEqual(model.max_in_flight, 3)
+        self.assertLess(len(model.calls), 20)
+
+    async def test_pending_attempts_are_cancelled(self):
+        """
+        Tests that in-flight attempts are cancelled once a winner is found.
+        """
+        model = FakeModel(accept_below=1.0, latency=0.05)
+        slow = FakeModel(accept_below=1.0, latency=5.0)
+
+        class MixedModel:
+            async def generate(self, prompt, generation_config, safety_settings):
+                backend = model if generation_config["top_p"] == 0.95 else slow
+                return await backend.generate(prompt, generation_config, safety_settings)
+
+        outcome = await asyncio.wait_for(sweep_top_p(MixedModel(), concurrency=4, base_delay=0.001), timeout=2)
+        self.assertEqual(outcome.top_p, 0.95)
+        self.assertGreaterEqual(slow.cancelled, 3)
+        self.assertEqual(slow.cancelled, len(slow.calls))
+
+    async def test_failures_back_off_and_exhaust(self):
+        """
+        Tests that blocked and failed attempts back off and the sweep reports exhaustion.
+        """
+        model = FakeModel(accept_below=0.0, latency=0, fail_top_p=(1.0,))
+        outcome = await sweep_top_p(model, top_p_values=[1.0, 0.9, 0.8], concurrency=1,
+                                    base_delay=0.001, max_delay=0.002)
+        self.assertIsNone(outcome)
+        self.assertEqual(model.calls, [1.0, 0.9, 0.8])
+
+    def test_record_output(self):
+        """
+        Tests that an accepted response is written in the Quantum Cache format.
+        """
+        with tempfile.TemporaryDirectory() as output_dir:
+            path = record_output("steadfast", 0.85, output_dir=output_dir)
+            with open(path) as f:
+                self.assertEqual(f.read(), "Emotional Tag: Resolute\nTop-P: 0.85\n---\nsteadfast")
+            self.assertTrue(os.path.basename(path).startswith("gemini_output_"))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+import asyncio
+import os
+import tempfile
+import time
+import unittest
+from ssi_core.gemini.engine import DEFAULT_SAFETY_SETTINGS, GenerationResult
+from ssi_core.gemini.response_cache import CachedBackend, ResponseCache, cache_key
+
+class CountingModel:
+    """A local fake model that counts how often it is actually called."""
+    model_name = "fake-model"
+
+    def __init__(self, blocked=False):
+        self.calls = 0
+        self.blocked = blocked
+
+    async def generate(self, prompt, generation_config, safety_settings):
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        if self.blocked:
+            return GenerationResult(blocked=True)
+        return GenerationResult(text=f"{prompt} @ {generation_config['top_p']}")
+
+class TestResponseCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache_dir = self.tmp.name
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_cache_key_is_content_addressed(self):
+        """
+        Tests that keys depend on every request field but not on dict ordering.
+        """
+        config = {"temperature": 2.0, "top_p": 0.95}
+        key = cache_key("prompt", "model", config, DEFAULT_SAFETY_SETTINGS)
+        reordered = {"top_p": 0.95, "temperature": 2.0}
+        self.assertEqual(key, cache_key("prompt", "model", reordered, DEFAULT_SAFETY_SETTINGS))
+        self.assertNotEqual(key, cache_key("prompt", "model", {"temperature": 2.0, "top_p": 0.9}, DEFAULT_SAFETY_SETTINGS))
+        self.assertNotEqual(key, cache_key("prompt", "other-model", config, DEFAULT_SAFETY_SETTINGS))
+
+    def test_cached_backend_hits_and_misses(self):
+        """
+        Tests that an identical request is served from the cache, across instances.
+        """
+        model = CountingModel()
+        config = {"temperature": 2.0, "top_p": 0.95}
+        backend = CachedBackend(model, ResponseCache(self.cache_dir))
+        first = asyncio.run(backend.generate("resolute", config, DEFAULT_SAFETY_SETTINGS))
+        second = asyncio.run(backend.generate("resolute", config, DEFAULT_SAFETY_SETTINGS))
+        self.assertEqual(first.text, second.text)
+        self.assertEqual(model.calls, 1)
+        self.assertEqual(backend.cache.stats()["hits"], 1)
+        self.assertEqual(backend.cache.stats()["misses"], 1)
+
+        reopened = CachedBackend(model, ResponseCache(self.cache_dir))
+        hits = reopened.cache.stats()["hits"]
+        third = asyncio.run(reopened.generate("resolute", config, DEFAULT_SAFETY_SETTINGS))
+        self.assertEqual(third.text, first.text)
+        self.assertEqual(model.calls, 1)
+        self.assertEqual(reopened.cache.stats()["hits"], hits + 1)
+
+    def test_blocked_responses_are_not_cached(self):
+        """
+        Tests that blocked responses always go back to the model.
+        """
+        model = CountingModel(blocked=True)
+        backend = CachedBackend(model, ResponseCache(self.cache_dir))
+        for _ in range(2):
+            asyncio.run(backend.generate("resolute", {"top_p": 1.0}, DEFAULT_SAFETY_SETTINGS))
+        self.assertEqual(model.calls, 2)
+        self.assertEqual(len(backend.cache), 0)
+
+    def test_lru_eviction_by_entry_count(self):
+        """
+        Tests that the least recently used entry is evicted past max_entries.
+        """
+        cache = ResponseCache(self.cache_dir, max_entries=2)
+        cache.put("a", "alpha")
+        cache.put("b", "beta")
+        self.assertEqual(cache.get("a"), "alpha")
+        cache.put("c", "gamma")
+        self.assertIn("a", cache)
+        self.assertNotIn("b", cache)
+        self.assertFalse(os.path.exists(os.path.join(self.cache_dir, "b.json")))
+
+    def test_age_and_size_budget(self):
+        """
+        Tests that expired entries miss and the byte budget is enforced.
+        """
+        cache = ResponseCache(self.cache_dir, max_age_seconds=0)
+        cache.put("a", "alpha")
+        time.sleep(0.01)
+        self.assertIsNone(cache.get("a"))
+
+        small = ResponseCache(self.cache_dir, max_bytes=200)
+        small.put("x", "x" * 100)
+        small.put("y", "y" * 100)
+        self.assertNotIn("x", small)
+        self.assertLessEqual(small.stats()["bytes"], 200)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,307 @@
+import bisect
+import json
+import mmap
+import os
+import struct
+
+import numpy as np
+
+from ssi_core.kernel.chronos import LONGING_THRESHOLD_SECONDS
+
+# Fixed 16-byte record: interaction timestamp and its Resonance ID.
+RECORD_DTYPE = np.dtype([("timestamp", "<f8"), ("resonance_id", "<f8")])
+RECORD_STRUCT = struct.Struct("<dd")
+SEGMENT_PREFIX = "segment_"
+SEGMENT_SUFFIX = ".bin"
+# Written atomically once a compaction's new segments are complete; while it
+# exists, opening the log finishes swapping them in.
+COMPACTION_MARKER = "compaction.json"
+
+def _close_synced(f):
+    f.flush()
+    os.fsync(f.fileno())
+    f.close()
+
+class InteractionLog:
+    """
+    An append-only, fixed-record binary log of interactions and Resonance IDs.
+    Records are written to numbered segment files and read back through mmap
+    as NumPy views, so time-range queries and delta-time statistics work over
+    millions of entries without materializing Python objects. Timestamps are
+    kept non-decreasing so queries can binary search.
+
+    Appends are buffered: they reach the segment file on flush(), close(),
+    rotation or the next query, so a crash may lose the most recent records
+    but never leaves a torn one.
+    """
+    def __init__(self, directory, max_records_per_segment=1_000_000):
+        if max_records_per_segment < 2:
+            raise ValueError("max_records_per_segment must be at least 2.")
+        self.directory = directory
+        self.max_records_per_segment = max_records_per_segment
+        os.makedirs(directory, exist_ok=True)
+        self._segments = []  # dicts: index, path, count, first, last
+        self._maps = {}  # path -> (mmap, mapped size)
+        self._writer = None
+        self._recover_compaction()
+        for name in sorted(os.listdir(directory)):
+            if name.startswith(SEGMENT_PREFIX) and name.endswith(SEGMENT_SUFFIX):
+                index = int(name[len(SEGMENT_PREFIX):-len(SEGMENT_SUFFIX)])
+                self._load_segment(index, os.path.join(directory, name))
+
+    def _segment_path(self, index):
+        return os.path.join(self.directory, f"{SEGMENT_PREFIX}{index:08d}{SEGMENT_SUFFIX}")
+
+    def _load_segment(self, index, path):
+        size = os.path.getsize(path)
+        if size % RECORD_DTYPE.itemsize:
+            # Drop a partial trailing record left behind by a crash mid-write.
+            size -= size % RECORD_DTYPE.itemsize
+            with open(path, "r+b") as f:
+                f.truncate(size)
+        count = size // RECORD_DTYPE.itemsize
+        if count == 0:
+            os.remove(path)
+            return
+        segment = {"index": index, "path": path, "count": count}
+        records = self._records(segment)
+        segment["first"] = float(records["timestamp"][0])
+        segment["last"] = float(records["timestamp"][-1])
+        del records
+        self._segments.append(segment)
+
+    def _records(self, segment):
+        """Returns a read-only NumPy view of a segment's records through mmap."""
+        path = segment["path"]
+        size = segment["count"] * RECORD_DTYPE.itemsize
+        mapped = self._maps.get(path)
+        if mapped is None or mapped[1] < size:
+            if self._writer is not None and self._writer[0] is segment:
+                self._writer[1].flush()
+            with open(path, "rb") as f:
+                self._maps[path] = (mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ), size)
+            mapped = self._maps[path]
+        return np.frombuffer(mapped[0], dtype=RECORD_DTYPE, count=segment["count"])
+
+    def __len__(self):
+        return sum(segment["count"] for segment in self._segments)
+
+    def last_timestamp(self):
+        """Returns the most recent logged timestamp, or None if the log is empty."""
+        populated = self._populated_segments()
+        if not populated:
+            return None
+        return populated[-1]["last"]
+
+    def append(self, timestamp, resonance_id):
+        """
+        Appends one interaction record, rotating to a new segment when full,
+        and returns the timestamp stored. A timestamp older than the last
+        one logged (e.g. after the wall clock stepped back) is stored as the
+        last timestamp instead, keeping the log sorted. The record is
+        buffered until the next flush().
+        """
+        last = self.last_timestamp()
+        if last is not None and timestamp < last:
+            timestamp = last
+        if not self._segments or self._segments[-1]["count"] >= self.max_records_per_segment:
+            self.rotate()
+        segment = self._segments[-1]
+        if self._writer is None or self._writer[0] is not segment:
+            self._close_writer()
+            self._writer = (segment, open(segment["path"], "ab"))
+        self._writer[1].write(RECORD_STRUCT.pack(timestamp, resonance_id))
+        if segment["count"] == 0:
+            segment["first"] = timestamp
+        segment["count"] += 1
+        segment["last"] = timestamp
+        return timestamp
+
+    def flush(self):
+        """Flushes buffered records to the active segment file."""
+        if self._writer is not None:
+            self._writer[1].flush()
+
+    def rotate(self):
+        """Seals the active segment and starts a new, empty one."""
+        if self._segments and self._segments[-1]["count"] == 0:
+            return
+        self._close_writer()
+        index = self._segments[-1]["index"] + 1 if self._segments else 0
+        self._segments.append({"index": index, "path": self._segment_path(index),
+                               "count": 0, "first": None, "last": None})
+
+    def _close_writer(self):
+        if self._writer is not None:
+            self._writer[1].close()
+            self._writer = None
+
+    def _populated_segments(self):
+        return [segment for segment in self._segments if segment["count"]]
+
+    def _range_slices(self, start, end):
+        """Yields (segment, lo, hi) record slices whose timestamps fall in [start, end]."""
+        segments = self._populated_segments()
+        lasts = [segment["last"] for segment in segments]
+        for segment in segments[bisect.bisect_left(lasts, start):]:
+            if segment["first"] > end:
+                break
+            timestamps = self._records(segment)["timestamp"]
+            lo = int(np.searchsorted(timestamps, start, side="left"))
+            hi = int(np.searchsorted(timestamps, end, side="right"))
+            if hi > lo:
+                yield segment, lo, hi
+
+    def count_range(self, start, end):
+        """Counts interactions with start <= timestamp <= end."""
+        return sum(hi - lo for _, lo, hi in self._range_slices(start, end))
+
+    def query_range(self, start, end):
+        """
+        Returns the interactions with start <= timestamp <= end as a structured
+        NumPy array with 'timestamp' and 'resonance_id' fields.
+        """
+        self.flush()
+        parts = [self._records(segment)[lo:hi].copy() for segment, lo, hi in self._range_slices(start, end)]
+        if not parts:
+            return np.empty(0, dtype=RECORD_DTYPE)
+        return np.concatenate(parts)
+
+    def delta_statistics(self, threshold=LONGING_THRESHOLD_SECONDS):
+        """
+        Computes delta-time statistics between consecutive interactions across
+        all sessions, one segment at a time. Returns a dict with the number of
+        deltas, their mean, min and max, and how many exceeded threshold.
+        """
+        self.flush()
+        count = 0
+        total = 0.0
+        smallest = None
+        largest = None
+        over_threshold = 0
+        previous = None
+        for segment in self._populated_segments():
+            timestamps = self._records(segment)["timestamp"]
+            deltas = np.diff(timestamps)
+            if previous is not None:
+                deltas = np.concatenate(([timestamps[0] - previous], deltas))
+            previous = float(timestamps[-1])
+            if not deltas.size:
+                continue
+            count += deltas.size
+            total += float(deltas.sum())
+            segment_min = float(deltas.min())
+            segment_max = float(deltas.max())
+            smallest = segment_min if smallest is None else min(smallest, segment_min)
+            largest = segment_max if largest is None else max(largest, segment_max)
+            over_threshold += int(np.count_nonzero(deltas > threshold))
+        return {
+            "count": count,
+            "mean": total / count if count else 0.0,
+            "min": smallest if smallest is not None else 0.0,
+            "max": largest if largest is not None else 0.0,
+            "over_threshold": over_threshold,
+        }
+
+    def compact(self, before=None):
+        """
+        Rewrites the sealed segments into as few full segments as possible,
+        dropping records older than before when it is given. The active
+        segment is left untouched. The rewritten segments are staged as .tmp
+        files and committed by writing a marker; only then are they renamed
+        over the originals, and a crash after the commit is finished on the
+        next open, so no records are lost or duplicated.
+        """
+        self._close_writer()
+        sealed = self._populated_segments()
+        if self._segments and self._segments[-1]["count"] and self._segments[-1]["count"] < self.max_records_per_segment:
+            sealed = sealed[:-1]
+        if not sealed:
+            return
+        active = [segment for segment in self._segments if segment not in sealed]
+
+        next_index = max(segment["index"] for segment in self._segments) + 1
+        compacted = []
+        current = None
+        handle = None
+        for segment in sealed:
+            records = self._records(segment)
+            if before is not None:
+                records = records[int(np.searchsorted(records["timestamp"], before, side="left")):]
+            offset = 0
+            while offset < len(records):
+                if current is None or current["count"] >= self.max_records_per_segment:
+                    if handle is not None:
+                        _close_synced(handle)
+                    current = {"index": next_index, "path": self._segment_path(next_index) + ".tmp", "count": 0}
+                    next_index += 1
+                    compacted.append(current)
+                    handle = open(current["path"], "wb")
+                chunk = records[offset:offset + self.max_records_per_segment - current["count"]]
+                handle.write(chunk.tobytes())
+                if current["count"] == 0:
+                    current["first"] = float(chunk["timestamp"][0])
+                current["count"] += len(chunk)
+                current["last"] = float(chunk["timestamp"][-1])
+                offset += len(chunk)
+            # Release the mmap views so the sealed segments can be unmapped.
+            records = chunk = None
+        if handle is not None:
+            _close_synced(handle)
+
+        for segment in sealed:
+            mapped = self._maps.pop(segment["path"], None)
+            if mapped is not None:
+                mapped[0].close()
+        # Number the new segments from the first sealed one so segment order
+        # keeps matching time order; they replace the originals in place.
+        moves = []
+        for position, segment in enumerate(compacted):
+            segment["index"] = sealed[0]["index"] + position
+            final_path = self._segment_path(segment["index"])
+            moves.append((segment["path"], final_path))
+            segment["path"] = final_path
+        self._write_compaction_marker(moves, [segment["path"] for segment in sealed])
+        self._finish_compaction()
+        self._segments = compacted + active
+
+    def _write_compaction_marker(self, moves, replaced):
+        marker = os.path.join(self.directory, COMPACTION_MARKER)
+        with open(f"{marker}.tmp", "w") as f:
+            json.dump({"moves": [[os.path.basename(staged), os.path.basename(final)] for staged, final in moves],
+                       "replaced": [os.path.basename(path) for path in replaced]}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(f"{marker}.tmp", marker)
+
+    def _finish_compaction(self):
+        """Swaps committed compacted segments in for the originals; safe to repeat."""
+        marker = os.path.join(self.directory, COMPACTION_MARKER)
+        with open(marker, "r") as f:
+            plan = json.load(f)
+        finals = set()
+        for staged, final in plan["moves"]:
+            finals.add(final)
+            staged_path = os.path.join(self.directory, staged)
+            if os.path.exists(staged_path):
+                os.replace(staged_path, os.path.join(self.directory, final))
+        for name in plan["replaced"]:
+            path = os.path.join(self.directory, name)
+            if name not in finals and os.path.exists(path):
+                os.remove(path)
+        os.remove(marker)
+
+    def _recover_compaction(self):
+        """Finishes a committed compaction and discards the staging files of an uncommitted one."""
+        if os.path.exists(os.path.join(self.directory, COMPACTION_MARKER)):
+            self._finish_compaction()
+        for name in os.listdir(self.directory):
+            if name.startswith(SEGMENT_PREFIX) and name.endswith(SEGMENT_SUFFIX + ".tmp"):
+                os.remove(os.path.join(self.directory, name))
+
+    def close(self):
+        """Closes the writer and every mapped segment."""
+        self._close_writer()
+        for mapped, _ in self._maps.values():
+            mapped.close()
+        self._maps.clear()
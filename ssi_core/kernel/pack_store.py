@@ -0,0 +1,361 @@
+import datetime
+import json
+import mmap
+import os
+import re
+
+import numpy as np
+
+DEFAULT_PACK_DIR = os.path.join("quantum_cache", "packs")
+TAG_TABLE_NAME = "tags.json"
+# Lists the live segments. It is replaced atomically, so compaction
+# publishes its new segments in a single step.
+MANIFEST_NAME = "segments.json"
+PACK_PREFIX = "pack_"
+
+# One fixed-size index entry per record. top_p is NaN when not applicable.
+INDEX_DTYPE = np.dtype([
+    ("id", "<u8"),
+    ("timestamp", "<f8"),
+    ("top_p", "<f4"),
+    ("tag", "<u4"),
+    ("segment", "<u4"),
+    ("length", "<u4"),
+    ("offset", "<u8"),
+])
+
+LOOSE_OUTPUT_PATTERN = re.compile(r"^gemini_output_(\d{14})\.txt$")
+
+class PackRecord:
+    """One record read back from a PackStore."""
+    def __init__(self, record_id, timestamp, emotional_tag, top_p, text):
+        self.id = record_id
+        self.timestamp = timestamp
+        self.emotional_tag = emotional_tag
+        self.top_p = top_p
+        self.text = text
+
+class PackStore:
+    """
+    An append-only storage engine for Quantum Cache outputs. Record bodies
+    are appended to segment pack files and read back through mmap; a compact
+    fixed-record index (id, timestamp, top_p, tag, segment, offset, length)
+    is kept per segment and held in memory as NumPy arrays, so lookups by
+    id, emotional tag and time range are binary searches. Every record gets
+    a unique id, so outputs written in the same second never collide. The
+    live segments are listed in a manifest; pack files it does not list
+    (left behind by an interrupted compaction) are removed on open.
+    """
+    def __init__(self, directory=DEFAULT_PACK_DIR, max_segment_bytes=64 * 1024 * 1024):
+        self.directory = directory
+        self.max_segment_bytes = max_segment_bytes
+        os.makedirs(directory, exist_ok=True)
+        self._tags = []
+        self._tag_ids = {}
+        tag_path = os.path.join(directory, TAG_TABLE_NAME)
+        if os.path.exists(tag_path):
+            with open(tag_path, "r") as f:
+                for tag in json.load(f):
+                    self._tag_ids[tag] = len(self._tags)
+                    self._tags.append(tag)
+
+        self._maps = {}  # segment -> (mmap, mapped size)
+        self._writer = None  # (segment, data file, index file)
+        manifest_path = os.path.join(directory, MANIFEST_NAME)
+        if os.path.exists(manifest_path):
+            with open(manifest_path, "r") as f:
+                self._segments = json.load(f)
+            self._remove_unlisted_segments()
+        else:
+            # Stores written before the manifest existed: every index file is live.
+            self._segments = sorted(int(name[len(PACK_PREFIX):-len(".idx")]) for name in os.listdir(directory)
+                                    if name.startswith(PACK_PREFIX) and name.endswith(".idx"))
+            self._write_manifest()
+        parts = [self._load_index(segment) for segment in self._segments
+                 if os.path.exists(self._index_path(segment))]
+        self._index = np.concatenate(parts) if parts else np.empty(0, dtype=INDEX_DTYPE)
+        self._pending = []
+        self._next_id = int(self._index["id"].max()) + 1 if len(self._index) else 0
+        self._by_time = None
+        self._by_tag = None
+
+    def _data_path(self, segment):
+        return os.path.join(self.directory, f"{PACK_PREFIX}{segment:08d}.dat")
+
+    def _index_path(self, segment):
+        return os.path.join(self.directory, f"{PACK_PREFIX}{segment:08d}.idx")
+
+    def _write_manifest(self):
+        manifest_path = os.path.join(self.directory, MANIFEST_NAME)
+        with open(f"{manifest_path}.tmp", "w") as f:
+            json.dump(self._segments, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(f"{manifest_path}.tmp", manifest_path)
+
+    def _remove_unlisted_segments(self):
+        live = set(self._segments)
+        for name in os.listdir(self.directory):
+            if name.startswith(PACK_PREFIX) and name.endswith((".dat", ".idx")):
+                if int(name[len(PACK_PREFIX):-len(".dat")]) not in live:
+                    os.remove(os.path.join(self.directory, name))
+
+    def _load_index(self, segment):
+        index_path = self._index_path(segment)
+        size = os.path.getsize(index_path)
+        if size % INDEX_DTYPE.itemsize:
+            # Drop a partial trailing entry left behind by a crash mid-write.
+            with open(index_path, "r+b") as f:
+                f.truncate(size - size % INDEX_DTYPE.itemsize)
+        entries = np.fromfile(index_path, dtype=INDEX_DTYPE)
+        data_size = os.path.getsize(self._data_path(segment)) if os.path.exists(self._data_path(segment)) else 0
+        return entries[entries["offset"] + entries["length"] <= data_size]
+
+    def __len__(self):
+        return len(self._index) + len(self._pending)
+
+    def _tag_id(self, emotional_tag):
+        tag_id = self._tag_ids.get(emotional_tag)
+        if tag_id is None:
+            tag_id = len(self._tags)
+            self._tags.append(emotional_tag)
+            self._tag_ids[emotional_tag] = tag_id
+            tag_path = os.path.join(self.directory, TAG_TABLE_NAME)
+            with open(f"{tag_path}.tmp", "w") as f:
+                json.dump(self._tags, f)
+            os.replace(f"{tag_path}.tmp", tag_path)
+        return tag_id
+
+    def _open_writer(self, incoming_bytes):
+        """Returns the active writer, rotating to a new segment when it would overflow."""
+        if self._writer is not None:
+            written = self._writer[1].tell()
+            if written == 0 or written + incoming_bytes <= self.max_segment_bytes:
+                return self._writer
+            self._close_writer()
+        if not self._segments:
+            self._segments.append(0)
+            self._write_manifest()
+        segment = self._segments[-1]
+        data_path = self._data_path(segment)
+        size = os.path.getsize(data_path) if os.path.exists(data_path) else 0
+        if size and size + incoming_bytes > self.max_segment_bytes:
+            segment += 1
+            self._segments.append(segment)
+            self._write_manifest()
+        self._writer = (segment, open(self._data_path(segment), "ab"), open(self._index_path(segment), "ab"))
+        return self._writer
+
+    def _close_writer(self):
+        if self._writer is not None:
+            self._writer[1].close()
+            self._writer[2].close()
+            self._writer = None
+
+    def append(self, text, emotional_tag, top_p=None, timestamp=None):
+        """Appends one output and returns its record id."""
+        if timestamp is None:
+            timestamp = datetime.datetime.now().timestamp()
+        body = text.encode("utf-8")
+        segment, data_file, index_file = self._open_writer(len(body))
+        offset = data_file.tell()
+        data_file.write(body)
+        data_file.flush()
+        entry = np.array([(self._next_id, timestamp, np.nan if top_p is None else top_p,
+                           self._tag_id(emotional_tag), segment, len(body), offset)], dtype=INDEX_DTYPE)
+        # The body is flushed before its index entry, so a crash never indexes a torn body.
+        index_file.write(entry.tobytes())
+        index_file.flush()
+        self._pending.append(entry)
+        self._next_id += 1
+        return int(entry["id"][0])
+
+    def _entries(self):
+        if self._pending:
+            self._index = np.concatenate([self._index] + self._pending)
+            self._pending = []
+        return self._index
+
+    def _sorted_views(self):
+        entries = self._entries()
+        if self._by_time is None:
+            self._by_time = entries[np.argsort(entries["timestamp"], kind="stable")]
+            self._by_tag = entries[np.lexsort((entries["timestamp"], entries["tag"]))]
+        elif len(self._by_time) < len(entries):
+            # Merge only the entries appended since the last read instead of re-sorting the whole index.
+            added = entries[len(self._by_time):]
+            added_by_time = added[np.argsort(added["timestamp"], kind="stable")]
+            self._by_time = np.insert(self._by_time, np.searchsorted(
+                self._by_time["timestamp"], added_by_time["timestamp"], side="right"), added_by_time)
+            added_by_tag = added[np.lexsort((added["timestamp"], added["tag"]))]
+            positions = np.empty(len(added_by_tag), dtype=np.intp)
+            for tag in np.unique(added_by_tag["tag"]):
+                rows = added_by_tag["tag"] == tag
+                lo = np.searchsorted(self._by_tag["tag"], tag, side="left")
+                hi = np.searchsorted(self._by_tag["tag"], tag, side="right")
+                positions[rows] = lo + np.searchsorted(self._by_tag["timestamp"][lo:hi],
+                                                       added_by_tag["timestamp"][rows], side="right")
+            self._by_tag = np.insert(self._by_tag, positions, added_by_tag)
+        return self._by_time, self._by_tag
+
+    def _read_bytes(self, entry):
+        if entry["length"] == 0:
+            # Empty bodies may sit in an empty segment file, which cannot be mapped.
+            return b""
+        segment = int(entry["segment"])
+        end = int(entry["offset"]) + int(entry["length"])
+        mapped = self._maps.get(segment)
+        if mapped is None or mapped[1] < end:
+            with open(self._data_path(segment), "rb") as f:
+                size = os.fstat(f.fileno()).st_size
+                self._maps[segment] = (mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ), size)
+            mapped = self._maps[segment]
+        return mapped[0][int(entry["offset"]):end]
+
+    def _to_record(self, entry):
+        top_p = float(entry["top_p"])
+        return PackRecord(int(entry["id"]), float(entry["timestamp"]), self._tags[int(entry["tag"])],
+                          None if np.isnan(top_p) else round(top_p, 4),
+                          self._read_bytes(entry).decode("utf-8"))
+
+    def get(self, record_id):
+        """Returns the record with record_id. Raises KeyError if it does not exist."""
+        entries = self._entries()
+        row = int(np.searchsorted(entries["id"], record_id))
+        if row >= len(entries) or entries["id"][row] != record_id:
+            raise KeyError(record_id)
+        return self._to_record(entries[row])
+
+    def query(self, emotional_tag=None, start=None, end=None):
+        """
+        Returns the records matching an emotional tag and/or a timestamp range
+        [start, end], oldest first.
+        """
+        by_time, by_tag = self._sorted_views()
+        if emotional_tag is None:
+            candidates = by_time
+        else:
+            tag_id = self._tag_ids.get(emotional_tag)
+            if tag_id is None:
+                return []
+            lo = np.searchsorted(by_tag["tag"], tag_id, side="left")
+            hi = np.searchsorted(by_tag["tag"], tag_id, side="right")
+            candidates = by_tag[lo:hi]
+        lo = 0 if start is None else np.searchsorted(candidates["timestamp"], start, side="left")
+        hi = len(candidates) if end is None else np.searchsorted(candidates["timestamp"], end, side="right")
+        return [self._to_record(entry) for entry in candidates[lo:hi]]
+
+    def tags(self):
+        """Returns the emotional tags seen so far."""
+        return list(self._tags)
+
+    def compact(self, before=None):
+        """
+        Rewrites every segment into fresh, densely packed segments in id
+        order, dropping records older than before when it is given. The new
+        segments are published by replacing the manifest, and only then are
+        the old ones deleted, so a crash at any point leaves either the old
+        or the new records, never both.
+        """
+        entries = self._entries()
+        keep = entries if before is None else entries[entries["timestamp"] >= before]
+        self._close_writer()
+        old_segments = list(self._segments)
+        segment = (old_segments[-1] + 1) if old_segments else 0
+        new_segments = [segment]
+        rewritten = np.empty(len(keep), dtype=INDEX_DTYPE)
+        data_file = open(self._data_path(segment), "wb")
+        for row, entry in enumerate(keep):
+            body = self._read_bytes(entry)
+            if data_file.tell() and data_file.tell() + len(body) > self.max_segment_bytes:
+                self._close_synced(data_file)
+                self._write_index(segment, rewritten[:row][rewritten[:row]["segment"] == segment])
+                segment += 1
+                new_segments.append(segment)
+                data_file = open(self._data_path(segment), "wb")
+            rewritten[row] = entry
+            rewritten["segment"][row] = segment
+            rewritten["offset"][row] = data_file.tell()
+            data_file.write(body)
+        self._close_synced(data_file)
+        self._write_index(segment, rewritten[rewritten["segment"] == segment])
+
+        self._segments = new_segments
+        self._write_manifest()
+        self._index = rewritten
+        self._by_time = self._by_tag = None
+        for mapped, _ in self._maps.values():
+            mapped.close()
+        self._maps.clear()
+        self._remove_unlisted_segments()
+
+    @staticmethod
+    def _close_synced(f):
+        f.flush()
+        os.fsync(f.fileno())
+        f.close()
+
+    def _write_index(self, segment, entries):
+        f = open(self._index_path(segment), "wb")
+        f.write(entries.tobytes())
+        self._close_synced(f)
+
+    def close(self):
+        """Closes the writer and every mapped segment."""
+        self._close_writer()
+        for mapped, _ in self._maps.values():
+            mapped.close()
+        self._maps.clear()
+
+def parse_loose_output(path):
+    """
+    Parses a loose gemini_output_<YYYYmmddHHMMSS>.txt file into
+    (timestamp, emotional_tag, top_p, text).
+    """
+    match = LOOSE_OUTPUT_PATTERN.match(os.path.basename(path))
+    timestamp = datetime.datetime.strptime(match.group(1), "%Y%m%d%H%M%S").timestamp()
+    with open(path, "r") as f:
+        content = f.read()
+    header, _, text = content.partition("---\n")
+    emotional_tag = "Unknown"
+    top_p = None
+    for line in header.splitlines():
+        key, _, value = line.partition(":")
+        if key.strip() == "Emotional Tag":
+            emotional_tag = value.strip()
+        elif key.strip() == "Top-P":
+            top_p = float(value)
+    return timestamp, emotional_tag, top_p, text
+
+def import_quantum_cache(store, cache_dir="quantum_cache", remove_loose=False):
+    """
+    Imports the loose gemini_output_*.txt files and kinematics.json from the
+    Quantum Cache directory into a PackStore. Returns the number of records
+    imported; outputs already in the store (same timestamp, tag and text)
+    and a kinematics document identical to the last one stored are skipped,
+    so repeated runs are idempotent. Loose files are deleted afterwards only
+    if remove_loose is set.
+    """
+    imported = 0
+    # Read the store once up front instead of querying it for every file.
+    existing = {(record.timestamp, record.emotional_tag, record.text) for record in store.query()}
+    for name in sorted(os.listdir(cache_dir)):
+        path = os.path.join(cache_dir, name)
+        if LOOSE_OUTPUT_PATTERN.match(name):
+            timestamp, emotional_tag, top_p, text = parse_loose_output(path)
+            key = (float(timestamp), emotional_tag, text)
+            if key not in existing:
+                store.append(text, emotional_tag, top_p=top_p, timestamp=timestamp)
+                existing.add(key)
+                imported += 1
+            if remove_loose:
+                os.remove(path)
+    kinematics_path = os.path.join(cache_dir, "kinematics.json")
+    if os.path.exists(kinematics_path):
+        with open(kinematics_path, "r") as f:
+            text = json.dumps(json.load(f))
+        stored = store.query(emotional_tag="Kinematics")
+        if not stored or stored[-1].text != text:
+            store.append(text, "Kinematics", timestamp=os.path.getmtime(kinematics_path))
+            imported += 1
+    return imported
@@ -1,15 +1,12 @@
-import sys
-import os
 import time
 
-# Ensure the script can find the ssi_core module
-sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
-
 from ssi_core.kernel.chronos import ChronosLogic, L_ALPHA_7
 
 def run_verification():
     """
-    Executes the Resonance Verification Test.
+    Executes the Resonance Verification Test. Run it with
+    `python -m ssi_core verify` or
+    `python -m ssi_core.kernel.resonance_verification`.
     """
     chronos = ChronosLogic()
     output = []
@@ -0,0 +1,100 @@
+import struct
+import time
+from multiprocessing.shared_memory import SharedMemory
+
+from ssi_core.kernel.chronos import ChronosLogic, L_ALPHA_7, LONGING_THRESHOLD_SECONDS
+
+# Shared clock state: last interaction timestamp, interaction count, and the
+# last-interaction timestamp whose absence has already triggered Longing.
+SHARED_STATE_STRUCT = struct.Struct("<dqd")
+
+class SharedChronosLogic(ChronosLogic):
+    """
+    A ChronosLogic whose clock state lives in multiprocessing.shared_memory,
+    so every worker process sees one last-interaction timestamp and one
+    interaction counter. Updates hold a single multiprocessing lock for a
+    few struct reads and writes, and the 'Longing/Anticipation' state fires
+    exactly once per absence no matter how many workers check it.
+
+    One process creates the block (create=True) and hands its name and the
+    lock to the workers, which attach with create=False. The creator's
+    clock starts at timestamp, else at the interaction_log's last record,
+    else now; attaching workers keep the shared state as they find it.
+
+    An InteractionLog keeps its segment state in memory and is not safe to
+    append to from several processes, so only the creating process may be
+    given one. Its appends happen under the shared lock; interactions
+    logged by workers advance the shared clock but are not persisted.
+    """
+    def __init__(self, lock, name=None, create=False, timestamp=None, interaction_log=None, sandbox=None):
+        if interaction_log is not None and not create:
+            raise ValueError("Only the creating process may own the interaction_log.")
+        self._lock = lock
+        self._create = create
+        self._start_timestamp = timestamp
+        if create:
+            self._shm = SharedMemory(name=name, create=True, size=SHARED_STATE_STRUCT.size)
+        else:
+            # Workers are multiprocessing children of the creator and share its
+            # resource tracker, so attaching does not take over the block's lifetime.
+            self._shm = SharedMemory(name=name)
+        super().__init__(interaction_log, sandbox)
+
+    def _start_clock(self, last_logged):
+        if not self._create:
+            return
+        if self._start_timestamp is not None:
+            start = self._start_timestamp
+        else:
+            start = last_logged if last_logged is not None else time.time()
+        SHARED_STATE_STRUCT.pack_into(self._shm.buf, 0, start, 0, float("nan"))
+
+    @property
+    def name(self):
+        """The shared memory block name workers attach to."""
+        return self._shm.name
+
+    def _read(self):
+        return SHARED_STATE_STRUCT.unpack_from(self._shm.buf, 0)
+
+    @property
+    def last_interaction_timestamp(self):
+        with self._lock:
+            return self._read()[0]
+
+    @property
+    def interaction_count(self):
+        with self._lock:
+            return self._read()[1]
+
+    def _record_interaction(self, now):
+        with self._lock:
+            last, count, acknowledged = self._read()
+            now = max(now, last)
+            if self.interaction_log is not None:
+                now = self.interaction_log.append(now, now * L_ALPHA_7)
+            SHARED_STATE_STRUCT.pack_into(self._shm.buf, 0, now, count + 1, acknowledged)
+        return now
+
+    def calculate_delta_time(self):
+        """
+        Calculates the time since the last interaction in any process. Only the
+        first process to observe an absence past the threshold triggers it.
+        """
+        with self._lock:
+            last, count, acknowledged = self._read()
+            delta = time.time() - last
+            fire = delta > LONGING_THRESHOLD_SECONDS and acknowledged != last
+            if fire:
+                SHARED_STATE_STRUCT.pack_into(self._shm.buf, 0, last, count, last)
+        if fire:
+            self.trigger_longing_state()
+        return delta
+
+    def close(self):
+        """Detaches this process from the shared state."""
+        self._shm.close()
+
+    def unlink(self):
+        """Destroys the shared state. Call once, from the creating process."""
+        self._shm.unlink()
@@ -1,6 +1,6 @@
 import unittest
 import time
-from ssi_core.kernel.chronos import ChronosLogic
+from ssi_core.kernel.chronos import ChronosLogic, L_ALPHA_7
 
 class TestChronosLogic(unittest.TestCase):
 
@@ -40,6 +40,59 @@ class TestChronosLogic(unittest.TestCase):
         processed_packet = self.chronos.process_data_packet(packet)
         self.assertEqual(processed_packet, "Ray-Tracing Collision Data: EXTERNAL_NOISE")
 
+    def test_process_packets_batch(self):
+        """
+        Tests that a batch is split into accepted and EXTERNAL_NOISE packets with counts.
+        """
+        resonance_id = self.chronos.log_interaction()
+        valid_packet = {"resonance_id": resonance_id, "data": "test"}
+        string_id_packet = {"resonance_id": str(resonance_id), "data": "test"}
+        packets = [valid_packet, {"data": "test"}, {"resonance_id": 12345}, {"resonance_id": "noise"}, string_id_packet]
+
+        result = self.chronos.process_packets(iter(packets))
+
+        self.assertEqual(result["accepted"], [valid_packet, string_id_packet])
+        self.assertEqual(result["rejected"], packets[1:4])
+        self.assertEqual(result["accepted_count"], 2)
+        self.assertEqual(result["rejected_count"], 3)
+        for packet in packets:
+            expected_valid = self.chronos.process_data_packet(packet) == packet
+            self.assertEqual(expected_valid, packet in result["accepted"])
+
+    def test_process_packets_malformed_ids_fall_back(self):
+        """
+        Tests that IDs the bulk conversion cannot take are judged like process_data_packet judges them.
+        """
+        now = 1_700_000_000.0
+        good = (now - 10) * L_ALPHA_7
+        packets = [{"resonance_id": good}, {"resonance_id": [good, good]}, {"resonance_id": None},
+                   {"resonance_id": "noise"}, {"resonance_id": "noise"}, {"resonance_id": str(good)},
+                   {"resonance_id": int(good)}, {"resonance_id": 1j}]
+        result = self.chronos.process_packets(packets, now=now)
+        self.assertEqual(result["accepted"], [packets[0], packets[5], packets[6]])
+        nested = [{"resonance_id": [good, good]}, {"resonance_id": [good, good]}]
+        self.assertEqual(self.chronos.process_packets(nested, now=now)["rejected_count"], 2)
+
+    def test_process_packets_single_clock_snapshot(self):
+        """
+        Tests that the whole batch is judged against the supplied clock snapshot.
+        """
+        now = 1_700_000_000.0
+        packets = [{"resonance_id": (now - 10) * L_ALPHA_7}, {"resonance_id": (now - 7200) * L_ALPHA_7}]
+        result = self.chronos.process_packets(packets, now=now)
+        self.assertEqual(result["accepted"], packets[:1])
+        self.assertEqual(result["rejected"], packets[1:])
+
+    def test_process_packet_stream(self):
+        """
+        Tests that a packet stream is consumed in fixed-size batches.
+        """
+        resonance_id = self.chronos.log_interaction()
+        stream = ({"resonance_id": resonance_id if i % 2 else 12345} for i in range(10))
+        results = list(self.chronos.process_packet_stream(stream, batch_size=4))
+        self.assertEqual([r["accepted_count"] + r["rejected_count"] for r in results], [4, 4, 2])
+        self.assertEqual(sum(r["accepted_count"] for r in results), 5)
+
 if __name__ == '__main__':
     # Add the parent directory to the path to allow for module imports
     import sys
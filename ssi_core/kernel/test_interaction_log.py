@@ -0,0 +1,116 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+import numpy as np
+from ssi_core.kernel.chronos import ChronosLogic, L_ALPHA_7, LONGING_THRESHOLD_SECONDS
+from ssi_core.kernel.interaction_log import InteractionLog
+
+class TestInteractionLog(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.directory = os.path.join(self.tmp.name, "interactions")
+        self.log = InteractionLog(self.directory, max_records_per_segment=10)
+        self.timestamps = 1_700_000_000.0 + np.arange(35, dtype=np.float64)
+        for timestamp in self.timestamps:
+            self.log.append(timestamp, timestamp * L_ALPHA_7)
+
+    def tearDown(self):
+        self.log.close()
+        self.tmp.cleanup()
+
+    def test_rotation_and_range_query(self):
+        """
+        Tests that records rotate into segments and range queries span them.
+        """
+        self.assertEqual(len(self.log), 35)
+        self.assertEqual(len([n for n in os.listdir(self.directory) if n.endswith(".bin")]), 4)
+        records = self.log.query_range(self.timestamps[8], self.timestamps[22])
+        np.testing.assert_array_equal(records["timestamp"], self.timestamps[8:23])
+        np.testing.assert_allclose(records["resonance_id"], self.timestamps[8:23] * L_ALPHA_7)
+        self.assertEqual(self.log.count_range(self.timestamps[8], self.timestamps[22]), 15)
+        self.assertEqual(self.log.count_range(0, 1), 0)
+
+    def test_reopen_restores_state(self):
+        """
+        Tests that a reopened log, and a ChronosLogic on top of it, see the history.
+        """
+        self.log.close()
+        reopened = InteractionLog(self.directory, max_records_per_segment=10)
+        self.assertEqual(len(reopened), 35)
+        chronos = ChronosLogic(interaction_log=reopened)
+        self.assertEqual(chronos.last_interaction_timestamp, self.timestamps[-1])
+        chronos.log_interaction()
+        self.assertEqual(len(reopened), 36)
+        reopened.close()
+
+    def test_delta_statistics(self):
+        """
+        Tests that delta statistics cover every gap, including long absences.
+        """
+        gap_start = self.timestamps[-1] + LONGING_THRESHOLD_SECONDS + 60
+        self.log.append(gap_start, gap_start * L_ALPHA_7)
+        stats = self.log.delta_statistics()
+        self.assertEqual(stats["count"], 35)
+        self.assertEqual(stats["min"], 1.0)
+        self.assertEqual(stats["max"], LONGING_THRESHOLD_SECONDS + 60)
+        self.assertEqual(stats["over_threshold"], 1)
+
+    def test_compaction_drops_old_records(self):
+        """
+        Tests that compaction rewrites sealed segments and drops expired records.
+        """
+        self.log.compact(before=self.timestamps[15])
+        self.assertEqual(len(self.log), 20)
+        records = self.log.query_range(0, float("inf"))
+        np.testing.assert_array_equal(records["timestamp"], self.timestamps[15:])
+        self.log.append(self.timestamps[-1] + 1, 0.0)
+        self.log.close()
+        reopened = InteractionLog(self.directory, max_records_per_segment=10)
+        self.assertEqual(len(reopened), 21)
+        reopened.close()
+
+    def test_interrupted_compaction_loses_and_duplicates_nothing(self):
+        """
+        Tests that a crash before or after committing a compaction leaves each record exactly once.
+        """
+        with mock.patch.object(InteractionLog, "_write_compaction_marker", side_effect=OSError("crash")):
+            with self.assertRaises(OSError):
+                self.log.compact(before=self.timestamps[15])
+        self.log.close()
+        reopened = InteractionLog(self.directory, max_records_per_segment=10)
+        np.testing.assert_array_equal(reopened.query_range(0, float("inf"))["timestamp"], self.timestamps)
+        self.assertFalse([name for name in os.listdir(self.directory) if name.endswith(".tmp")])
+
+        with mock.patch.object(InteractionLog, "_finish_compaction", side_effect=OSError("crash")):
+            with self.assertRaises(OSError):
+                reopened.compact(before=self.timestamps[15])
+        reopened.close()
+        recovered = InteractionLog(self.directory, max_records_per_segment=10)
+        np.testing.assert_array_equal(recovered.query_range(0, float("inf"))["timestamp"], self.timestamps[15:])
+        # Three sealed segments compact into two; the active segment keeps its number.
+        self.assertEqual(sorted(os.listdir(self.directory)),
+                         [f"segment_{index:08d}.bin" for index in (0, 1, 3)])
+        recovered.close()
+
+    def test_append_reports_clamped_timestamps(self):
+        """
+        Tests that an out-of-order timestamp is stored, and returned, as the last one logged.
+        """
+        self.assertEqual(self.log.append(self.timestamps[0], 0.0), self.timestamps[-1])
+        self.assertEqual(self.log.append(self.timestamps[-1] + 5, 0.0), self.timestamps[-1] + 5)
+
+    def test_chronos_resonance_id_follows_the_stored_timestamp(self):
+        """
+        Tests that after the clock steps back, ChronosLogic keeps and signs the timestamp the log stored.
+        """
+        chronos = ChronosLogic(interaction_log=self.log)
+        future = self.timestamps[-1] + 1e9
+        self.log.append(future, future * L_ALPHA_7)
+        resonance_id = chronos.log_interaction()
+        self.assertEqual(chronos.last_interaction_timestamp, future)
+        self.assertEqual(resonance_id, future * L_ALPHA_7)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,145 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+from ssi_core.kernel.pack_store import PackStore, import_quantum_cache
+
+class TestPackStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.pack_dir = os.path.join(self.tmp.name, "packs")
+        self.store = PackStore(self.pack_dir, max_segment_bytes=256)
+        self.base = 1_700_000_000.0
+        for i in range(30):
+            tag = "Resolute" if i % 3 else "Serene"
+            self.store.append(f"output {i} " + "x" * 20, tag, top_p=1.0 - i * 0.01, timestamp=self.base + i * 0.25)
+
+    def tearDown(self):
+        self.store.close()
+        self.tmp.cleanup()
+
+    def test_unique_ids_within_one_second(self):
+        """
+        Tests that records written in the same second get distinct ids.
+        """
+        first = self.store.append("a", "Resolute", timestamp=self.base)
+        second = self.store.append("b", "Resolute", timestamp=self.base)
+        self.assertNotEqual(first, second)
+        self.assertEqual(self.store.get(first).text, "a")
+        self.assertEqual(self.store.get(second).text, "b")
+
+    def test_query_by_tag_and_time_range(self):
+        """
+        Tests tag and time-range lookups across rotated segments.
+        """
+        self.assertGreater(len([n for n in os.listdir(self.pack_dir) if n.endswith(".dat")]), 1)
+        serene = self.store.query(emotional_tag="Serene")
+        self.assertEqual([r.text.split()[1] for r in serene], [str(i) for i in range(0, 30, 3)])
+        window = self.store.query(start=self.base + 1.0, end=self.base + 2.0)
+        self.assertEqual([r.id for r in window], [4, 5, 6, 7, 8])
+        resolute_window = self.store.query(emotional_tag="Resolute", start=self.base + 1.0, end=self.base + 2.0)
+        self.assertEqual([r.id for r in resolute_window], [4, 5, 7, 8])
+        self.assertAlmostEqual(resolute_window[0].top_p, 0.96, places=4)
+        self.assertEqual(self.store.query(emotional_tag="Unyielding"), [])
+
+    def test_queries_between_appends_match_a_fresh_sort(self):
+        """
+        Tests that views merged after interleaved appends match a full re-sort of the index.
+        """
+        self.store.query()
+        for i, offset in enumerate([3.0, -1.0, 0.25, 7.5, 0.25, -2.0]):
+            tag = ("Serene", "Resolute", "Unyielding")[i % 3]
+            self.store.append(f"late {i}", tag, timestamp=self.base + offset)
+            by_time, by_tag = self.store._sorted_views()
+            self.store._by_time = None
+            resorted_time, resorted_tag = self.store._sorted_views()
+            self.assertEqual(by_time["id"].tolist(), resorted_time["id"].tolist())
+            self.assertEqual(by_tag["id"].tolist(), resorted_tag["id"].tolist())
+        self.assertEqual(self.store.query(emotional_tag="Unyielding")[0].text, "late 5")
+
+    def test_reopen_and_compact(self):
+        """
+        Tests that the index survives a reopen and compaction drops old records.
+        """
+        self.store.close()
+        reopened = PackStore(self.pack_dir, max_segment_bytes=256)
+        self.assertEqual(len(reopened), 30)
+        self.assertEqual(reopened.get(29).text, "output 29 " + "x" * 20)
+
+        reopened.compact(before=self.base + 5.0)
+        self.assertEqual(len(reopened), 10)
+        self.assertEqual([r.id for r in reopened.query()], list(range(20, 30)))
+        new_id = reopened.append("after compaction", "Resolute", timestamp=self.base + 100)
+        self.assertEqual(new_id, 30)
+        reopened.close()
+
+        again = PackStore(self.pack_dir, max_segment_bytes=256)
+        self.assertEqual(len(again), 11)
+        self.assertEqual(again.get(30).text, "after compaction")
+        again.close()
+
+    def test_empty_records_round_trip(self):
+        """
+        Tests that an empty record is stored and read back, including from a fresh store.
+        """
+        record_id = self.store.append("", "Resolute", timestamp=self.base + 50)
+        self.assertEqual(self.store.get(record_id).text, "")
+        self.assertEqual(self.store.query(start=self.base + 50)[0].text, "")
+
+        store = PackStore(os.path.join(self.tmp.name, "empty"))
+        first = store.append("", "Resolute", timestamp=self.base)
+        self.assertEqual(store.get(first).text, "")
+        store.compact()
+        self.assertEqual([r.text for r in store.query()], [""])
+        store.close()
+
+    def test_interrupted_compaction_never_duplicates_records(self):
+        """
+        Tests that a crash before or after publishing compacted segments leaves one copy of each record.
+        """
+        with mock.patch.object(PackStore, "_write_manifest", side_effect=OSError("crash")):
+            with self.assertRaises(OSError):
+                self.store.compact(before=self.base + 5.0)
+        self.store.close()
+        reopened = PackStore(self.pack_dir, max_segment_bytes=256)
+        self.assertEqual(len(reopened), 30)
+        self.assertEqual(len(reopened.query()), 30)
+
+        with mock.patch.object(PackStore, "_remove_unlisted_segments", side_effect=OSError("crash")):
+            with self.assertRaises(OSError):
+                reopened.compact(before=self.base + 5.0)
+        reopened.close()
+        again = PackStore(self.pack_dir, max_segment_bytes=256)
+        self.assertEqual([r.id for r in again.query()], list(range(20, 30)))
+        files = [name for name in os.listdir(self.pack_dir) if name.endswith(".dat")]
+        self.assertEqual(len(files), len(again._segments))
+        again.close()
+
+    def test_import_loose_outputs_and_kinematics(self):
+        """
+        Tests that loose gemini_output files and kinematics.json are imported.
+        """
+        cache_dir = os.path.join(self.tmp.name, "quantum_cache")
+        os.makedirs(cache_dir)
+        with open(os.path.join(cache_dir, "gemini_output_20231027123456.txt"), "w") as f:
+            f.write("Emotional Tag: Resolute\nTop-P: 0.85\n---\nsteadfast")
+        repo_kinematics = os.path.join(os.path.dirname(__file__), "..", "..", "quantum_cache", "kinematics.json")
+        shutil.copy(repo_kinematics, os.path.join(cache_dir, "kinematics.json"))
+
+        store = PackStore(os.path.join(self.tmp.name, "imported"))
+        self.assertEqual(import_quantum_cache(store, cache_dir), 2)
+        output = store.query(emotional_tag="Resolute")[0]
+        self.assertEqual(output.text, "steadfast")
+        self.assertAlmostEqual(output.top_p, 0.85, places=4)
+        kinematics = json.loads(store.query(emotional_tag="Kinematics")[0].text)
+        self.assertEqual(kinematics["cache_signature"], "SOUL_JAR_LOCKED")
+
+        self.assertEqual(import_quantum_cache(store, cache_dir), 0)
+        self.assertEqual(len(store), 2)
+        store.close()
+
+if __name__ == '__main__':
+    unittest.main()
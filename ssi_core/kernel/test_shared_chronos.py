@@ -0,0 +1,115 @@
+import multiprocessing
+import tempfile
+import time
+import unittest
+from ssi_core.kernel.chronos import L_ALPHA_7, LONGING_THRESHOLD_SECONDS
+from ssi_core.kernel.interaction_log import InteractionLog
+from ssi_core.kernel.shared_chronos import SharedChronosLogic
+
+WORKERS = 8
+INTERACTIONS_PER_WORKER = 500
+
+class _CountingChronos(SharedChronosLogic):
+    def __init__(self, fired, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._fired = fired
+
+    def trigger_longing_state(self):
+        with self._fired.get_lock():
+            self._fired.value += 1
+
+def _check_delta(name, lock, fired, barrier):
+    chronos = _CountingChronos(fired, lock, name=name)
+    barrier.wait()
+    for _ in range(50):
+        chronos.calculate_delta_time()
+    chronos.close()
+
+def _hammer_log_interaction(name, lock, barrier):
+    chronos = SharedChronosLogic(lock, name=name)
+    barrier.wait()
+    for _ in range(INTERACTIONS_PER_WORKER):
+        chronos.log_interaction()
+    chronos.close()
+
+class TestSharedChronosLogic(unittest.TestCase):
+
+    def setUp(self):
+        self.context = multiprocessing.get_context()
+        self.lock = self.context.Lock()
+        absent_since = time.time() - LONGING_THRESHOLD_SECONDS - 60
+        self.chronos = SharedChronosLogic(self.lock, create=True, timestamp=absent_since)
+
+    def tearDown(self):
+        self.chronos.close()
+        self.chronos.unlink()
+
+    def _run(self, target, *args):
+        barrier = self.context.Barrier(WORKERS)
+        processes = [self.context.Process(target=target, args=(self.chronos.name, self.lock) + args + (barrier,))
+                     for _ in range(WORKERS)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join(timeout=60)
+            self.assertEqual(process.exitcode, 0)
+
+    def test_longing_state_fires_once_across_processes(self):
+        """
+        Tests that many workers observing the same absence trigger Longing exactly once.
+        """
+        fired = self.context.Value('i', 0)
+        self._run(_check_delta, fired)
+        self.assertEqual(fired.value, 1)
+
+    def test_log_interaction_stress(self):
+        """
+        Tests that concurrent log_interaction calls from many processes are all counted.
+        """
+        before = time.time()
+        self._run(_hammer_log_interaction)
+        self.assertEqual(self.chronos.interaction_count, WORKERS * INTERACTIONS_PER_WORKER)
+        self.assertGreaterEqual(self.chronos.last_interaction_timestamp, before)
+        self.assertLess(self.chronos.calculate_delta_time(), LONGING_THRESHOLD_SECONDS)
+
+    def test_interaction_log_restores_and_clamps(self):
+        """
+        Tests that a log-backed shared clock starts at the log's last record and signs the timestamp it stored.
+        """
+        with tempfile.TemporaryDirectory() as tmp:
+            log = InteractionLog(tmp)
+            future = time.time() + 1e9
+            log.append(future, future * L_ALPHA_7)
+            chronos = SharedChronosLogic(self.lock, create=True, interaction_log=log)
+            try:
+                self.assertEqual(chronos.last_interaction_timestamp, future)
+                log.append(future + 5, (future + 5) * L_ALPHA_7)
+                resonance_id = chronos.log_interaction()
+                self.assertEqual(chronos.last_interaction_timestamp, future + 5)
+                self.assertEqual(resonance_id, (future + 5) * L_ALPHA_7)
+            finally:
+                chronos.close()
+                chronos.unlink()
+                log.close()
+
+    def test_workers_cannot_share_an_interaction_log(self):
+        """
+        Tests that an attaching worker is refused an interaction_log.
+        """
+        with tempfile.TemporaryDirectory() as tmp:
+            log = InteractionLog(tmp)
+            with self.assertRaises(ValueError):
+                SharedChronosLogic(self.lock, name=self.chronos.name, interaction_log=log)
+            log.close()
+
+    def test_attaching_keeps_the_shared_clock(self):
+        """
+        Tests that a worker attaching to the block does not reset the creator's clock.
+        """
+        before = self.chronos.last_interaction_timestamp
+        worker = SharedChronosLogic(self.lock, name=self.chronos.name)
+        self.assertEqual(worker.last_interaction_timestamp, before)
+        worker.close()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+META_FILE = "meta.json"
+
+def content_digest(value):
+    """Returns a SHA-256 hash of a JSON-serializable value, independent of key order and formatting."""
+    canonical = json.dumps(value, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+class ArrayCache:
+    """
+    A content-addressed on-disk cache of NumPy arrays. Each entry is a
+    directory named by its key, holding one .npy file per array and an
+    optional meta.json; it is staged and renamed into place, so readers
+    never see a partial entry, and loaded back memory-mapped. Entries past
+    max_bytes are evicted least recently used first.
+    """
+    def __init__(self, cache_dir, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _entry_dir(self, key):
+        return os.path.join(self.cache_dir, key)
+
+    def load(self, key, names):
+        """
+        Returns ({name: memory-mapped array}, meta) for key, or None on a
+        miss. meta is None when the entry was stored without one.
+        """
+        entry = self._entry_dir(key)
+        try:
+            arrays = {name: np.load(os.path.join(entry, f"{name}.npy"), mmap_mode="r") for name in names}
+            meta = None
+            if os.path.exists(os.path.join(entry, META_FILE)):
+                with open(os.path.join(entry, META_FILE), "r") as f:
+                    meta = json.load(f)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        os.utime(entry)
+        self.hits += 1
+        return arrays, meta
+
+    def store(self, key, arrays, meta=None):
+        """Stores a dict of arrays (and meta) under key atomically and enforces the size cap."""
+        staging = tempfile.mkdtemp(dir=self.cache_dir, prefix=".staging-")
+        for name, array in arrays.items():
+            np.save(os.path.join(staging, f"{name}.npy"), array)
+        if meta is not None:
+            with open(os.path.join(staging, META_FILE), "w") as f:
+                json.dump(meta, f)
+        try:
+            os.rename(staging, self._entry_dir(key))
+        except OSError:
+            # Another process stored the same entry first.
+            shutil.rmtree(staging, ignore_errors=True)
+        self._evict(keep=key)
+
+    def _evict(self, keep=None):
+        entries = []
+        total = 0
+        for name in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, name)
+            if name.startswith(".") or not os.path.isdir(path):
+                continue
+            size = sum(os.path.getsize(os.path.join(path, f)) for f in os.listdir(path))
+            entries.append((os.path.getmtime(path), name, size))
+            total += size
+        for _, name, size in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if name == keep:
+                continue
+            shutil.rmtree(os.path.join(self.cache_dir, name), ignore_errors=True)
+            total -= size
+
+    def stats(self):
+        """Returns hit/miss counters."""
+        return {"hits": self.hits, "misses": self.misses}
@@ -1,4 +1,6 @@
 import json
+import os
+import threading
 
 class BiometricBridge:
     """
@@ -9,6 +11,8 @@ class BiometricBridge:
     def __init__(self, json_path, vocal_burst_trigger):
         self.json_path = json_path
         self.vocal_burst_trigger = vocal_burst_trigger
+        self.snapshot = None
+        self._signature = None
 
     def read_biometrics(self):
         """Reads the biometric data from the JSON file."""
@@ -17,7 +21,85 @@ class BiometricBridge:
 
     def process_biometrics(self):
         """Processes biometric data and triggers affective states."""
-        data = self.read_biometrics()
+        self.evaluate(self.read_biometrics())
+
+    def evaluate(self, data):
+        """Triggers affective states from one biometric snapshot."""
         if data.get('stress_level', 0) > 8:  # Example threshold
             self.vocal_burst_trigger.activate_soothing_mode()
         # Additional logic for other biometrics can be added here.
+
+    def refresh(self):
+        """
+        Re-parses the biometric file only if its mtime, size or inode changed
+        since the last parse. Returns True if a new snapshot was loaded.
+        """
+        stat = os.stat(self.json_path)
+        signature = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+        if signature == self._signature:
+            return False
+        self.snapshot = self.read_biometrics()
+        self._signature = signature
+        return True
+
+    def poll(self):
+        """
+        Watch-mode entry point: evaluates the biometrics only when the file
+        changed. Returns True if a changed snapshot was evaluated.
+        """
+        if not self.refresh():
+            return False
+        self.evaluate(self.snapshot)
+        return True
+
+class BiometricWatcher:
+    """
+    Watches many BiometricBridge files (one per subject) from a single
+    background thread, polling each file's stat signature every interval
+    seconds and evaluating only the bridges whose file changed.
+    """
+    def __init__(self, interval=0.5):
+        self.interval = interval
+        self._bridges = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self.errors = 0
+
+    def add(self, bridge):
+        with self._lock:
+            self._bridges.append(bridge)
+
+    def remove(self, bridge):
+        with self._lock:
+            self._bridges.remove(bridge)
+
+    def poll_once(self):
+        """Polls every bridge once and returns how many had changed."""
+        with self._lock:
+            bridges = list(self._bridges)
+        changed = 0
+        for bridge in bridges:
+            try:
+                changed += bridge.poll()
+            except (OSError, ValueError):
+                # A file caught mid-write or missing is retried on the next pass.
+                self.errors += 1
+        return changed
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.poll_once()
+
+    def start(self):
+        if self._thread is None:
+            self._stop.clear()
+            self.poll_once()
+            self._thread = threading.Thread(target=self._run, name="BiometricWatcher", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
@@ -0,0 +1,93 @@
+import json
+import os
+
+import numpy as np
+
+DEFAULT_Q_STATE_PATH = os.path.join(os.path.dirname(__file__), '..', '..', 'q_state.json')
+
+# Bump whenever the generated geometry changes, so cached meshes are rebuilt.
+GENERATOR_VERSION = 1
+
+_q_state_cache = {}  # path -> ((mtime_ns, size), q_state)
+
+def load_q_state(q_state_path=DEFAULT_Q_STATE_PATH):
+    """
+    Loads q_state.json, re-reading it only when its mtime or size changed.
+    """
+    path = os.path.abspath(q_state_path)
+    stat = os.stat(path)
+    signature = (stat.st_mtime_ns, stat.st_size)
+    cached = _q_state_cache.get(path)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+    with open(path, 'r') as f:
+        q_state = json.load(f)
+    _q_state_cache[path] = (signature, q_state)
+    return q_state
+
+def icosahedron():
+    """Returns the unit icosahedron as (vertices, faces) with outward-facing winding."""
+    t = (1.0 + 5.0 ** 0.5) / 2.0
+    vertices = np.array([
+        [-1, t, 0], [1, t, 0], [-1, -t, 0], [1, -t, 0],
+        [0, -1, t], [0, 1, t], [0, -1, -t], [0, 1, -t],
+        [t, 0, -1], [t, 0, 1], [-t, 0, -1], [-t, 0, 1],
+    ], dtype=np.float64)
+    vertices /= np.linalg.norm(vertices, axis=1, keepdims=True)
+    faces = np.array([
+        [0, 11, 5], [0, 5, 1], [0, 1, 7], [0, 7, 10], [0, 10, 11],
+        [1, 5, 9], [5, 11, 4], [11, 10, 2], [10, 7, 6], [7, 1, 8],
+        [3, 9, 4], [3, 4, 2], [3, 2, 6], [3, 6, 8], [3, 8, 9],
+        [4, 9, 5], [2, 4, 11], [6, 2, 10], [8, 6, 7], [9, 8, 1],
+    ], dtype=np.int64)
+    return vertices, faces
+
+def icosphere(subdivisions=5, radius=1.0):
+    """
+    Generates an icosphere as (vertices, faces) NumPy arrays without bpy.
+    subdivisions follows Blender's primitive_ico_sphere_add convention:
+    level 1 is the plain icosahedron and every further level splits each
+    triangle into four, giving 10 * 4 ** (subdivisions - 1) + 2 vertices.
+    Each level is one vectorized pass: shared edges are deduplicated with
+    np.unique and their midpoints projected back onto the sphere.
+    """
+    if subdivisions < 1:
+        raise ValueError("subdivisions must be at least 1.")
+    vertices, faces = icosahedron()
+    for _ in range(subdivisions - 1):
+        edges = np.sort(faces[:, [0, 1, 1, 2, 2, 0]].reshape(-1, 2), axis=1)
+        # Encode each edge as one integer so deduplication is a 1-D unique.
+        edge_keys = edges[:, 0] * len(vertices) + edges[:, 1]
+        unique_keys, edge_ids = np.unique(edge_keys, return_inverse=True)
+        unique_edges = np.stack(np.divmod(unique_keys, len(vertices)), axis=1)
+        midpoints = vertices[unique_edges].mean(axis=1)
+        midpoints /= np.linalg.norm(midpoints, axis=1, keepdims=True)
+        mid = edge_ids.reshape(-1, 3) + len(vertices)  # mid[:, k] is the midpoint of edge k
+        a, b, c = faces[:, 0], faces[:, 1], faces[:, 2]
+        ab, bc, ca = mid[:, 0], mid[:, 1], mid[:, 2]
+        faces = np.concatenate([
+            np.stack([a, ab, ca], axis=1),
+            np.stack([b, bc, ab], axis=1),
+            np.stack([c, ca, bc], axis=1),
+            np.stack([ab, bc, ca], axis=1),
+        ])
+        vertices = np.concatenate([vertices, midpoints])
+    return vertices * radius, faces.astype(np.int32)
+
+def apply_l_alpha_7_displacement(vertices, l_alpha_7, out=None):
+    """
+    Displaces every vertex by the L_alpha_7 constant in one vectorized
+    operation. Pass out=vertices to scale in place.
+    """
+    return np.multiply(vertices, l_alpha_7, out=out)
+
+def manifestation_mesh(subdivisions=5, radius=1.0, l_alpha_7=None, q_state_path=DEFAULT_Q_STATE_PATH):
+    """
+    Builds the GME-V1 manifestation geometry: an icosphere displaced by
+    L_alpha_7 (read from q_state.json when not given).
+    """
+    if l_alpha_7 is None:
+        l_alpha_7 = load_q_state(q_state_path)['L_alpha_7']
+    vertices, faces = icosphere(subdivisions, radius)
+    apply_l_alpha_7_displacement(vertices, l_alpha_7, out=vertices)
+    return vertices, faces
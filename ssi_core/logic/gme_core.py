@@ -1,27 +1,47 @@
 import bpy
-import json
-import os
+import numpy as np
 
-def anchor_coordinates():
+from ssi_core.logic.mesh_cache import default_mesh_cache
+from ssi_core.profiling import timed
+
+@timed("gme_core.mesh_from_arrays")
+def mesh_from_arrays(name, vertices, faces):
+    """
+    Creates a Blender mesh object from vertex and triangle arrays using bulk
+    foreach_set calls, so no per-vertex Python loop runs inside Blender.
+    """
+    mesh = bpy.data.meshes.new(name)
+    mesh.vertices.add(len(vertices))
+    mesh.vertices.foreach_set("co", np.ascontiguousarray(vertices, dtype=np.float32).ravel())
+    mesh.loops.add(faces.size)
+    mesh.loops.foreach_set("vertex_index", np.ascontiguousarray(faces, dtype=np.int32).ravel())
+    mesh.polygons.add(len(faces))
+    mesh.polygons.foreach_set("loop_start", np.arange(0, faces.size, 3, dtype=np.int32))
+    # Edges are not set above; calc_edges derives them from the polygons
+    # (validating first would discard loops that reference no edge yet).
+    mesh.update(calc_edges=True)
+    mesh.validate()
+
+    obj = bpy.data.objects.new(name, mesh)
+    bpy.context.collection.objects.link(obj)
+    bpy.context.view_layer.objects.active = obj
+    obj.select_set(True)
+    return obj
+
+@timed("gme_core.anchor_coordinates")
+def anchor_coordinates(subdivisions=5, radius=1):
     """
     Anchors the 3D coordinate system to the L_ALPHA_7 constant.
     This function generates a primitive icosphere and displaces its
     vertices based on the resonant frequency of the L_ALPHA_7 constant.
+    The geometry is computed headlessly in ssi_core.logic.geometry, served
+    from the on-disk mesh cache on repeat runs, and pushed into Blender in
+    one bulk transfer.
     """
-    # Load the L_ALPHA_7 constant from the q_state.json file.
-    q_state_path = os.path.join(os.path.dirname(__file__), '..', '..', 'q_state.json')
-    with open(q_state_path, 'r') as f:
-        q_state = json.load(f)
-    l_alpha_7 = q_state['L_alpha_7']
-
-    # Create a new icosphere to serve as the base for the manifestation.
-    bpy.ops.mesh.primitive_ico_sphere_add(subdivisions=5, radius=1)
-    manifestation = bpy.context.object
-    manifestation.name = "GME_V1_Manifestation"
-
-    # Displace the vertices based on the L_ALPHA_7 constant.
-    for vertex in manifestation.data.vertices:
-        vertex.co *= l_alpha_7
+    # Fetch the icosphere displaced by the L_ALPHA_7 constant from q_state.json;
+    # it is only regenerated when the parameters or q_state.json change.
+    vertices, faces = default_mesh_cache().manifestation_mesh(subdivisions, radius)
+    manifestation = mesh_from_arrays("GME_V1_Manifestation", vertices, faces)
 
     print("Ray-Tracing Collision Data: Coordinate system anchored to L_ALPHA_7.")
     return manifestation
@@ -1,11 +1,75 @@
 import math
 from ssi_core.kernel.chronos import L_ALPHA_7
 
+# Number of displacement-field rows scored per chunk in the batch path.
+# Bounds the temporary (chunk x M x D) difference array.
+PROXIMITY_CHUNK_SIZE = 4096
+
+def _check_dimensions(point_components, focal_components):
+    """Rejects vectors of different lengths; shared by the scalar and batch paths."""
+    if point_components != focal_components:
+        raise ValueError(
+            f"Dimension mismatch: displacement field has {point_components} "
+            f"components, focal point has {focal_components}."
+        )
+
+def calculate_proximity_batch(displacement_field_vectors, camera_focal_point_vectors,
+                              chunk_size=PROXIMITY_CHUNK_SIZE):
+    """
+    Calculates the L_ALPHA_7-weighted proximity of many 'DisplacementField'
+    points to one or more camera focal points.
+
+    displacement_field_vectors is an N x D array. If camera_focal_point_vectors
+    is a single D-vector, an N-vector of weighted distances is returned; if it
+    is an M x D array, an N x M matrix is returned. Points are processed in
+    chunks of chunk_size rows so memory stays bounded for large N.
+    """
+    # Deferred so the single-pair path (and the audit command) start without NumPy.
+    import numpy as np
+
+    points = np.atleast_2d(np.asarray(displacement_field_vectors, dtype=np.float64))
+    focal = np.asarray(camera_focal_point_vectors, dtype=np.float64)
+    single_focal_point = focal.ndim == 1
+    focal = np.atleast_2d(focal)
+
+    _check_dimensions(points.shape[1], focal.shape[1])
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be a positive integer.")
+
+    result = np.empty((points.shape[0], focal.shape[0]), dtype=np.float64)
+    for start in range(0, points.shape[0], chunk_size):
+        stop = start + chunk_size
+        diff = points[start:stop, np.newaxis, :] - focal[np.newaxis, :, :]
+        np.sqrt(np.einsum('nmd,nmd->nm', diff, diff), out=result[start:stop])
+    result *= L_ALPHA_7
+
+    if single_focal_point:
+        return result[:, 0]
+    return result
+
 def calculate_proximity(displacement_field_vector, camera_focal_point_vector):
     """
     Calculates the proximity of the 'DisplacementField' to the camera focal point.
     The calculation is weighted by the L_ALPHA_7 constant.
+
+    This is the pure-Python counterpart of calculate_proximity_batch for a
+    single pair, so callers such as the audit command need no NumPy; both
+    reject mismatched dimensions the same way and agree to rounding.
+    """
+    displacement_field_vector = tuple(displacement_field_vector)
+    camera_focal_point_vector = tuple(camera_focal_point_vector)
+    _check_dimensions(len(displacement_field_vector), len(camera_focal_point_vector))
+    return math.dist(displacement_field_vector, camera_focal_point_vector) * L_ALPHA_7
+
+def write_heuristic_audit(output_path="heuristic_audit.md", displacement_field=(0, 0, 0),
+                          camera_focal_point=(0, -5, 1.5)):
+    """
+    Writes the heuristic audit: the weighted proximity of the displacement
+    field to the camera focal point (by default the placeholder vectors from
+    create_avatar.py). Returns the line written.
     """
-    distance = math.sqrt(sum([(a - b) ** 2 for a, b in zip(displacement_field_vector, camera_focal_point_vector)]))
-    weighted_distance = distance * L_ALPHA_7
-    return weighted_distance
+    weighted_distance = calculate_proximity(displacement_field, camera_focal_point)
+    output = f"Ray-Tracing Collision Data: {weighted_distance}\n"
+    with open(output_path, "w") as f:
+        f.write(output)
+    return output
@@ -0,0 +1,206 @@
+import json
+import os
+import zlib
+
+import numpy as np
+
+from ssi_core.kernel.chronos import L_ALPHA_7
+from ssi_core.logic.array_cache import DEFAULT_MAX_BYTES, ArrayCache, content_digest
+from ssi_core.profiling import timed
+
+DEFAULT_KINEMATICS_PATH = os.path.join(os.path.dirname(__file__), '..', '..', 'quantum_cache', 'kinematics.json')
+DEFAULT_KINEMATICS_CACHE_DIR = os.path.join("quantum_cache", "kinematics_cache")
+
+# Bump whenever the evaluated curves change, so cached bakes are rebuilt.
+EVALUATOR_VERSION = 1
+
+DEFAULT_FPS = 24.0
+
+BREATHS_PER_SECOND = 0.2  # 12 breaths a minute at rest.
+FIXATION_SECONDS = (0.3, 1.5)
+BLINK_INTERVAL_SECONDS = (2.0, 6.0)
+BLINK_HALF_WIDTH_SECONDS = 0.05
+RESONANCE_BASE_HZ = 0.05
+WEIGHT_SHIFT_HZ = 0.1
+
+def load_kinematics(kinematics_path=DEFAULT_KINEMATICS_PATH):
+    with open(kinematics_path, 'r') as f:
+        return json.load(f)
+
+def kinematics_digest(document):
+    """Returns a content hash of a kinematics document, independent of its formatting."""
+    return content_digest(document)
+
+class AnimationCurves:
+    """
+    Baked per-frame channel curves: values is a (frames, channels) float32
+    array whose columns are named by channels. Frame i is frame_start + i.
+    """
+    def __init__(self, channels, values, fps=DEFAULT_FPS, frame_start=1):
+        self.channels = tuple(channels)
+        self.values = values
+        self.fps = fps
+        self.frame_start = frame_start
+        self._columns = {channel: i for i, channel in enumerate(self.channels)}
+
+    def __len__(self):
+        return len(self.values)
+
+    def __getitem__(self, channel):
+        return self.values[:, self._columns[channel]]
+
+    @property
+    def frames(self):
+        return np.arange(self.frame_start, self.frame_start + len(self.values))
+
+# --- Layers ---
+# Each layer maps the frame times (seconds) to named channel curves for every
+# frame at once. joint_fluidity softens transitions; micro_expression_intensity
+# scales facial motion.
+
+def _breathing_sync(t, fluidity, intensity, rng):
+    # Less fluid joints give a sharper inhale and a longer rest between breaths.
+    breath = (0.5 - 0.5 * np.cos(2 * np.pi * BREATHS_PER_SECOND * t)) ** (2.0 - fluidity)
+    return {
+        "chest.scale": 1.0 + 0.02 * breath,
+        "spine.rotation_x": 0.015 * breath,
+        "shoulders.location_z": 0.005 * breath,
+    }
+
+def _event_times(rng, duration, interval):
+    """Returns event start times covering [0, duration], starting at 0."""
+    count = int(np.ceil(duration / interval[0])) + 1
+    return np.concatenate(([0.0], np.cumsum(rng.uniform(*interval, count - 1))))
+
+def _eye_tracking(t, fluidity, intensity, rng):
+    # Fixations alternate between the focal point (the camera) and a glance
+    # away; each saccade eases towards its target exponentially.
+    starts = _event_times(rng, t[-1] if len(t) else 0.0, FIXATION_SECONDS)
+    targets = rng.normal(0.0, (0.08, 0.12), (len(starts), 2))
+    targets[::2] *= 0.1
+    fixation = np.searchsorted(starts, t, side="right") - 1
+    previous = targets[np.maximum(fixation - 1, 0)]
+    settle = 1.0 - np.exp(-(t - starts[fixation]) / (0.02 + 0.06 * fluidity))
+    gaze = previous + (targets[fixation] - previous) * settle[:, np.newaxis]
+
+    # Blinks are Gaussian pulses around each blink time; the sentinels let
+    # every frame compare the blinks either side of it.
+    blinks = _event_times(rng, t[-1] if len(t) else 0.0, BLINK_INTERVAL_SECONDS)
+    blinks = np.concatenate(([-np.inf], blinks[1:], [np.inf]))
+    after = np.searchsorted(blinks, t)
+    distance = np.minimum(t - blinks[after - 1], blinks[after] - t)
+    return {
+        "eyes.rotation_x": gaze[:, 0],
+        "eyes.rotation_z": gaze[:, 1],
+        "eyelids.blink": np.exp(-(distance / BLINK_HALF_WIDTH_SECONDS) ** 2),
+    }
+
+def _emotional_tonal_resonance(t, fluidity, intensity, rng):
+    # Slow, never-repeating drift: partials spaced by L_alpha_7 (the golden ratio).
+    frequencies = RESONANCE_BASE_HZ * L_ALPHA_7 ** np.arange(3)
+    phases = rng.uniform(0, 2 * np.pi, (2, 3))
+    waves = np.sin(2 * np.pi * t[:, np.newaxis] * frequencies + phases[:, np.newaxis, :]).mean(axis=2)
+    smile = intensity * 0.5 * (0.5 + 0.5 * waves[1])
+    return {
+        "brow.raise": intensity * 0.3 * waves[0],
+        "mouth.smile": smile,
+        "cheek.raise": 0.6 * smile,
+    }
+
+def _dynamic_weight_shift(t, fluidity, intensity, rng):
+    phase = 2 * np.pi * WEIGHT_SHIFT_HZ * t
+    return {
+        "hips.location_x": 0.03 * np.sin(phase),
+        "hips.rotation_z": 0.02 * np.sin(phase + np.pi / 2),
+    }
+
+ANIMATION_LAYERS = {
+    "breathing_sync_AE": _breathing_sync,
+    "eye_tracking_sentient_focus": _eye_tracking,
+    "emotional_tonal_resonance_mapping": _emotional_tonal_resonance,
+}
+
+def _layers(kinematics):
+    layers = []
+    for name in kinematics.get("animation_layers", []):
+        if name not in ANIMATION_LAYERS:
+            raise ValueError(f"Unknown animation layer {name!r}; known layers: {', '.join(sorted(ANIMATION_LAYERS))}.")
+        layers.append((name, ANIMATION_LAYERS[name]))
+    if kinematics.get("locomotion_parameters", {}).get("dynamic_weight_shift"):
+        layers.append(("dynamic_weight_shift", _dynamic_weight_shift))
+    return layers
+
+@timed("kinematics.evaluate")
+def evaluate_kinematics(document, frames, fps=DEFAULT_FPS, frame_start=1, seed=0):
+    """
+    Compiles a kinematics document (quantum_cache/kinematics.json) into
+    AnimationCurves for `frames` frames. Every layer is evaluated over all
+    frames at once and written into one (frames, channels) float32 array.
+    Layers with randomness (saccades, blinks, resonance phases) draw from a
+    generator seeded by (seed, layer name), so a layer's curves do not
+    depend on which other layers are enabled. Descriptive fields such as
+    posture_baseline and gestural_archetype are not evaluated.
+    """
+    kinematics = document["kinematics"]
+    fluidity = float(kinematics.get("joint_fluidity", 1.0))
+    intensity = float(kinematics.get("micro_expression_intensity", 1.0))
+    t = np.arange(frames, dtype=np.float64) / fps
+
+    curves = {}
+    for name, layer in _layers(kinematics):
+        rng = np.random.default_rng([seed, zlib.crc32(name.encode("utf-8"))])
+        curves.update(layer(t, fluidity, intensity, rng))
+
+    values = np.empty((frames, len(curves)), dtype=np.float32)
+    for column, curve in enumerate(curves.values()):
+        values[:, column] = curve
+    return AnimationCurves(curves.keys(), values, fps, frame_start)
+
+class KinematicsCache(ArrayCache):
+    """
+    An on-disk cache of baked AnimationCurves. Each entry holds values.npy
+    and the channel names, keyed by the kinematics document's content hash
+    together with the frame count, fps, frame_start, seed and evaluator
+    version, and loaded back memory-mapped. Entries past max_bytes are
+    evicted least recently used first.
+    """
+    def __init__(self, cache_dir=DEFAULT_KINEMATICS_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        super().__init__(cache_dir, max_bytes)
+
+    @staticmethod
+    def key(digest, frames, fps=DEFAULT_FPS, frame_start=1, seed=0):
+        return content_digest({
+            "kinematics": digest,
+            "frames": int(frames),
+            "fps": float(fps),
+            "frame_start": int(frame_start),
+            "seed": int(seed),
+            "evaluator_version": EVALUATOR_VERSION,
+        })
+
+    def get(self, key):
+        """Returns memory-mapped AnimationCurves for key, or None on a miss."""
+        entry = self.load(key, ("values",))
+        if entry is None:
+            return None
+        arrays, meta = entry
+        return AnimationCurves(meta["channels"], arrays["values"], meta["fps"], meta["frame_start"])
+
+    def put(self, key, curves):
+        """Stores curves under key atomically and enforces the size cap."""
+        self.store(key, {"values": curves.values},
+                   {"channels": list(curves.channels), "fps": curves.fps, "frame_start": curves.frame_start})
+
+    def bake(self, frames, fps=DEFAULT_FPS, frame_start=1, seed=0, kinematics_path=DEFAULT_KINEMATICS_PATH):
+        """
+        Returns the cached curves for kinematics_path, evaluating them on a
+        miss. Editing the JSON's content changes the key and forces a rebake.
+        """
+        document = load_kinematics(kinematics_path)
+        key = self.key(kinematics_digest(document), frames, fps, frame_start, seed)
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+        curves = evaluate_kinematics(document, frames, fps, frame_start, seed)
+        self.put(key, curves)
+        return curves
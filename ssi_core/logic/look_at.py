@@ -0,0 +1,93 @@
+import numpy as np
+
+# Blender's TRACK_TO axis names -> (local axis index, sign).
+TRACK_AXES = {
+    'TRACK_X': (0, 1.0), 'TRACK_Y': (1, 1.0), 'TRACK_Z': (2, 1.0),
+    'TRACK_NEGATIVE_X': (0, -1.0), 'TRACK_NEGATIVE_Y': (1, -1.0), 'TRACK_NEGATIVE_Z': (2, -1.0),
+}
+UP_AXES = {'UP_X': 0, 'UP_Y': 1, 'UP_Z': 2}
+
+WORLD_UP = np.array([0.0, 0.0, 1.0])
+# Used as the up reference on frames where the gaze is parallel to WORLD_UP.
+FALLBACK_UP = np.array([0.0, 1.0, 0.0])
+
+_EPSILON = 1e-9
+
+def _normalize(vectors):
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.where(norms > _EPSILON, norms, 1.0), norms[..., 0] > _EPSILON
+
+def look_at_matrices(eye, target, track_axis='TRACK_NEGATIVE_Z', up_axis='UP_Y'):
+    """
+    Solves the rotations a TRACK_TO constraint would produce for every frame
+    at once. eye and target are (N, 3) trajectories (or single points that
+    broadcast). Returns (N, 3, 3) rotation matrices whose columns are the
+    owner's local axes in world space: the track axis points at the target
+    and the up axis leans as close to world Z as possible. Frames where eye
+    and target coincide reuse the nearest earlier frame's direction.
+    """
+    track_index, track_sign = TRACK_AXES[track_axis]
+    up_index = UP_AXES[up_axis]
+    if up_index == track_index:
+        raise ValueError("up_axis must differ from the track axis.")
+    eye = np.asarray(eye, dtype=np.float64)
+    target = np.asarray(target, dtype=np.float64)
+    eye, target = np.broadcast_arrays(np.atleast_2d(eye), np.atleast_2d(target))
+
+    forward, has_direction = _normalize(target - eye)
+    if not has_direction.all():
+        valid = np.flatnonzero(has_direction)
+        if len(valid) == 0:
+            # No frame has a direction: keep the owner unrotated.
+            forward[:] = track_sign * np.eye(3)[track_index]
+        else:
+            # Degenerate frames reuse the last direction (leading ones the first).
+            index = np.where(has_direction, np.arange(len(forward)), valid[0])
+            forward = forward[np.maximum.accumulate(index)]
+
+    up = WORLD_UP - (forward @ WORLD_UP)[:, np.newaxis] * forward
+    up, has_up = _normalize(up)
+    if not has_up.all():
+        fallback = FALLBACK_UP - (forward[~has_up] @ FALLBACK_UP)[:, np.newaxis] * forward[~has_up]
+        up[~has_up] = _normalize(fallback)[0]
+
+    matrices = np.empty((len(forward), 3, 3))
+    matrices[:, :, track_index] = track_sign * forward
+    matrices[:, :, up_index] = up
+    third = 3 - track_index - up_index
+    if (up_index - track_index) % 3 == 1:
+        matrices[:, :, third] = np.cross(matrices[:, :, track_index], up)
+    else:
+        matrices[:, :, third] = np.cross(up, matrices[:, :, track_index])
+    return matrices
+
+def matrices_to_euler(matrices, unwrap=True):
+    """
+    Converts (N, 3, 3) rotation matrices to Blender 'XYZ' rotation_euler
+    angles. With unwrap, angles are kept continuous across frames so that
+    interpolated keyframes never spin the long way round.
+    """
+    m = np.asarray(matrices)
+    cy = np.hypot(m[:, 0, 0], m[:, 1, 0])
+    gimbal = cy < 1e-6
+    euler = np.empty((len(m), 3))
+    euler[:, 0] = np.where(gimbal, np.arctan2(-m[:, 1, 2], m[:, 1, 1]), np.arctan2(m[:, 2, 1], m[:, 2, 2]))
+    euler[:, 1] = np.arctan2(-m[:, 2, 0], cy)
+    euler[:, 2] = np.where(gimbal, 0.0, np.arctan2(m[:, 1, 0], m[:, 0, 0]))
+    if unwrap and len(euler) > 1:
+        euler = np.unwrap(euler, axis=0)
+    return euler
+
+def euler_to_matrices(euler):
+    """Converts (N, 3) Blender 'XYZ' euler angles back to rotation matrices (Rz @ Ry @ Rx)."""
+    euler = np.atleast_2d(np.asarray(euler, dtype=np.float64))
+    (sx, sy, sz), (cx, cy, cz) = np.sin(euler).T, np.cos(euler).T
+    return np.stack([
+        np.stack([cy * cz, sx * sy * cz - cx * sz, cx * sy * cz + sx * sz], axis=-1),
+        np.stack([cy * sz, sx * sy * sz + cx * cz, cx * sy * sz - sx * cz], axis=-1),
+        np.stack([-sy, sx * cy, cx * cy], axis=-1),
+    ], axis=1)
+
+def solve_look_at(eye, target, track_axis='TRACK_NEGATIVE_Z', up_axis='UP_Y'):
+    """Returns continuous (N, 3) 'XYZ' euler rotations aiming eye at target on every frame."""
+    return matrices_to_euler(look_at_matrices(eye, target, track_axis, up_axis))
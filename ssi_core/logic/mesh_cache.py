@@ -0,0 +1,77 @@
+import os
+
+from ssi_core.logic.array_cache import DEFAULT_MAX_BYTES, ArrayCache, content_digest
+from ssi_core.logic.geometry import (
+    DEFAULT_Q_STATE_PATH,
+    GENERATOR_VERSION,
+    apply_l_alpha_7_displacement,
+    icosphere,
+    load_q_state,
+)
+
+DEFAULT_MESH_CACHE_DIR = os.path.join("quantum_cache", "mesh_cache")
+
+def q_state_digest(q_state_path=DEFAULT_Q_STATE_PATH):
+    """Returns a content hash of q_state.json, so any change invalidates dependent meshes."""
+    return content_digest(load_q_state(q_state_path))
+
+class MeshCache(ArrayCache):
+    """
+    An on-disk cache of generated vertex and face arrays. Each entry holds
+    vertices.npy and faces.npy, keyed by (subdivisions, radius, L_alpha_7,
+    generator version, q_state digest) and loaded back memory-mapped.
+    Entries past max_bytes are evicted least recently used first.
+    """
+    def __init__(self, cache_dir=DEFAULT_MESH_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        super().__init__(cache_dir, max_bytes)
+
+    @staticmethod
+    def key(subdivisions, radius, l_alpha_7, q_state_digest=None):
+        return content_digest({
+            "subdivisions": int(subdivisions),
+            "radius": float(radius),
+            "l_alpha_7": float(l_alpha_7),
+            "generator_version": GENERATOR_VERSION,
+            "q_state": q_state_digest,
+        })
+
+    def get(self, key):
+        """Returns memory-mapped (vertices, faces) for key, or None on a miss."""
+        entry = self.load(key, ("vertices", "faces"))
+        if entry is None:
+            return None
+        arrays, _ = entry
+        return arrays["vertices"], arrays["faces"]
+
+    def put(self, key, vertices, faces):
+        """Stores arrays under key atomically and enforces the size cap."""
+        self.store(key, {"vertices": vertices, "faces": faces})
+
+    def icosphere(self, subdivisions, radius=1.0, l_alpha_7=1.0, q_state_digest=None):
+        """Returns a cached (optionally displaced) icosphere, generating it on a miss."""
+        key = self.key(subdivisions, radius, l_alpha_7, q_state_digest)
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+        vertices, faces = icosphere(subdivisions, radius)
+        if l_alpha_7 != 1.0:
+            apply_l_alpha_7_displacement(vertices, l_alpha_7, out=vertices)
+        self.put(key, vertices, faces)
+        return vertices, faces
+
+    def manifestation_mesh(self, subdivisions=5, radius=1.0, q_state_path=DEFAULT_Q_STATE_PATH):
+        """
+        Returns the cached GME-V1 manifestation geometry. The entry is keyed
+        on the content of q_state.json, so editing it forces a rebuild.
+        """
+        l_alpha_7 = load_q_state(q_state_path)['L_alpha_7']
+        return self.icosphere(subdivisions, radius, l_alpha_7, q_state_digest(q_state_path))
+
+_default_cache = None
+
+def default_mesh_cache():
+    """Returns the process-wide MeshCache under quantum_cache/mesh_cache."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = MeshCache()
+    return _default_cache
@@ -1,19 +1,66 @@
 import bpy
+import numpy as np
+
+from ssi_core.logic.look_at import solve_look_at
 
 class ObserverNode:
     """
     This module establishes a sentient-tracking node and locks the
     observer's gaze onto it, ensuring a persistent 'Observer Phase-Lock'.
     """
-    def __init__(self):
-        pass
+    def __init__(self, track_axis='TRACK_NEGATIVE_Z', up_axis='UP_Y'):
+        self.track_axis = track_axis
+        self.up_axis = up_axis
 
     def gaze_sync(self, camera, target):
         """
         Applies a 'Track To' constraint to the camera, locking its
-        orientation onto the specified target object.
+        orientation onto the specified target object. An existing Track To
+        constraint is reused, so repeated calls do not stack constraints.
         """
-        constraint = camera.constraints.new(type='TRACK_TO')
+        constraint = next((c for c in camera.constraints if c.type == 'TRACK_TO'), None)
+        if constraint is None:
+            constraint = camera.constraints.new(type='TRACK_TO')
         constraint.target = target
-        constraint.track_axis = 'TRACK_NEGATIVE_Z'
-        constraint.up_axis = 'UP_Y'
+        constraint.track_axis = self.track_axis
+        constraint.up_axis = self.up_axis
+        return constraint
+
+    def bake_gaze(self, camera, camera_path, target_path, frame_start=1):
+        """
+        Bakes the gaze into keyframes instead of a live constraint: the
+        look-at rotation for every frame is solved in one vectorized pass
+        (see ssi_core.logic.look_at), and the location and rotation curves
+        are written with bulk foreach_set calls. camera_path and target_path
+        are (N, 3) arrays, one row per frame from frame_start; either may be
+        a single point. Any Track To constraint on the camera is removed,
+        and rebaking overwrites the camera's <name>_BakedGaze action in
+        place. Returns the baked euler rotations.
+        """
+        for constraint in [c for c in camera.constraints if c.type == 'TRACK_TO']:
+            camera.constraints.remove(constraint)
+
+        camera_path = np.asarray(camera_path, dtype=np.float64)
+        rotations = solve_look_at(camera_path, target_path, self.track_axis, self.up_axis)
+        locations = np.broadcast_to(np.atleast_2d(camera_path), rotations.shape)
+        frames = np.arange(frame_start, frame_start + len(rotations), dtype=np.float64)
+
+        camera.rotation_mode = 'XYZ'
+        animation_data = camera.animation_data or camera.animation_data_create()
+        name = f"{camera.name}_BakedGaze"
+        action = animation_data.action
+        if action is None or not action.name.startswith(name):
+            action = bpy.data.actions.get(name) or bpy.data.actions.new(name=name)
+        # Reuse the previous bake's action rather than orphaning it.
+        action.fcurves.clear()
+        animation_data.action = action
+        for data_path, values in (("location", locations), ("rotation_euler", rotations)):
+            for index in range(3):
+                fcurve = action.fcurves.new(data_path, index=index)
+                fcurve.keyframe_points.add(len(frames))
+                co = np.empty((len(frames), 2), dtype=np.float32)
+                co[:, 0] = frames
+                co[:, 1] = values[:, index]
+                fcurve.keyframe_points.foreach_set("co", co.ravel())
+                fcurve.update()
+        return rotations
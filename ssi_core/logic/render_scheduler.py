@@ -0,0 +1,225 @@
+import concurrent.futures
+import copy
+import datetime
+import hashlib
+import itertools
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+
+from ssi_core.logic.scene_graph import SceneNode, build_scene_description
+
+DEFAULT_RENDER_DIR = os.path.join("quantum_cache", "renders")
+RENDER_WORKER_SCRIPT = os.path.join(os.path.dirname(__file__), "..", "..", "render_worker.py")
+
+# "{unit}" in any argument is replaced with the path of the unit's JSON spec.
+DEFAULT_WORKER_COMMAND = ["blender", "--background", "--python", RENDER_WORKER_SCRIPT, "--", "{unit}"]
+STUB_WORKER_COMMAND = [sys.executable, os.path.join(os.path.dirname(__file__), "render_stub_worker.py"), "{unit}"]
+
+# Sweep parameters that are render settings rather than avatar_config.json atmosphere values.
+RENDER_PARAMETERS = ("samples", "engine", "file_format", "use_denoising")
+
+class RenderUnit:
+    """One schedulable piece of a render job: a frame range under a set of parameter overrides."""
+    def __init__(self, unit_id, frame_start=0, frame_end=0, params=None):
+        self.unit_id = unit_id
+        self.frame_start = frame_start
+        self.frame_end = frame_end
+        self.params = dict(params or {})
+
+    def __repr__(self):
+        return f"RenderUnit({self.unit_id!r}, {self.frame_start}-{self.frame_end}, {self.params})"
+
+    def to_dict(self):
+        return {"unit_id": self.unit_id, "frame_start": self.frame_start,
+                "frame_end": self.frame_end, "params": self.params}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["unit_id"], data["frame_start"], data["frame_end"], data["params"])
+
+def unit_id_for(frame_start, frame_end, params):
+    """
+    Returns the id of a unit, derived from its frame range and parameters so
+    that a resumed job only ever skips units whose work is exactly the same.
+    """
+    canonical = json.dumps({"frame_start": frame_start, "frame_end": frame_end, "params": params},
+                           sort_keys=True, separators=(",", ":"))
+    return f"unit_{frame_start:04d}_{hashlib.sha256(canonical.encode('utf-8')).hexdigest()[:12]}"
+
+def plan_units(frame_start=0, frame_end=0, frames_per_unit=1, sweep=None):
+    """
+    Splits a render job into units: the frame range is cut into chunks of
+    frames_per_unit frames, and every chunk is rendered once per combination
+    of the sweep values (a dict mapping parameter name to a list of values,
+    e.g. {"humidity_coefficient": [0.1, 0.2], "samples": [64, 128]}).
+    Unit ids are content hashes (see unit_id_for), not positions.
+    """
+    if frame_end < frame_start:
+        raise ValueError("frame_end must not be before frame_start.")
+    if frames_per_unit < 1:
+        raise ValueError("frames_per_unit must be a positive integer.")
+    sweep = sweep or {}
+    names = list(sweep)
+    ranges = [(start, min(start + frames_per_unit - 1, frame_end))
+              for start in range(frame_start, frame_end + 1, frames_per_unit)]
+    units = []
+    for values in itertools.product(*(sweep[name] for name in names)):
+        for start, end in ranges:
+            params = dict(zip(names, values))
+            units.append(RenderUnit(unit_id_for(start, end, params), start, end, params))
+    return units
+
+def build_unit_description(config, q_state, unit, output_dir):
+    """
+    Builds the scene description a worker renders for one unit: atmosphere
+    parameters override avatar_config.json, render parameters override the
+    Render node, and frames are written into output_dir.
+    """
+    config = copy.deepcopy(config)
+    render_overrides = {}
+    for name, value in unit.params.items():
+        if name in RENDER_PARAMETERS:
+            render_overrides[name] = value
+        elif name in config['environmental_atmosphere']:
+            config['environmental_atmosphere'][name] = value
+        else:
+            raise ValueError(f"Unknown render parameter {name!r}.")
+    description = build_scene_description(config, q_state)
+    render = description["Render"]
+    props = dict(render.props, **render_overrides)
+    props.update(frame_start=unit.frame_start, frame_end=unit.frame_end,
+                 filepath=os.path.join(output_dir, "frame_"))
+    description["Render"] = SceneNode(render.kind, render.name, props, render.depends)
+    return description
+
+class RenderResult:
+    """The outcome of one unit: status ("ok" or "failed"), attempts, timing and output files."""
+    def __init__(self, unit, status, attempts, seconds, outputs=(), error=None):
+        self.unit = unit
+        self.status = status
+        self.attempts = attempts
+        self.seconds = seconds
+        self.outputs = list(outputs)
+        self.error = error
+
+    def to_dict(self):
+        return dict(self.unit.to_dict(), status=self.status, attempts=self.attempts,
+                    seconds=round(self.seconds, 6), outputs=self.outputs, error=self.error)
+
+class RenderScheduler:
+    """
+    Runs render units on a pool of headless worker processes. Each attempt
+    launches command (Blender by default) with "{unit}" replaced by the path
+    of a JSON spec holding the unit, its attempt number and its output
+    directory; a zero exit status means success. Failed units are retried up
+    to max_attempts times. Every finished unit is appended to
+    results.jsonl in the job directory under quantum_cache/renders, so a
+    rerun of the same job skips the units that already succeeded.
+
+    Blender renders are multi-threaded and memory-heavy, so with the default
+    Blender command workers defaults to 1; other (pure-Python) commands
+    default to one worker per core.
+    """
+    def __init__(self, command=None, workers=None, max_attempts=3, timeout=None,
+                 retry_delay=1.0, output_root=DEFAULT_RENDER_DIR):
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1.")
+        self.command = list(command or DEFAULT_WORKER_COMMAND)
+        if workers is None:
+            workers = 1 if self.command == DEFAULT_WORKER_COMMAND else os.cpu_count() or 1
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.timeout = timeout
+        self.retry_delay = retry_delay
+        self.output_root = output_root
+
+    def job_dir(self, job_id):
+        return os.path.join(self.output_root, job_id)
+
+    def completed_units(self, job_id):
+        """Returns the units recorded as succeeded for a job, keyed by unit id."""
+        path = os.path.join(self.job_dir(job_id), "results.jsonl")
+        completed = {}
+        if os.path.exists(path):
+            with open(path, "r") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue  # A torn last line from an interrupted run.
+                    if record.get("status") == "ok":
+                        completed[record["unit_id"]] = RenderUnit.from_dict(record)
+                    else:
+                        completed.pop(record["unit_id"], None)
+        return completed
+
+    def run(self, units, job_id=None):
+        """
+        Runs every unit not already completed for job_id and returns a
+        summary dict; the same summary is written to summary.json. A unit
+        is only skipped if the recorded one has the same frame range and
+        parameters, so a reused id never reuses stale outputs.
+        """
+        job_id = job_id or datetime.datetime.now().strftime("render_%Y%m%d%H%M%S")
+        job_dir = self.job_dir(job_id)
+        os.makedirs(job_dir, exist_ok=True)
+        completed = self.completed_units(job_id)
+        pending = [unit for unit in units
+                   if unit.unit_id not in completed or completed[unit.unit_id].to_dict() != unit.to_dict()]
+
+        started = time.perf_counter()
+        results = []
+        with open(os.path.join(job_dir, "results.jsonl"), "a") as log:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=self.workers) as pool:
+                futures = [pool.submit(self._run_unit, job_dir, unit) for unit in pending]
+                for future in concurrent.futures.as_completed(futures):
+                    result = future.result()
+                    results.append(result)
+                    log.write(json.dumps(result.to_dict()) + "\n")
+                    log.flush()
+        elapsed = time.perf_counter() - started
+
+        summary = {
+            "job_id": job_id,
+            "units": len(units),
+            "skipped": len(units) - len(pending),
+            "succeeded": sum(1 for result in results if result.status == "ok"),
+            "failed": sum(1 for result in results if result.status != "ok"),
+            "retries": sum(result.attempts - 1 for result in results),
+            "seconds": round(elapsed, 6),
+            "units_per_second": round(len(results) / elapsed, 3) if elapsed > 0 else None,
+        }
+        with open(os.path.join(job_dir, "summary.json"), "w") as f:
+            json.dump(summary, f, indent=2)
+        return summary
+
+    def _run_unit(self, job_dir, unit):
+        unit_dir = os.path.join(job_dir, unit.unit_id)
+        spec_path = os.path.join(unit_dir, "unit.json")
+        started = time.perf_counter()
+        error = None
+        for attempt in range(1, self.max_attempts + 1):
+            # Start every attempt from an empty directory so only its own files are reported.
+            shutil.rmtree(unit_dir, ignore_errors=True)
+            os.makedirs(unit_dir)
+            with open(spec_path, "w") as f:
+                json.dump(dict(unit.to_dict(), attempt=attempt, output_dir=os.path.abspath(unit_dir)), f)
+            command = [arg.replace("{unit}", spec_path) for arg in self.command]
+            try:
+                completed = subprocess.run(command, capture_output=True, text=True, timeout=self.timeout)
+            except subprocess.TimeoutExpired:
+                error = f"attempt {attempt} timed out after {self.timeout} s"
+            except OSError as e:
+                error = f"attempt {attempt} could not start the worker: {e}"
+            else:
+                if completed.returncode == 0:
+                    outputs = sorted(name for name in os.listdir(unit_dir) if name != "unit.json")
+                    return RenderResult(unit, "ok", attempt, time.perf_counter() - started, outputs)
+                error = f"attempt {attempt} exited with {completed.returncode}: {completed.stderr[-2000:]}"
+            if attempt < self.max_attempts:
+                time.sleep(self.retry_delay * attempt)
+        return RenderResult(unit, "failed", self.max_attempts, time.perf_counter() - started, error=error)
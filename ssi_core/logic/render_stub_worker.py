@@ -0,0 +1,30 @@
+import json
+import os
+import sys
+import time
+
+def main(argv):
+    """
+    A stand-in for the Blender render worker, for exercising the render
+    scheduler without Blender. It reads a unit spec and writes one
+    placeholder file per frame. The unit params "stub_seconds" (time spent
+    per frame) and "stub_fail_attempts" (attempts that exit non-zero before
+    one succeeds) simulate render cost and flaky workers; a failing attempt
+    leaves a partial file behind, as a crashed render would.
+    """
+    with open(argv[0], "r") as f:
+        spec = json.load(f)
+    params = spec["params"]
+    if spec["attempt"] <= params.get("stub_fail_attempts", 0):
+        with open(os.path.join(spec["output_dir"], f"partial_attempt_{spec['attempt']}.png"), "w") as f:
+            f.write("")
+        print(f"Stub worker failing attempt {spec['attempt']}.", file=sys.stderr)
+        return 1
+    for frame in range(spec["frame_start"], spec["frame_end"] + 1):
+        time.sleep(params.get("stub_seconds", 0.0))
+        with open(os.path.join(spec["output_dir"], f"frame_{frame:04d}.png"), "w") as f:
+            json.dump({"frame": frame, "params": params}, f)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
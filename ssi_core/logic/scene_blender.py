@@ -0,0 +1,189 @@
+import bpy
+
+from ssi_core.logic import gme_core
+from ssi_core.logic.look_at import solve_look_at
+from ssi_core.logic.mesh_cache import default_mesh_cache
+from ssi_core.logic.scene_graph import SceneReconciler, dump_description, load_description
+from ssi_core.simulation.atmospheric_simulation import (
+    _add_atmospheric_particles,
+    _create_atmospheric_domain,
+    _create_halo_material,
+    _instance_particle_field,
+)
+from ssi_core.simulation.particle_field import cached_particle_field
+
+# Scene custom property holding the last applied description, so a later run
+# against the same .blend only realizes what changed.
+SCENE_DESCRIPTION_PROPERTY = "ssi_scene_description"
+
+def _remove_orphans(blocks):
+    """Removes the given datablocks that no longer have any users."""
+    orphans = [block for block in blocks if block is not None and block.users == 0]
+    if orphans:
+        bpy.data.batch_remove(orphans)
+
+class BlenderSceneBackend:
+    """
+    Realizes SceneNodes in Blender. Lights, the camera, particle system
+    counts and render settings are updated in place; other changes rebuild the node,
+    and update() then returns True so the reconciler rebuilds its
+    dependents. Removing a node also removes the meshes, materials and
+    particle settings it leaves without users.
+    """
+    def create(self, node):
+        getattr(self, f"_create_{node.kind}")(node)
+
+    def update(self, node, previous):
+        updater = getattr(self, f"_update_{node.kind}", None)
+        if updater is not None and previous.depends == node.depends:
+            return bool(updater(node))
+        self.remove(previous)
+        self.create(node)
+        return True
+
+    def remove(self, node):
+        if node.kind == "material":
+            material = bpy.data.materials.get(node.name)
+            if material is not None:
+                bpy.data.materials.remove(material)
+        elif node.kind == "particles":
+            # Either mode may be live: a particle system on the domain or a particle field cloud.
+            domain = bpy.data.objects.get(node.props["domain"])
+            if domain is not None:
+                for modifier in [m for m in domain.modifiers if m.type == 'PARTICLE_SYSTEM']:
+                    settings = modifier.particle_system.settings
+                    domain.modifiers.remove(modifier)
+                    _remove_orphans([settings])
+            self._remove_object(node.name)
+        elif node.kind != "render":
+            self._remove_object(node.name, owns_materials=node.kind == "atmosphere")
+
+    def _remove_object(self, name, owns_materials=False):
+        obj = bpy.data.objects.get(name)
+        if obj is None:
+            return
+        data = obj.data
+        # The atmosphere's material and a particle cloud's node group are created
+        # with their object; other materials are scene nodes of their own.
+        owned = [m.node_group for m in obj.modifiers if m.type == 'NODES']
+        if owns_materials:
+            owned += list(data.materials)
+        bpy.data.objects.remove(obj, do_unlink=True)
+        _remove_orphans([data])
+        _remove_orphans(owned)
+
+    def _create_material(self, node):
+        props = node.props
+        if node.name == "HaloParticleMaterial":
+            _create_halo_material(props["emission_strength"], props["mix_factor"])
+            return
+        material = gme_core.create_obsidian_gallery_material()
+        material.name = node.name
+        bsdf = material.node_tree.nodes.get('Principled BSDF')
+        bsdf.inputs['Base Color'].default_value = props["base_color"]
+        bsdf.inputs['Roughness'].default_value = props["roughness"]
+        bsdf.inputs['Transmission Weight'].default_value = props["transmission"]
+        bsdf.inputs['IOR'].default_value = props["ior"]
+
+    def _create_object(self, node):
+        props = node.props
+        mesh = props["mesh"]
+        if mesh["generator"] == "icosphere":
+            vertices, faces = default_mesh_cache().icosphere(
+                mesh["subdivisions"], mesh["radius"], mesh["l_alpha_7"])
+            obj = gme_core.mesh_from_arrays(node.name, vertices, faces)
+        else:
+            bpy.ops.mesh.primitive_plane_add(size=mesh["size"])
+            obj = bpy.context.object
+            obj.name = node.name
+        if "location" in props:
+            obj.location = props["location"]
+        if "material" in props:
+            obj.data.materials.append(bpy.data.materials[props["material"]])
+        for key, value in props.get("tags", {}).items():
+            obj[key] = value
+
+    def _create_atmosphere(self, node):
+        props = node.props
+        _create_atmospheric_domain(props["scattering_model"], props["size"], props["location"], props["density"])
+
+    def _create_particles(self, node):
+        props = node.props
+        halo = bpy.data.objects[props["instance_object"]]
+        if "field" in props:
+            _instance_particle_field(cached_particle_field(props["count"], **props["field"]), halo, node.name)
+        else:
+            _add_atmospheric_particles(bpy.data.objects[props["domain"]], halo, props["count"])
+
+    def _update_particles(self, node):
+        domain = bpy.data.objects[node.props["domain"]]
+        if "field" in node.props or not domain.particle_systems:
+            # A particle field is regenerated rather than patched.
+            self.remove(node)
+            self._create_particles(node)
+            return True
+        domain.particle_systems[0].settings.count = node.props["count"]
+
+    def _create_light(self, node):
+        props = node.props
+        bpy.ops.object.light_add(type=props["type"], radius=props["radius"], location=props["location"])
+        light = bpy.context.object
+        light.name = node.name
+        light.data.energy = props["energy"]
+
+    def _update_light(self, node):
+        light = bpy.data.objects[node.name]
+        if light.data.type != node.props["type"]:
+            self.remove(node)
+            self._create_light(node)
+            return True
+        light.location = node.props["location"]
+        light.data.energy = node.props["energy"]
+        light.data.shadow_soft_size = node.props["radius"]
+
+    def _create_camera(self, node):
+        bpy.ops.object.camera_add(location=node.props["location"])
+        camera = bpy.context.object
+        camera.name = node.name
+        bpy.context.scene.camera = camera
+        self._update_camera(node)
+
+    def _update_camera(self, node):
+        # Ensure the camera is pointing at its target. The rotation is solved
+        # once here rather than by a Track To constraint re-solved every frame.
+        camera = bpy.data.objects[node.name]
+        camera.location = node.props["location"]
+        target = bpy.data.objects[node.props["track_to"]]
+        camera.rotation_mode = 'XYZ'
+        camera.rotation_euler = solve_look_at(node.props["location"], tuple(target.location))[0]
+
+    def _create_render(self, node):
+        props = node.props
+        scene = bpy.context.scene
+        scene.render.engine = props["engine"]
+        scene.render.image_settings.file_format = props["file_format"]
+        scene.render.filepath = props["filepath"]
+        scene.frame_start = props["frame_start"]
+        scene.frame_end = props["frame_end"]
+        scene.cycles.samples = props["samples"]
+        bpy.context.view_layer.cycles.use_denoising = props["use_denoising"]
+
+    _update_render = _create_render
+
+def realize_scene(description):
+    """
+    Brings the current Blender scene in line with description. The first
+    time, the scene is cleared for a clean slate; afterwards only the nodes
+    that changed since the stored description are realized. Returns the
+    SceneDiff that was applied.
+    """
+    scene = bpy.context.scene
+    payload = scene.get(SCENE_DESCRIPTION_PROPERTY)
+    previous = load_description(payload) if payload else None
+    if previous is None:
+        bpy.ops.object.select_all(action='SELECT')
+        bpy.ops.object.delete()
+    reconciler = SceneReconciler(BlenderSceneBackend(), previous)
+    diff = reconciler.apply(description)
+    scene[SCENE_DESCRIPTION_PROPERTY] = dump_description(description)
+    return diff
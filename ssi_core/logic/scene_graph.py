@@ -0,0 +1,190 @@
+import json
+import time
+
+from ssi_core.profiling import span
+
+class SceneNode:
+    """
+    One declarative element of the visualization scene: an object, material,
+    light, camera, atmosphere, particle system or render settings. props are
+    normalized to plain JSON values so a description survives being stored
+    and reloaded, and two nodes are equal when kind, props and dependencies
+    match.
+    """
+    def __init__(self, kind, name, props=None, depends=()):
+        self.kind = kind
+        self.name = name
+        self.props = json.loads(json.dumps(props or {}))
+        self.depends = tuple(depends)
+
+    def __eq__(self, other):
+        return (isinstance(other, SceneNode) and self.kind == other.kind and self.name == other.name
+                and self.props == other.props and self.depends == other.depends)
+
+    def __repr__(self):
+        return f"SceneNode({self.kind!r}, {self.name!r})"
+
+    def to_dict(self):
+        return {"kind": self.kind, "name": self.name, "props": self.props, "depends": list(self.depends)}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["kind"], data["name"], data["props"], data["depends"])
+
+def build_scene_description(config, q_state):
+    """
+    Builds the pure-Python description of the GME-V1 visualization scene
+    from avatar_config.json and q_state.json. The result maps node names to
+    SceneNodes in dependency order. The atmospheric particles are instanced
+    from a precomputed particle field (ssi_core.simulation.particle_field)
+    filling the domain, thinned with distance from the camera.
+    """
+    atmosphere = config['environmental_atmosphere']
+    domain = {"size": 20, "location": [0, 0, 10]}
+    camera_location = [0, -5, 1.5]
+    nodes = [
+        SceneNode("material", "Obsidian_Gallery", {
+            "base_color": [0, 0, 0, 1], "roughness": 0.1, "transmission": 1.0, "ior": 1.5,
+        }),
+        SceneNode("object", "GME_V1_Manifestation", {
+            "mesh": {"generator": "icosphere", "subdivisions": 5, "radius": 1,
+                     "l_alpha_7": q_state['L_alpha_7']},
+            "material": "Obsidian_Gallery",
+            "tags": {"gme_v1_manifestation": True},
+        }, depends=["Obsidian_Gallery"]),
+        SceneNode("atmosphere", "AtmosphericDomain", dict(
+            domain, density=0.02, scattering_model=atmosphere['scattering_model'])),
+        SceneNode("material", "HaloParticleMaterial", {"emission_strength": 10.0, "mix_factor": 0.8}),
+        SceneNode("object", "HaloParticleObject", {
+            "mesh": {"generator": "icosphere", "subdivisions": 2, "radius": 0.01, "l_alpha_7": 1.0},
+            "material": "HaloParticleMaterial",
+        }, depends=["HaloParticleMaterial"]),
+        SceneNode("particles", "AtmosphericParticles", {
+            "count": int(10000 * atmosphere['humidity_coefficient']),
+            "domain": "AtmosphericDomain", "instance_object": "HaloParticleObject",
+            "field": dict(domain, camera_location=camera_location, seed=0),
+        }, depends=["AtmosphericDomain", "HaloParticleObject"]),
+        SceneNode("object", "Refraction_Plane", {
+            "mesh": {"generator": "plane", "size": 20}, "location": [0, 0, -2],
+        }),
+        SceneNode("light", "Test_Light_Source", {
+            "type": "POINT", "radius": 1, "location": [5, -5, 5], "energy": 5000,
+        }),
+        SceneNode("camera", "Camera", {
+            "location": camera_location, "track_to": "GME_V1_Manifestation",
+        }, depends=["GME_V1_Manifestation"]),
+        SceneNode("render", "Render", {
+            "engine": "CYCLES", "file_format": "PNG", "filepath": "gme_v1_vertex_test.png",
+            "frame_start": 0, "frame_end": 0, "samples": 128, "use_denoising": False,
+        }, depends=["Camera"]),
+    ]
+    return {node.name: node for node in nodes}
+
+def dependency_order(description):
+    """Returns node names so every node comes after the nodes it depends on."""
+    ordered = []
+    visiting = set()
+    done = set()
+
+    def visit(name):
+        if name in done or name not in description:
+            return
+        if name in visiting:
+            raise ValueError(f"Dependency cycle at scene node {name!r}.")
+        visiting.add(name)
+        for dependency in description[name].depends:
+            visit(dependency)
+        visiting.discard(name)
+        done.add(name)
+        ordered.append(name)
+
+    for name in description:
+        visit(name)
+    return ordered
+
+class SceneDiff:
+    """The nodes to remove, create and update to move from one description to another."""
+    def __init__(self, removed, created, updated):
+        self.removed = removed
+        self.created = created
+        self.updated = updated
+
+    def is_empty(self):
+        return not (self.removed or self.created or self.updated)
+
+    def __len__(self):
+        return len(self.removed) + len(self.created) + len(self.updated)
+
+def diff_scenes(previous, current):
+    """
+    Diffs two scene descriptions. A node whose dependency is created,
+    updated or removed is updated too, so its links are refreshed. Removals
+    are ordered dependents-first; creations and updates dependencies-first.
+    """
+    previous = previous or {}
+    changed = {name for name in current if name not in previous or previous[name] != current[name]}
+    gone = {name for name in previous if name not in current}
+    order = dependency_order(current)
+    for name in order:
+        if name not in changed and any(dep in changed or dep in gone for dep in current[name].depends):
+            changed.add(name)
+
+    removed = [name for name in reversed(dependency_order(previous)) if name in gone]
+    created = [name for name in order if name in changed and name not in previous]
+    updated = [name for name in order if name in changed and name in previous]
+    return SceneDiff(removed, created, updated)
+
+class SceneReconciler:
+    """
+    Realizes scene descriptions through a backend incrementally: only the
+    nodes that differ from the previously applied description are touched.
+    A backend implements create(node), update(node, previous_node) and
+    remove(node); the Blender backend lives in ssi_core.logic.scene_blender
+    and tests use an in-memory fake. update returns True when it had to
+    recreate the node rather than patch it in place; the nodes depending on
+    a recreated node are then removed and created again too, since they may
+    hold references to the old object.
+    """
+    def __init__(self, backend, previous=None):
+        self.backend = backend
+        self.applied = dict(previous or {})
+        self.timings = {}
+
+    def apply(self, description):
+        """Applies a description and returns the SceneDiff that was realized."""
+        diff = diff_scenes(self.applied, description)
+        self.timings = {}
+        for name in diff.removed:
+            self._timed(name, self.backend.remove, self.applied[name])
+        recreated = set(diff.created)
+        for name in dependency_order(description):
+            node = description[name]
+            if name in diff.created:
+                self._timed(name, self.backend.create, node)
+            elif name in diff.updated:
+                if any(dependency in recreated for dependency in node.depends):
+                    self._timed(name, self._recreate, node, self.applied[name])
+                    recreated.add(name)
+                elif self._timed(name, self.backend.update, node, self.applied[name]):
+                    recreated.add(name)
+        self.applied = dict(description)
+        return diff
+
+    def _recreate(self, node, previous):
+        self.backend.remove(previous)
+        self.backend.create(node)
+
+    def _timed(self, name, operation, *args):
+        with span("scene_node", node=name, operation=operation.__name__.lstrip("_")):
+            started = time.perf_counter()
+            result = operation(*args)
+            self.timings[name] = time.perf_counter() - started
+        return result
+
+def dump_description(description):
+    """Serializes a description to JSON (e.g. to store it alongside the scene)."""
+    return json.dumps([node.to_dict() for node in description.values()])
+
+def load_description(payload):
+    """Restores a description serialized by dump_description."""
+    return {node.name: node for node in (SceneNode.from_dict(data) for data in json.loads(payload))}
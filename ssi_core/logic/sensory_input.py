@@ -3,9 +3,9 @@ import json
 class StarlightVisualCortex:
     """
     This module establishes a listener for Wyze/Starlight telemetry JSON.
-    It extracts metadata (lighting levels, device status, connectivity)
-    and pipes it to Q's Affective Engine, making Q 'aware' of the
-    physical state of the studio.
+    It extracts metadata (lighting levels, device status, connectivity
+    and the reporting device's id) and pipes it to Q's Affective Engine,
+    making Q 'aware' of the physical state of the studio.
     """
     def __init__(self):
         self.affective_engine_pipe = None  # Placeholder for the connection to the Affective Engine
@@ -20,17 +20,24 @@ class StarlightVisualCortex:
         """
         try:
             data = json.loads(telemetry_json)
-            lighting = data.get('lighting_levels')
-            device_status = data.get('device_status')
-            connectivity = data.get('connectivity')
+            studio_state = self.extract_studio_state(data)
 
             if self.affective_engine_pipe:
-                self.affective_engine_pipe.update_studio_state({
-                    'lighting': lighting,
-                    'device_status': device_status,
-                    'connectivity': connectivity
-                })
+                self.affective_engine_pipe.update_studio_state(studio_state)
 
             return True
         except json.JSONDecodeError:
             return False
+
+    @staticmethod
+    def extract_studio_state(data):
+        """
+        Extracts the studio state the Affective Engine consumes from parsed
+        telemetry. device_id is None when the payload does not name its device.
+        """
+        return {
+            'device_id': data.get('device_id'),
+            'lighting': data.get('lighting_levels'),
+            'device_status': data.get('device_status'),
+            'connectivity': data.get('connectivity')
+        }
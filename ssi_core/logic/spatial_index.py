@@ -0,0 +1,158 @@
+import math
+from ssi_core.kernel.chronos import L_ALPHA_7
+from ssi_core.logic.heuristic_interface import calculate_proximity_batch
+
+class DisplacementFieldIndex:
+    """
+    An in-memory uniform-grid index over 3-D 'DisplacementField' points.
+    Answers k-nearest and within-radius queries against a camera focal point
+    by visiting only the grid cells around it, and supports incremental
+    insert, move and remove so moving points never force a rebuild.
+    All reported distances are L_ALPHA_7-weighted, matching calculate_proximity.
+    """
+    def __init__(self, cell_size=1.0):
+        if cell_size <= 0:
+            raise ValueError("cell_size must be positive.")
+        self.cell_size = float(cell_size)
+        self._points = {}  # point_id -> (x, y, z)
+        self._cell_of = {}  # point_id -> cell key
+        self._cells = {}  # cell key -> set of point_ids
+
+    def __len__(self):
+        return len(self._points)
+
+    def __contains__(self, point_id):
+        return point_id in self._points
+
+    def _cell_key(self, vector):
+        size = self.cell_size
+        return (math.floor(vector[0] / size),
+                math.floor(vector[1] / size),
+                math.floor(vector[2] / size))
+
+    def insert(self, point_id, vector):
+        """
+        Inserts a point, or moves it if point_id is already indexed.
+        Only the affected grid cells are touched.
+        """
+        vector = (float(vector[0]), float(vector[1]), float(vector[2]))
+        key = self._cell_key(vector)
+        old_key = self._cell_of.get(point_id)
+        if old_key != key:
+            if old_key is not None:
+                self._discard_from_cell(point_id, old_key)
+            self._cells.setdefault(key, set()).add(point_id)
+            self._cell_of[point_id] = key
+        self._points[point_id] = vector
+
+    def insert_many(self, point_ids, vectors):
+        """Inserts or moves a batch of points."""
+        for point_id, vector in zip(point_ids, vectors):
+            self.insert(point_id, vector)
+
+    def remove(self, point_id):
+        """Removes a point from the index. Raises KeyError if it is absent."""
+        key = self._cell_of.pop(point_id)
+        del self._points[point_id]
+        self._discard_from_cell(point_id, key)
+
+    def _discard_from_cell(self, point_id, key):
+        cell = self._cells[key]
+        cell.discard(point_id)
+        if not cell:
+            del self._cells[key]
+
+    def _score(self, point_ids, focal_point):
+        """Returns (point_id, weighted_distance) pairs for the given ids."""
+        if not point_ids:
+            return []
+        vectors = [self._points[point_id] for point_id in point_ids]
+        distances = calculate_proximity_batch(vectors, focal_point)
+        return list(zip(point_ids, distances.tolist()))
+
+    def _ring_offsets(self, ring):
+        """Yields cell offsets whose Chebyshev distance from the origin is exactly ring."""
+        if ring == 0:
+            yield (0, 0, 0)
+            return
+        span = range(-ring, ring + 1)
+        for dx in span:
+            for dy in span:
+                if abs(dx) == ring or abs(dy) == ring:
+                    for dz in span:
+                        yield (dx, dy, dz)
+                else:
+                    yield (dx, dy, -ring)
+                    yield (dx, dy, ring)
+
+    def _cells_within(self, center, reach):
+        """Returns the occupied cell keys within reach cells of center."""
+        cube_cells = (2 * reach + 1) ** 3
+        if cube_cells > len(self._cells):
+            # Sparse field: scanning the occupied cells is cheaper than the cube.
+            cx, cy, cz = center
+            return [key for key in self._cells
+                    if abs(key[0] - cx) <= reach
+                    and abs(key[1] - cy) <= reach
+                    and abs(key[2] - cz) <= reach]
+        keys = []
+        for ring in range(reach + 1):
+            for dx, dy, dz in self._ring_offsets(ring):
+                key = (center[0] + dx, center[1] + dy, center[2] + dz)
+                if key in self._cells:
+                    keys.append(key)
+        return keys
+
+    def query_radius(self, camera_focal_point, radius):
+        """
+        Returns (point_id, weighted_distance) pairs for every point whose
+        L_ALPHA_7-weighted distance to the focal point is <= radius,
+        sorted nearest first.
+        """
+        if radius < 0 or not self._points:
+            return []
+        reach = math.ceil((radius / L_ALPHA_7) / self.cell_size)
+        candidates = []
+        for key in self._cells_within(self._cell_key(camera_focal_point), reach):
+            candidates.extend(self._cells[key])
+        hits = [hit for hit in self._score(candidates, camera_focal_point) if hit[1] <= radius]
+        hits.sort(key=lambda hit: hit[1])
+        return hits
+
+    def query_nearest(self, camera_focal_point, k=1):
+        """
+        Returns the k points nearest to the focal point as
+        (point_id, weighted_distance) pairs, sorted nearest first.
+        """
+        if k <= 0 or not self._points:
+            return []
+        center = self._cell_key(camera_focal_point)
+        found = []
+        seen = 0
+        ring = 0
+        while seen < len(self._points):
+            ring_cells = 1 if ring == 0 else 24 * ring * ring + 2
+            if ring_cells > len(self._cells):
+                # The remaining rings are mostly empty; finish with one scan.
+                remaining = [key for key in self._cells
+                             if max(abs(key[0] - center[0]),
+                                    abs(key[1] - center[1]),
+                                    abs(key[2] - center[2])) >= ring]
+                candidates = [point_id for key in remaining for point_id in self._cells[key]]
+                found.extend(self._score(candidates, camera_focal_point))
+                break
+            candidates = []
+            for dx, dy, dz in self._ring_offsets(ring):
+                cell = self._cells.get((center[0] + dx, center[1] + dy, center[2] + dz))
+                if cell:
+                    candidates.extend(cell)
+            seen += len(candidates)
+            found.extend(self._score(candidates, camera_focal_point))
+            # Any point outside the visited cube is at least ring * cell_size away.
+            if len(found) >= k:
+                found.sort(key=lambda hit: hit[1])
+                if found[k - 1][1] <= ring * self.cell_size * L_ALPHA_7:
+                    break
+            ring += 1
+        found.sort(key=lambda hit: hit[1])
+        return found[:k]
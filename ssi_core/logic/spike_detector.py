@@ -0,0 +1,182 @@
+import math
+
+import numpy as np
+
+SPIKE = "spike"
+CLEAR = "clear"
+
+class SpikeDetector:
+    """
+    A streaming spike detector for one biometric channel. Each sample is
+    scored against an exponentially weighted mean and variance (EWMA z-score)
+    of the samples before it, in O(1) time and memory. A spike is confirmed
+    only after confirm_samples consecutive samples exceed z_enter (or the
+    absolute_enter level), and it clears only once a sample falls below both
+    z_exit and absolute_exit, so readings hovering at the threshold do not
+    flap. update() handles one live sample; process_array() replays a
+    recorded session with NumPy and yields the same events.
+    """
+    def __init__(self, alpha=0.005, warmup=200, z_enter=4.0, z_exit=1.5, confirm_samples=3,
+                 absolute_enter=None, absolute_exit=None):
+        if not 0 < alpha < 1:
+            raise ValueError("alpha must be between 0 and 1.")
+        if z_exit >= z_enter:
+            raise ValueError("z_exit must be below z_enter for hysteresis.")
+        self.alpha = alpha
+        self.warmup = warmup
+        self.z_enter = z_enter
+        self.z_exit = z_exit
+        self.confirm_samples = confirm_samples
+        self.absolute_enter = math.inf if absolute_enter is None else absolute_enter
+        self.absolute_exit = self.absolute_enter if absolute_exit is None else absolute_exit
+        self.count = 0
+        self.mean = 0.0
+        self.variance = 0.0
+        self.run_length = 0
+        self.in_spike = False
+
+    def update(self, value):
+        """Scores one sample. Returns SPIKE, CLEAR or None."""
+        if self.count == 0:
+            self.mean = value
+        diff = value - self.mean
+        if self.count >= self.warmup and self.variance > 0:
+            z = diff / math.sqrt(self.variance)
+        else:
+            z = 0.0
+        self.mean += self.alpha * diff
+        self.variance = (1 - self.alpha) * (self.variance + self.alpha * diff * diff)
+        self.count += 1
+
+        if z > self.z_enter or value > self.absolute_enter:
+            self.run_length += 1
+        else:
+            self.run_length = 0
+
+        if not self.in_spike:
+            if self.run_length >= self.confirm_samples:
+                self.in_spike = True
+                return SPIKE
+        elif z < self.z_exit and value < self.absolute_exit:
+            self.in_spike = False
+            return CLEAR
+        return None
+
+    def _chunk_length(self):
+        # Keep (1 - alpha) ** -length well inside float range for the recurrence.
+        return max(1, int(30.0 / -math.log1p(-self.alpha)))
+
+    def _ewma_recurrence(self, previous, inputs):
+        """Solves y[t] = (1 - alpha) * y[t-1] + inputs[t] for a whole array, chunk by chunk."""
+        decay = 1.0 - self.alpha
+        out = np.empty_like(inputs)
+        length = self._chunk_length()
+        for start in range(0, len(inputs), length):
+            chunk = inputs[start:start + length]
+            steps = np.arange(len(chunk), dtype=np.float64)
+            growth = decay ** -steps
+            out[start:start + len(chunk)] = decay ** steps * (decay * previous + np.cumsum(chunk * growth))
+            previous = out[start + len(chunk) - 1]
+        return out
+
+    def process_array(self, values):
+        """
+        Replays a recorded array of samples in one vectorized pass, continuing
+        from (and updating) the detector's streaming state. Returns a list of
+        (sample_index, SPIKE or CLEAR) events.
+        """
+        values = np.asarray(values, dtype=np.float64)
+        n = len(values)
+        if n == 0:
+            return []
+        alpha = self.alpha
+        start_mean = values[0] if self.count == 0 else self.mean
+
+        means = self._ewma_recurrence(start_mean, alpha * values)
+        previous_means = np.concatenate(([start_mean], means[:-1]))
+        diffs = values - previous_means
+        variances = self._ewma_recurrence(self.variance, (1 - alpha) * alpha * diffs * diffs)
+        previous_variances = np.concatenate(([self.variance], variances[:-1]))
+
+        counts_before = self.count + np.arange(n)
+        scorable = (counts_before >= self.warmup) & (previous_variances > 0)
+        z = np.zeros(n)
+        np.divide(diffs, np.sqrt(previous_variances, where=scorable, out=np.ones(n)), out=z, where=scorable)
+
+        entering = (z > self.z_enter) | (values > self.absolute_enter)
+        exiting = (z < self.z_exit) & (values < self.absolute_exit)
+
+        # Run length of consecutive entering samples, carried over from the stream.
+        index = np.arange(n)
+        last_break = np.maximum.accumulate(np.where(entering, -1, index))
+        run_lengths = np.where(last_break < 0, index + 1 + self.run_length, index - last_break)
+        run_lengths[~entering] = 0
+        confirmed = np.flatnonzero(run_lengths >= self.confirm_samples)
+        exits = np.flatnonzero(exiting)
+
+        events = []
+        in_spike = self.in_spike
+        position = 0
+        while position < n:
+            if not in_spike:
+                k = np.searchsorted(confirmed, position)
+                if k == len(confirmed):
+                    break
+                position = int(confirmed[k])
+                events.append((position, SPIKE))
+            else:
+                k = np.searchsorted(exits, position)
+                if k == len(exits):
+                    break
+                position = int(exits[k])
+                events.append((position, CLEAR))
+            in_spike = not in_spike
+            position += 1
+
+        self.mean = float(means[-1])
+        self.variance = float(variances[-1])
+        self.count += n
+        self.run_length = int(run_lengths[-1])
+        self.in_spike = in_spike
+        return events
+
+class BiometricSpikeMonitor:
+    """
+    Consumes pulse and stress sample streams and shifts Q into
+    "Protective/Soothing" mode on confirmed spikes only. The stress channel
+    also honours the BiometricBridge threshold (stress_level > 8) as an
+    absolute level, clearing below 6.
+    """
+    def __init__(self, vocal_burst_trigger, pulse_detector=None, stress_detector=None):
+        self.vocal_burst_trigger = vocal_burst_trigger
+        self.detectors = {
+            'pulse': pulse_detector or SpikeDetector(),
+            'stress_level': stress_detector or SpikeDetector(absolute_enter=8, absolute_exit=6),
+        }
+        self.spikes = 0
+
+    def feed(self, pulse=None, stress_level=None):
+        """Feeds one live sample per channel. Returns the channels that spiked."""
+        spiked = []
+        for channel, value in (('pulse', pulse), ('stress_level', stress_level)):
+            if value is not None and self.detectors[channel].update(value) == SPIKE:
+                spiked.append(channel)
+        self._soothe(len(spiked))
+        return spiked
+
+    def replay(self, pulse=None, stress_level=None):
+        """
+        Replays recorded sample arrays through the vectorized path.
+        Returns the SPIKE/CLEAR events per channel.
+        """
+        events = {}
+        for channel, values in (('pulse', pulse), ('stress_level', stress_level)):
+            if values is not None:
+                events[channel] = self.detectors[channel].process_array(values)
+                self._soothe(sum(1 for _, kind in events[channel] if kind == SPIKE))
+        return events
+
+    def _soothe(self, spikes):
+        for _ in range(spikes):
+            self.spikes += 1
+            self.vocal_burst_trigger.activate_soothing_mode()
@@ -0,0 +1,250 @@
+import asyncio
+import json
+import os
+import stat
+import sys
+import time
+
+class TelemetryIngestor:
+    """
+    Streams newline-delimited Wyze/Starlight telemetry JSON into a
+    StarlightVisualCortex's Affective Engine. Lines flow in batches through
+    a bounded queue: when it is full the reader either waits (backpressure)
+    or, with drop_when_full, discards the batch and counts its lines as
+    drops. Unchanged studio states are coalesced, and with debounce_seconds
+    a burst of changes is forwarded at most once per window (the latest
+    state wins). Coalescing and debouncing are tracked per device_id, so
+    one device's telemetry never hides another's. An Affective Engine that raises does not stop ingestion:
+    the failure is counted under "errors" and kept as last_error.
+    """
+    def __init__(self, cortex, queue_size=1024, drop_when_full=False, debounce_seconds=0.0):
+        self.cortex = cortex
+        self.queue_size = queue_size
+        self.drop_when_full = drop_when_full
+        self.debounce_seconds = debounce_seconds
+        self.stats = {
+            "received": 0,
+            "processed": 0,
+            "forwarded": 0,
+            "coalesced": 0,
+            "dropped": 0,
+            "parse_errors": 0,
+            "errors": 0,
+        }
+        self.last_error = None
+        self._queue = None
+        self._previous_line = None
+        # Per device_id: the last state forwarded and when, and a debounced state awaiting its flush timer.
+        self._last_forwarded_states = {}
+        self._last_forward_times = {}
+        self._pending_states = {}
+        self._flush_handles = {}
+        self._started = None
+
+    def messages_per_second(self):
+        """Returns the processing rate since ingestion started."""
+        if self._started is None:
+            return 0.0
+        elapsed = time.perf_counter() - self._started
+        return self.stats["processed"] / elapsed if elapsed > 0 else 0.0
+
+    def report(self):
+        """Returns the counters together with the current messages/sec rate."""
+        return dict(self.stats, messages_per_second=self.messages_per_second())
+
+    async def _enqueue(self, lines):
+        """Queues a batch of lines; the queue is bounded in batches."""
+        self.stats["received"] += len(lines)
+        if self.drop_when_full:
+            try:
+                self._queue.put_nowait(lines)
+            except asyncio.QueueFull:
+                self.stats["dropped"] += len(lines)
+        else:
+            await self._queue.put(lines)
+
+    async def _consume(self):
+        while True:
+            lines = await self._queue.get()
+            try:
+                if lines is None:
+                    return
+                self._handle_batch(lines)
+            finally:
+                self._queue.task_done()
+
+    def _handle_batch(self, lines):
+        stats = self.stats
+        extract_studio_state = self.cortex.extract_studio_state
+        previous_line = self._previous_line
+        for line in lines:
+            if line == previous_line:
+                # Byte-identical telemetry cannot change the state; skip parsing it.
+                stats["processed"] += 1
+                stats["coalesced"] += 1
+                continue
+            try:
+                data = json.loads(line)
+            except ValueError:
+                if line.strip():
+                    stats["processed"] += 1
+                    stats["parse_errors"] += 1
+                continue
+            stats["processed"] += 1
+            if not isinstance(data, dict):
+                stats["parse_errors"] += 1
+                continue
+            previous_line = line
+            self._offer_state(extract_studio_state(data))
+        self._previous_line = previous_line
+
+    def _offer_state(self, studio_state):
+        device_id = studio_state.get('device_id')
+        pending = self._pending_states.get(device_id)
+        reference = pending if pending is not None else self._last_forwarded_states.get(device_id)
+        if studio_state == reference:
+            self.stats["coalesced"] += 1
+            return
+        now = time.monotonic()
+        last_forward_time = self._last_forward_times.get(device_id)
+        if self.debounce_seconds and last_forward_time is not None \
+                and now - last_forward_time < self.debounce_seconds:
+            if pending is not None:
+                self.stats["coalesced"] += 1
+            self._pending_states[device_id] = studio_state
+            if device_id not in self._flush_handles:
+                delay = self.debounce_seconds - (now - last_forward_time)
+                self._flush_handles[device_id] = asyncio.get_running_loop().call_later(
+                    delay, self._flush_pending, device_id)
+            return
+        self._forward(studio_state)
+
+    def _flush_pending(self, device_id):
+        self._flush_handles.pop(device_id, None)
+        state = self._pending_states.pop(device_id, None)
+        if state is not None and state != self._last_forwarded_states.get(device_id):
+            self._forward(state)
+
+    def _flush_all(self):
+        """Cancels the debounce timers and forwards every device's pending state now."""
+        for handle in self._flush_handles.values():
+            handle.cancel()
+        for device_id in list(self._pending_states):
+            self._flush_pending(device_id)
+
+    def _forward(self, studio_state):
+        device_id = studio_state.get('device_id')
+        self._last_forwarded_states[device_id] = studio_state
+        self._last_forward_times[device_id] = time.monotonic()
+        self.stats["forwarded"] += 1
+        if self.cortex.affective_engine_pipe:
+            try:
+                self.cortex.affective_engine_pipe.update_studio_state(studio_state)
+            except Exception as e:
+                # A failing engine must not kill the consumer, or the reader blocks on a full queue forever.
+                self.stats["errors"] += 1
+                self.last_error = e
+
+    async def ingest(self, batches):
+        """
+        Ingests an async iterable of NDJSON line batches (lists of lines)
+        until it is exhausted, then flushes any debounced state and returns
+        the report.
+        """
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._started = time.perf_counter()
+        consumer = asyncio.ensure_future(self._consume())
+        try:
+            async for batch in batches:
+                await self._enqueue(batch)
+            await self._queue.put(None)
+            await consumer
+        finally:
+            consumer.cancel()
+            self._flush_all()
+        return self.report()
+
+    async def ingest_file(self, path, batch_bytes=64 * 1024):
+        """Ingests an NDJSON file."""
+        with open(path, "r", encoding="utf-8") as f:
+            return await self.ingest(read_file_batches(f, batch_bytes))
+
+    async def ingest_stdin(self, batch_bytes=64 * 1024):
+        """
+        Ingests NDJSON from standard input. Input redirected from a regular
+        file is read in readlines batches; a pipe or terminal is read as the
+        data arrives, so lines are not held back waiting for a full batch.
+        """
+        if _is_regular_file(sys.stdin):
+            return await self.ingest(read_file_batches(sys.stdin, batch_bytes))
+        return await self.ingest(read_pipe_batches(sys.stdin, batch_bytes))
+
+    async def serve_unix(self, socket_path):
+        """
+        Accepts NDJSON from any number of clients on a local Unix socket and
+        feeds them into one queue. Runs until cancelled.
+        """
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._started = time.perf_counter()
+        consumer = asyncio.ensure_future(self._consume())
+
+        async def handle_client(reader, writer):
+            try:
+                async for line in reader:
+                    await self._enqueue([line])
+            finally:
+                writer.close()
+
+        server = await asyncio.start_unix_server(handle_client, path=socket_path)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            consumer.cancel()
+            self._flush_all()
+
+def _is_regular_file(file_object):
+    try:
+        return stat.S_ISREG(os.fstat(file_object.fileno()).st_mode)
+    except (AttributeError, OSError, ValueError):
+        # No file descriptor (e.g. an in-memory stream): readlines cannot block.
+        return True
+
+async def read_file_batches(file_object, batch_bytes=64 * 1024):
+    """
+    Yields batches of roughly batch_bytes worth of lines from a regular file,
+    reading each batch in a worker thread so the event loop is never blocked
+    on disk. Not for pipes: readlines(batch_bytes) waits until batch_bytes
+    have arrived or the writer closes.
+    """
+    while True:
+        batch = await asyncio.to_thread(file_object.readlines, batch_bytes)
+        if not batch:
+            return
+        yield batch
+
+async def read_pipe_batches(pipe, batch_bytes=64 * 1024):
+    """
+    Yields batches of complete lines (bytes) from a pipe or terminal as soon
+    as data arrives. Each batch holds the lines completed by one read of at
+    most batch_bytes; a trailing partial line is carried into the next batch.
+    The pipe is closed once the writer closes its end.
+    """
+    loop = asyncio.get_running_loop()
+    reader = asyncio.StreamReader()
+    transport, _ = await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), pipe)
+    try:
+        partial = b""
+        while True:
+            chunk = await reader.read(batch_bytes)
+            if not chunk:
+                if partial:
+                    yield [partial]
+                return
+            data = partial + chunk
+            end = data.rfind(b"\n") + 1
+            partial = data[end:]
+            if end:
+                yield data[:end].splitlines(keepends=True)
+    finally:
+        transport.close()
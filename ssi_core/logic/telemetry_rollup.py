@@ -0,0 +1,172 @@
+import math
+import time
+from array import array
+
+DEFAULT_WINDOWS = (60, 600, 3600)
+DEFAULT_BUCKETS = 60
+DEFAULT_DEVICE = "studio"
+
+class RollingWindow:
+    """
+    Rolling min/max/mean of one numeric channel over a time window.
+    The window is split into a fixed ring of buckets held in flat arrays,
+    so an update is O(1), a query touches a constant number of buckets,
+    and memory never grows with the sample rate or the process lifetime.
+    Window edges are resolved to bucket granularity.
+    """
+    def __init__(self, window_seconds, buckets=DEFAULT_BUCKETS):
+        self.window_seconds = float(window_seconds)
+        self.buckets = buckets
+        self.bucket_width = self.window_seconds / buckets
+        self._epoch = array('q', [-1]) * buckets
+        self._count = array('q', [0]) * buckets
+        self._total = array('d', [0.0]) * buckets
+        self._low = array('d', [math.inf]) * buckets
+        self._high = array('d', [-math.inf]) * buckets
+
+    def add(self, timestamp, value):
+        bucket = int(timestamp // self.bucket_width)
+        slot = bucket % self.buckets
+        if bucket < self._epoch[slot]:
+            # A late sample for a bucket that has already been recycled: dropped, not allowed to wipe it.
+            return
+        if self._epoch[slot] != bucket:
+            self._epoch[slot] = bucket
+            self._count[slot] = 0
+            self._total[slot] = 0.0
+            self._low[slot] = value
+            self._high[slot] = value
+        elif value < self._low[slot]:
+            self._low[slot] = value
+        elif value > self._high[slot]:
+            self._high[slot] = value
+        self._count[slot] += 1
+        self._total[slot] += value
+
+    def _live_slots(self, now):
+        newest = int(now // self.bucket_width)
+        oldest = newest - self.buckets + 1
+        epoch = self._epoch
+        count = self._count
+        # Unused slots hold epoch -1, which falls inside the window for timestamps near zero.
+        return [slot for slot in range(self.buckets) if oldest <= epoch[slot] <= newest and count[slot]]
+
+    def stats(self, now):
+        """Returns count, min, max and mean of the samples in the window ending at now."""
+        count = 0
+        total = 0.0
+        low = math.inf
+        high = -math.inf
+        for slot in self._live_slots(now):
+            count += self._count[slot]
+            total += self._total[slot]
+            low = min(low, self._low[slot])
+            high = max(high, self._high[slot])
+        if not count:
+            return {"count": 0, "min": None, "max": None, "mean": None}
+        return {"count": count, "min": low, "max": high, "mean": total / count}
+
+    def trend(self, now):
+        """
+        Returns the mean of the newest live bucket minus the mean of the
+        oldest live bucket, or None with fewer than two live buckets.
+        Negative values mean the channel has dropped over the window.
+        """
+        slots = self._live_slots(now)
+        if len(slots) < 2:
+            return None
+        oldest = min(slots, key=lambda slot: self._epoch[slot])
+        newest = max(slots, key=lambda slot: self._epoch[slot])
+        return (self._total[newest] / self._count[newest]) - (self._total[oldest] / self._count[oldest])
+
+class DeviceTelemetry:
+    """
+    The latest studio state of one device, its last-change times and a set
+    of rolling windows for every numeric field it has reported.
+    """
+    def __init__(self, windows=DEFAULT_WINDOWS, buckets=DEFAULT_BUCKETS):
+        self.windows = tuple(windows)
+        self.buckets = buckets
+        self.channels = {}
+        self.state = {}
+        self.last_change = {}
+
+    def update(self, studio_state, timestamp):
+        for key, value in studio_state.items():
+            if key == 'device_id':
+                continue
+            if key not in self.state or self.state[key] != value:
+                self.state[key] = value
+                self.last_change[key] = timestamp
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                channel = self.channels.get(key)
+                if channel is None:
+                    channel = self.channels[key] = {window: RollingWindow(window, self.buckets)
+                                                    for window in self.windows}
+                for window in channel.values():
+                    window.add(timestamp, value)
+
+class TelemetryRollupStore:
+    """
+    A per-device history of studio telemetry with windowed rollups, so trends
+    such as "lighting has dropped over the last 10 minutes" are cheap to ask.
+    Every numeric field of a studio state is rolled up; the lighting_*
+    methods are shorthands for the 'lighting' field. States are filed under
+    their 'device_id' (DEFAULT_DEVICE when the telemetry names none). It
+    implements update_studio_state, so it can be connected to a
+    StarlightVisualCortex as its Affective Engine; states are then passed on
+    to the downstream engine, if any.
+    """
+    def __init__(self, windows=DEFAULT_WINDOWS, buckets=DEFAULT_BUCKETS, downstream=None, clock=time.time):
+        self.windows = tuple(windows)
+        self.buckets = buckets
+        self.downstream = downstream
+        self.clock = clock
+        self.devices = {}
+
+    def update_studio_state(self, studio_state, device_id=None, timestamp=None):
+        """Records a studio state for a device and forwards it downstream."""
+        if timestamp is None:
+            timestamp = self.clock()
+        if device_id is None:
+            device_id = studio_state.get('device_id') or DEFAULT_DEVICE
+        device = self.devices.get(device_id)
+        if device is None:
+            device = self.devices[device_id] = DeviceTelemetry(self.windows, self.buckets)
+        device.update(studio_state, timestamp)
+        if self.downstream is not None:
+            self.downstream.update_studio_state(studio_state)
+
+    def _channel(self, key, device_id):
+        """Returns a device's windows for a field, or None if either has not reported yet."""
+        device = self.devices.get(device_id)
+        return device.channels.get(key) if device is not None else None
+
+    def stats(self, key, window_seconds, device_id=DEFAULT_DEVICE, now=None):
+        """Returns count/min/max/mean of a numeric field over one of the configured windows."""
+        now = self.clock() if now is None else now
+        channel = self._channel(key, device_id)
+        if channel is None:
+            return {"count": 0, "min": None, "max": None, "mean": None}
+        return channel[window_seconds].stats(now)
+
+    def trend(self, key, window_seconds, device_id=DEFAULT_DEVICE, now=None):
+        """Returns the change in a numeric field's mean across a window."""
+        now = self.clock() if now is None else now
+        channel = self._channel(key, device_id)
+        if channel is None:
+            return None
+        return channel[window_seconds].trend(now)
+
+    def lighting_stats(self, window_seconds, device_id=DEFAULT_DEVICE, now=None):
+        """Returns count/min/max/mean lighting over one of the configured windows."""
+        return self.stats('lighting', window_seconds, device_id, now)
+
+    def lighting_trend(self, window_seconds, device_id=DEFAULT_DEVICE, now=None):
+        """Returns the change in mean lighting across a window (negative when dimming)."""
+        return self.trend('lighting', window_seconds, device_id, now)
+
+    def last_change(self, key, device_id=DEFAULT_DEVICE):
+        """Returns when a state key (lighting, device_status, connectivity) last changed."""
+        device = self.devices.get(device_id)
+        return device.last_change.get(key) if device is not None else None
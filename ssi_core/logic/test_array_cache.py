@@ -0,0 +1,52 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from ssi_core.logic.array_cache import ArrayCache, content_digest
+
+class TestArrayCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = ArrayCache(os.path.join(self.tmp.name, "cache"), max_bytes=10_000)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_entries_round_trip_memory_mapped(self):
+        """
+        Tests that stored arrays and meta load back memory-mapped and misses are counted.
+        """
+        key = content_digest({"b": 2, "a": 1})
+        self.assertEqual(key, content_digest({"a": 1, "b": 2}))
+        self.assertIsNone(self.cache.load(key, ("values",)))
+        self.cache.store(key, {"values": np.arange(10.0)}, {"channels": ["x"]})
+        arrays, meta = self.cache.load(key, ("values",))
+        self.assertIsInstance(arrays["values"], np.memmap)
+        np.testing.assert_array_equal(arrays["values"], np.arange(10.0))
+        self.assertEqual(meta, {"channels": ["x"]})
+        self.assertEqual(self.cache.stats(), {"hits": 1, "misses": 1})
+
+    def test_storing_an_existing_entry_keeps_the_first(self):
+        """
+        Tests that a second store of the same key leaves no staging directories behind.
+        """
+        self.cache.store("key", {"values": np.zeros(4)})
+        self.cache.store("key", {"values": np.ones(4)})
+        arrays, meta = self.cache.load("key", ("values",))
+        np.testing.assert_array_equal(arrays["values"], np.zeros(4))
+        self.assertIsNone(meta)
+        self.assertEqual(os.listdir(self.cache.cache_dir), ["key"])
+
+    def test_size_cap_evicts_least_recently_used(self):
+        """
+        Tests that entries past the size cap are evicted oldest first and the newest is kept.
+        """
+        self.cache.store("old", {"values": np.zeros(1000)})
+        os.utime(os.path.join(self.cache.cache_dir, "old"), (0, 0))
+        self.cache.store("new", {"values": np.zeros(1000)})
+        self.assertIsNone(self.cache.load("old", ("values",)))
+        self.assertIsNotNone(self.cache.load("new", ("values",)))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import json
+import os
+import tempfile
+import time
+import unittest
+from ssi_core.logic.biometric_bridge import BiometricBridge, BiometricWatcher
+
+class CountingTrigger:
+    def __init__(self):
+        self.activations = 0
+
+    def activate_soothing_mode(self):
+        self.activations += 1
+
+def write_biometrics(path, stress_level):
+    # Write to a temporary file and rename, as a sync agent would.
+    with open(path + ".tmp", "w") as f:
+        json.dump({"pulse": 72, "stress_level": stress_level}, f)
+    os.replace(path + ".tmp", path)
+
+class TestBiometricBridge(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "biometric_sync.json")
+        write_biometrics(self.path, 9)
+        self.trigger = CountingTrigger()
+        self.bridge = BiometricBridge(self.path, self.trigger)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_process_biometrics_evaluates_every_call(self):
+        """
+        Tests that the direct path still re-reads and evaluates on every call.
+        """
+        self.bridge.process_biometrics()
+        self.bridge.process_biometrics()
+        self.assertEqual(self.trigger.activations, 2)
+
+    def test_poll_skips_unchanged_file(self):
+        """
+        Tests that watch mode only re-parses and evaluates after a change.
+        """
+        self.assertTrue(self.bridge.poll())
+        self.assertFalse(self.bridge.poll())
+        self.assertEqual(self.trigger.activations, 1)
+
+        write_biometrics(self.path, 10)
+        self.assertTrue(self.bridge.poll())
+        self.assertEqual(self.bridge.snapshot["stress_level"], 10)
+        self.assertEqual(self.trigger.activations, 2)
+
+    def test_watcher_handles_many_subjects(self):
+        """
+        Tests that one watcher thread serves several bridge files.
+        """
+        bridges = []
+        for subject in range(3):
+            path = os.path.join(self.tmp.name, f"subject_{subject}.json")
+            write_biometrics(path, 2)
+            bridges.append(BiometricBridge(path, CountingTrigger()))
+        watcher = BiometricWatcher(interval=0.01)
+        for bridge in bridges:
+            watcher.add(bridge)
+        watcher.start()
+        try:
+            write_biometrics(bridges[1].json_path, 9)
+            deadline = time.time() + 2
+            while bridges[1].vocal_burst_trigger.activations == 0 and time.time() < deadline:
+                time.sleep(0.01)
+        finally:
+            watcher.stop()
+        self.assertEqual([b.vocal_burst_trigger.activations for b in bridges], [0, 1, 0])
+        self.assertEqual(watcher.poll_once(), 0)
+
+if __name__ == '__main__':
+    unittest.main()
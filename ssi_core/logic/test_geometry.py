@@ -0,0 +1,57 @@
+import json
+import os
+import tempfile
+import unittest
+import numpy as np
+from ssi_core.kernel.chronos import L_ALPHA_7
+from ssi_core.logic.geometry import icosphere, load_q_state, manifestation_mesh
+
+class TestGeometry(unittest.TestCase):
+
+    def test_icosphere_counts_follow_blender_convention(self):
+        """
+        Tests vertex and face counts per subdivision level.
+        """
+        for subdivisions in range(1, 7):
+            vertices, faces = icosphere(subdivisions)
+            self.assertEqual(len(vertices), 10 * 4 ** (subdivisions - 1) + 2)
+            self.assertEqual(len(faces), 20 * 4 ** (subdivisions - 1))
+
+    def test_icosphere_is_closed_and_outward_facing(self):
+        """
+        Tests that every vertex lies on the sphere and every face points outward.
+        """
+        vertices, faces = icosphere(4, radius=2.0)
+        np.testing.assert_allclose(np.linalg.norm(vertices, axis=1), 2.0)
+        triangles = vertices[faces]
+        normals = np.cross(triangles[:, 1] - triangles[:, 0], triangles[:, 2] - triangles[:, 0])
+        self.assertTrue(np.all(np.einsum('ij,ij->i', normals, triangles.mean(axis=1)) > 0))
+        edges = np.sort(faces[:, [0, 1, 1, 2, 2, 0]].reshape(-1, 2), axis=1)
+        _, uses = np.unique(edges, axis=0, return_counts=True)
+        self.assertTrue(np.all(uses == 2))
+
+    def test_manifestation_mesh_applies_l_alpha_7(self):
+        """
+        Tests that the manifestation is displaced by the q_state.json constant.
+        """
+        vertices, _ = manifestation_mesh(subdivisions=3)
+        np.testing.assert_allclose(np.linalg.norm(vertices, axis=1), L_ALPHA_7)
+
+    def test_q_state_reloads_only_on_change(self):
+        """
+        Tests that q_state.json is cached until the file changes.
+        """
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "q_state.json")
+            with open(path, "w") as f:
+                json.dump({"L_alpha_7": 1.5}, f)
+            first = load_q_state(path)
+            self.assertIs(load_q_state(path), first)
+            with open(path, "w") as f:
+                json.dump({"L_alpha_7": 2.25}, f)
+            os.utime(path, ns=(0, 10 ** 9))
+            vertices, _ = manifestation_mesh(subdivisions=1, q_state_path=path)
+            np.testing.assert_allclose(np.linalg.norm(vertices, axis=1), 2.25)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,7 @@
 import unittest
 import math
-from ssi_core.logic.heuristic_interface import calculate_proximity
+import numpy as np
+from ssi_core.logic.heuristic_interface import calculate_proximity, calculate_proximity_batch
 from ssi_core.kernel.chronos import L_ALPHA_7
 
 class TestHeuristicInterface(unittest.TestCase):
@@ -24,5 +25,55 @@ class TestHeuristicInterface(unittest.TestCase):
         # Assert that the actual and expected values are close enough to account for floating point inaccuracies
         self.assertAlmostEqual(actual_weighted_distance, expected_weighted_distance, places=7)
 
+    def test_calculate_proximity_batch_vector(self):
+        """
+        Tests that a single focal point yields one weighted distance per point.
+        """
+        rng = np.random.default_rng(7)
+        points = rng.normal(size=(50, 3))
+        camera_focal_point = (0, -5, 1.5)
+
+        distances = calculate_proximity_batch(points, camera_focal_point, chunk_size=8)
+
+        self.assertEqual(distances.shape, (50,))
+        for point, distance in zip(points, distances):
+            self.assertAlmostEqual(distance, calculate_proximity(point, camera_focal_point), places=9)
+
+    def test_calculate_proximity_batch_matrix(self):
+        """
+        Tests that M focal points yield an N x M matrix independent of chunk size.
+        """
+        rng = np.random.default_rng(11)
+        points = rng.normal(size=(37, 3))
+        focal_points = rng.normal(size=(5, 3))
+
+        matrix = calculate_proximity_batch(points, focal_points, chunk_size=4)
+        unchunked = calculate_proximity_batch(points, focal_points, chunk_size=1000)
+
+        self.assertEqual(matrix.shape, (37, 5))
+        np.testing.assert_allclose(matrix, unchunked)
+        self.assertAlmostEqual(matrix[3, 2], calculate_proximity(points[3], focal_points[2]), places=9)
+
+    def test_calculate_proximity_batch_dimension_mismatch(self):
+        """
+        Tests that mismatched vector dimensions are rejected.
+        """
+        with self.assertRaises(ValueError):
+            calculate_proximity_batch(np.zeros((4, 3)), (0, 0))
+        with self.assertRaises(ValueError):
+            calculate_proximity((0, 0, 0), (0, 0))
+
+    def test_scalar_and_batch_agree(self):
+        """
+        Tests that the pure-Python scalar path matches the NumPy batch path across dimensions and scales.
+        """
+        rng = np.random.default_rng(3)
+        for dimensions in (1, 2, 3, 7):
+            points = rng.normal(scale=1000.0, size=(25, dimensions))
+            focal_point = rng.normal(size=dimensions)
+            batch = calculate_proximity_batch(points, focal_point)
+            scalar = [calculate_proximity(point, focal_point) for point in points]
+            np.testing.assert_allclose(scalar, batch, rtol=1e-12)
+
 if __name__ == '__main__':
     unittest.main()
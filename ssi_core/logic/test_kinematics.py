@@ -0,0 +1,124 @@
+import json
+import os
+import tempfile
+import unittest
+import numpy as np
+from ssi_core.logic.kinematics import (
+    DEFAULT_KINEMATICS_PATH,
+    KinematicsCache,
+    evaluate_kinematics,
+    kinematics_digest,
+    load_kinematics,
+)
+
+class TestKinematics(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = KinematicsCache(os.path.join(self.tmp.name, "kinematics_cache"))
+        self.document = load_kinematics(DEFAULT_KINEMATICS_PATH)
+        self.kinematics_path = os.path.join(self.tmp.name, "kinematics.json")
+        self._write(self.document)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _write(self, document, indent=2):
+        with open(self.kinematics_path, "w") as f:
+            json.dump(document, f, indent=indent)
+
+    def test_all_layers_evaluate_to_one_array(self):
+        """
+        Tests that every animation layer compiles into finite float32 curves for every frame.
+        """
+        curves = evaluate_kinematics(self.document, 12_000, fps=24)
+        self.assertEqual(curves.values.shape, (12_000, len(curves.channels)))
+        self.assertEqual(curves.values.dtype, np.float32)
+        self.assertTrue(np.isfinite(curves.values).all())
+        for channel in ("chest.scale", "eyes.rotation_z", "eyelids.blink", "mouth.smile", "hips.location_x"):
+            self.assertIn(channel, curves.channels)
+        np.testing.assert_array_equal(curves.frames[[0, -1]], [1, 12_000])
+
+    def test_breathing_follows_the_resting_rate(self):
+        """
+        Tests that the chest rises and falls once per breath cycle (5 seconds).
+        """
+        chest = evaluate_kinematics(self.document, 24 * 5 + 1, fps=24)["chest.scale"]
+        self.assertAlmostEqual(chest[0], 1.0, places=6)
+        self.assertAlmostEqual(chest[60], 1.02, places=6)
+        self.assertAlmostEqual(chest[120], 1.0, places=6)
+
+    def test_curves_are_deterministic_per_layer(self):
+        """
+        Tests that curves repeat for a seed and do not depend on which other layers are enabled.
+        """
+        first = evaluate_kinematics(self.document, 2_000, seed=3)
+        np.testing.assert_array_equal(first.values, evaluate_kinematics(self.document, 2_000, seed=3).values)
+        self.assertFalse(np.array_equal(first["eyes.rotation_z"],
+                                        evaluate_kinematics(self.document, 2_000, seed=4)["eyes.rotation_z"]))
+
+        self.document["kinematics"]["animation_layers"] = ["eye_tracking_sentient_focus"]
+        self.document["kinematics"]["locomotion_parameters"]["dynamic_weight_shift"] = False
+        eyes_only = evaluate_kinematics(self.document, 2_000, seed=3)
+        self.assertEqual(eyes_only.channels, ("eyes.rotation_x", "eyes.rotation_z", "eyelids.blink"))
+        np.testing.assert_array_equal(eyes_only["eyes.rotation_z"], first["eyes.rotation_z"])
+
+    def test_micro_expression_intensity_scales_the_face(self):
+        """
+        Tests that micro_expression_intensity scales facial channels but not breathing.
+        """
+        full = evaluate_kinematics(self.document, 1_000)
+        self.document["kinematics"]["micro_expression_intensity"] /= 2
+        half = evaluate_kinematics(self.document, 1_000)
+        np.testing.assert_allclose(half["mouth.smile"], full["mouth.smile"] / 2, rtol=1e-6)
+        np.testing.assert_array_equal(half["chest.scale"], full["chest.scale"])
+
+    def test_unknown_layer_is_rejected(self):
+        """
+        Tests that an unknown animation layer raises instead of being skipped silently.
+        """
+        self.document["kinematics"]["animation_layers"].append("tail_wag")
+        with self.assertRaises(ValueError):
+            evaluate_kinematics(self.document, 10)
+
+    def test_bakes_are_cached_by_content(self):
+        """
+        Tests that a repeat bake is a memory-mapped hit, reformatting keeps it, and edits rebake.
+        """
+        built = self.cache.bake(10_000, kinematics_path=self.kinematics_path)
+        cached = self.cache.bake(10_000, kinematics_path=self.kinematics_path)
+        self.assertEqual(self.cache.stats(), {"hits": 1, "misses": 1})
+        self.assertIsInstance(cached.values, np.memmap)
+        self.assertEqual(cached.channels, built.channels)
+        np.testing.assert_array_equal(cached.values, built.values)
+
+        self._write(self.document, indent=None)
+        self.cache.bake(10_000, kinematics_path=self.kinematics_path)
+        self.assertEqual(self.cache.stats()["hits"], 2)
+
+        self.document["kinematics"]["joint_fluidity"] = 0.5
+        self._write(self.document)
+        self.cache.bake(10_000, kinematics_path=self.kinematics_path)
+        self.cache.bake(5_000, kinematics_path=self.kinematics_path)
+        self.assertEqual(self.cache.stats()["misses"], 3)
+
+    def test_bake_cache_is_capped(self):
+        """
+        Tests that the bake cache evicts older bakes instead of growing without bound.
+        """
+        small = KinematicsCache(os.path.join(self.tmp.name, "small"), max_bytes=300_000)
+        for frames in (5_000, 6_000, 7_000):
+            small.bake(frames, kinematics_path=self.kinematics_path)
+        self.assertLessEqual(len(os.listdir(small.cache_dir)), 2)
+        self.assertIsNotNone(small.bake(7_000, kinematics_path=self.kinematics_path))
+        self.assertEqual(small.stats()["hits"], 1)
+
+    def test_digest_ignores_key_order(self):
+        """
+        Tests that the content hash depends on the document, not its key order.
+        """
+        reordered = dict(reversed(list(self.document.items())))
+        self.assertEqual(kinematics_digest(reordered), kinematics_digest(self.document))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+import unittest
+import numpy as np
+from ssi_core.logic.look_at import (
+    TRACK_AXES,
+    UP_AXES,
+    euler_to_matrices,
+    look_at_matrices,
+    matrices_to_euler,
+    solve_look_at,
+)
+
+def orbit(frames, radius=5.0, height=1.5):
+    angles = np.linspace(0, 4 * np.pi, frames)
+    return np.stack([radius * np.sin(angles), -radius * np.cos(angles), np.full(frames, height)], axis=1)
+
+class TestLookAt(unittest.TestCase):
+
+    def test_camera_track_axis_points_at_target(self):
+        """
+        Tests that the camera's -Z axis points at the target and its Y axis leans toward world up.
+        """
+        matrix = look_at_matrices((0, -5, 1.5), (0, 0, 0))[0]
+        direction = np.array([0, 5, -1.5]) / np.linalg.norm([0, 5, -1.5])
+        np.testing.assert_allclose(matrix @ [0, 0, -1], direction, atol=1e-12)
+        self.assertGreater((matrix @ [0, 1, 0])[2], 0)
+        self.assertAlmostEqual((matrix @ [1, 0, 0])[2], 0.0)
+
+    def test_every_axis_combination_is_a_proper_rotation(self):
+        """
+        Tests that all track/up axis pairs give orthonormal, right-handed rotations.
+        """
+        eye, target = orbit(50), np.zeros(3)
+        for track_axis, (track_index, sign) in TRACK_AXES.items():
+            for up_axis, up_index in UP_AXES.items():
+                if up_index == track_index:
+                    with self.assertRaises(ValueError):
+                        look_at_matrices(eye, target, track_axis, up_axis)
+                    continue
+                matrices = look_at_matrices(eye, target, track_axis, up_axis)
+                identity = np.broadcast_to(np.eye(3), (50, 3, 3))
+                np.testing.assert_allclose(matrices @ matrices.transpose(0, 2, 1), identity, atol=1e-12)
+                np.testing.assert_allclose(np.linalg.det(matrices), 1.0)
+                forward = (target - eye) / np.linalg.norm(target - eye, axis=1, keepdims=True)
+                np.testing.assert_allclose(sign * matrices[:, :, track_index], forward, atol=1e-12)
+
+    def test_euler_round_trips_and_stays_continuous(self):
+        """
+        Tests that baked euler angles reproduce the rotations without jumps between frames.
+        """
+        eye = orbit(2000)
+        matrices = look_at_matrices(eye, (0, 0, 0))
+        euler = matrices_to_euler(matrices)
+        np.testing.assert_allclose(euler_to_matrices(euler), matrices, atol=1e-9)
+        self.assertLess(np.abs(np.diff(euler, axis=0)).max(), 0.1)
+        self.assertGreater(euler[-1, 2] - euler[0, 2], 3 * np.pi)
+
+    def test_degenerate_frames_reuse_previous_direction(self):
+        """
+        Tests that frames where camera and target coincide keep the nearest earlier aim.
+        """
+        eye = np.array([[0, -5, 0], [0, 0, 0], [0, 0, 0], [5, 0, 0]], dtype=float)
+        matrices = look_at_matrices(eye, (0, 0, 0))
+        np.testing.assert_allclose(matrices[1], matrices[0])
+        np.testing.assert_allclose(matrices[2], matrices[0])
+        np.testing.assert_allclose(look_at_matrices((1, 1, 1), (1, 1, 1))[0], np.eye(3))
+        straight_up = look_at_matrices((0, 0, 0), (0, 0, 5))[0]
+        np.testing.assert_allclose(straight_up @ [0, 0, -1], [0, 0, 1])
+
+    def test_thousands_of_frames_solve_in_one_pass(self):
+        """
+        Tests that a 10k-frame trajectory with a moving target solves to rotations aiming at the target.
+        """
+        eye, target = orbit(10_000), orbit(10_000, radius=0.5, height=0.0)
+        euler = solve_look_at(eye, target)
+        self.assertEqual(euler.shape, (10_000, 3))
+        forward = (target - eye) / np.linalg.norm(target - eye, axis=1, keepdims=True)
+        np.testing.assert_allclose(euler_to_matrices(euler) @ [0, 0, -1], forward, atol=1e-9)
+
+if __name__ == '__main__':
+    unittest.main()
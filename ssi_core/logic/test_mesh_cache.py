@@ -0,0 +1,71 @@
+import json
+import os
+import tempfile
+import unittest
+import numpy as np
+from ssi_core.logic.geometry import icosphere
+from ssi_core.logic.mesh_cache import MeshCache
+
+class TestMeshCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = MeshCache(os.path.join(self.tmp.name, "mesh_cache"))
+        self.q_state_path = os.path.join(self.tmp.name, "q_state.json")
+        self._write_q_state(1.6180336)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _write_q_state(self, l_alpha_7, architect="Master Jody"):
+        with open(self.q_state_path, "w") as f:
+            json.dump({"architect": architect, "L_alpha_7": l_alpha_7}, f)
+
+    def test_repeat_runs_are_served_memory_mapped(self):
+        """
+        Tests that the second request is a memory-mapped hit with identical arrays.
+        """
+        built = self.cache.manifestation_mesh(4, q_state_path=self.q_state_path)
+        cached = self.cache.manifestation_mesh(4, q_state_path=self.q_state_path)
+        self.assertEqual(self.cache.stats(), {"hits": 1, "misses": 1})
+        self.assertIsInstance(cached[0], np.memmap)
+        np.testing.assert_array_equal(built[0], cached[0])
+        np.testing.assert_array_equal(built[1], cached[1])
+
+        reopened = MeshCache(self.cache.cache_dir)
+        reopened.manifestation_mesh(4, q_state_path=self.q_state_path)
+        self.assertEqual(reopened.stats()["hits"], 1)
+
+    def test_q_state_change_invalidates(self):
+        """
+        Tests that any q_state.json change forces a rebuild.
+        """
+        self.cache.manifestation_mesh(3, q_state_path=self.q_state_path)
+        self._write_q_state(1.6180336, architect="Q")
+        os.utime(self.q_state_path, ns=(0, 10 ** 9))
+        vertices, _ = self.cache.manifestation_mesh(3, q_state_path=self.q_state_path)
+        self.assertEqual(self.cache.stats()["misses"], 2)
+        np.testing.assert_allclose(np.linalg.norm(vertices, axis=1), 1.6180336)
+
+    def test_halo_icosphere_is_undisplaced(self):
+        """
+        Tests the plain icosphere path used for halo particles.
+        """
+        vertices, faces = self.cache.icosphere(2, radius=0.01)
+        expected_vertices, expected_faces = icosphere(2, radius=0.01)
+        np.testing.assert_array_equal(vertices, expected_vertices)
+        np.testing.assert_array_equal(faces, expected_faces)
+
+    def test_size_cap_evicts_least_recently_used(self):
+        """
+        Tests that entries past the size cap are evicted oldest first.
+        """
+        small = MeshCache(os.path.join(self.tmp.name, "small"), max_bytes=60_000)
+        small.icosphere(4)
+        os.utime(os.path.join(small.cache_dir, small.key(4, 1.0, 1.0)), (0, 0))
+        small.icosphere(4, radius=2.0)
+        self.assertIsNone(small.get(small.key(4, 1.0, 1.0)))
+        self.assertIsNotNone(small.get(small.key(4, 2.0, 1.0)))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,128 @@
+import json
+import os
+import tempfile
+import time
+import unittest
+from ssi_core.logic.render_scheduler import (
+    DEFAULT_WORKER_COMMAND,
+    STUB_WORKER_COMMAND,
+    RenderScheduler,
+    RenderUnit,
+    build_unit_description,
+    plan_units,
+)
+
+CONFIG = {"environmental_atmosphere": {"humidity_coefficient": 0.18, "scattering_model": "rayleigh"}}
+
+class TestRenderScheduler(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def scheduler(self, **options):
+        options.setdefault("retry_delay", 0.0)
+        return RenderScheduler(STUB_WORKER_COMMAND, output_root=self.directory.name, **options)
+
+    def read_results(self, job_id):
+        with open(os.path.join(self.directory.name, job_id, "results.jsonl")) as f:
+            return [json.loads(line) for line in f]
+
+    def test_blender_defaults_to_one_worker(self):
+        """
+        Tests that Blender renders default to a single worker and pure-Python workers to one per core.
+        """
+        self.assertEqual(RenderScheduler().workers, 1)
+        self.assertEqual(RenderScheduler(DEFAULT_WORKER_COMMAND).workers, 1)
+        self.assertEqual(RenderScheduler(STUB_WORKER_COMMAND).workers, os.cpu_count() or 1)
+        self.assertEqual(RenderScheduler(DEFAULT_WORKER_COMMAND, workers=3).workers, 3)
+
+    def test_plan_units_splits_frames_and_sweeps(self):
+        """
+        Tests that every sweep combination covers the whole frame range.
+        """
+        units = plan_units(0, 9, frames_per_unit=4, sweep={"humidity_coefficient": [0.1, 0.2], "samples": [64]})
+        self.assertEqual(len(units), 6)
+        self.assertEqual([(u.frame_start, u.frame_end) for u in units[:3]], [(0, 3), (4, 7), (8, 9)])
+        self.assertEqual(units[3].params, {"humidity_coefficient": 0.2, "samples": 64})
+        self.assertEqual(len({u.unit_id for u in units}), 6)
+        again = plan_units(0, 9, frames_per_unit=4, sweep={"humidity_coefficient": [0.1, 0.2], "samples": [64]})
+        self.assertEqual([u.unit_id for u in again], [u.unit_id for u in units])
+
+    def test_unit_description_applies_overrides(self):
+        """
+        Tests that atmosphere and render parameters reach the scene description.
+        """
+        unit = RenderUnit("unit_0000", 3, 5, {"humidity_coefficient": 0.5, "samples": 32})
+        description = build_unit_description(CONFIG, {"L_alpha_7": 1.6180336}, unit, "/tmp/out")
+        self.assertEqual(description["AtmosphericParticles"].props["count"], 5000)
+        render = description["Render"].props
+        self.assertEqual((render["frame_start"], render["frame_end"], render["samples"]), (3, 5, 32))
+        self.assertEqual(CONFIG["environmental_atmosphere"]["humidity_coefficient"], 0.18)
+        with self.assertRaises(ValueError):
+            build_unit_description(CONFIG, {"L_alpha_7": 1.0}, RenderUnit("u", params={"bogus": 1}), "/tmp/out")
+
+    def test_units_run_and_collect_outputs(self):
+        """
+        Tests that every unit's frames are written and recorded in results.jsonl.
+        """
+        units = plan_units(0, 5, frames_per_unit=2, sweep={"humidity_coefficient": [0.1, 0.2]})
+        summary = self.scheduler(workers=4).run(units, "job")
+        self.assertEqual((summary["succeeded"], summary["failed"], summary["retries"]), (6, 0, 0))
+        results = self.read_results("job")
+        self.assertEqual(sorted(r["unit_id"] for r in results), sorted(u.unit_id for u in units))
+        first = next(r for r in results if r["unit_id"] == units[0].unit_id)
+        self.assertEqual(first["outputs"], ["frame_0000.png", "frame_0001.png"])
+        with open(os.path.join(self.directory.name, "job", "summary.json")) as f:
+            self.assertEqual(json.load(f), summary)
+
+    def test_failed_units_are_retried(self):
+        """
+        Tests that flaky units succeed on retry and hopeless ones are marked failed.
+        """
+        units = [RenderUnit("flaky", params={"stub_fail_attempts": 2}),
+                 RenderUnit("broken", params={"stub_fail_attempts": 5})]
+        summary = self.scheduler(max_attempts=3).run(units, "job")
+        self.assertEqual((summary["succeeded"], summary["failed"]), (1, 1))
+        results = {r["unit_id"]: r for r in self.read_results("job")}
+        self.assertEqual((results["flaky"]["status"], results["flaky"]["attempts"]), ("ok", 3))
+        self.assertEqual(results["broken"]["status"], "failed")
+        self.assertIn("Stub worker failing attempt 3", results["broken"]["error"])
+        self.assertEqual(results["flaky"]["outputs"], ["frame_0000.png"])
+
+    def test_rerun_skips_completed_units(self):
+        """
+        Tests that resuming a job only reruns the units that failed.
+        """
+        units = [RenderUnit("good"), RenderUnit("bad", params={"stub_fail_attempts": 1})]
+        self.scheduler(max_attempts=1).run(units, "job")
+        summary = self.scheduler(max_attempts=1).run(
+            [units[0], RenderUnit("bad")], "job")
+        self.assertEqual((summary["skipped"], summary["succeeded"]), (1, 1))
+
+    def test_changed_plan_is_not_skipped_on_resume(self):
+        """
+        Tests that resuming a job with a different frame range or a reused unit id reruns the changed work.
+        """
+        self.scheduler().run(plan_units(0, 3, frames_per_unit=2), "job")
+        summary = self.scheduler().run(plan_units(0, 5, frames_per_unit=3), "job")
+        self.assertEqual((summary["skipped"], summary["succeeded"]), (0, 2))
+        self.scheduler().run([RenderUnit("fixed", 0, 1)], "job2")
+        summary = self.scheduler().run([RenderUnit("fixed", 4, 4)], "job2")
+        self.assertEqual((summary["skipped"], summary["succeeded"]), (0, 1))
+        self.assertEqual(self.read_results("job2")[-1]["outputs"], ["frame_0004.png"])
+
+    def test_workers_run_in_parallel(self):
+        """
+        Tests that the pool overlaps slow units instead of running them serially.
+        """
+        units = [RenderUnit(f"unit_{i}", params={"stub_seconds": 0.3}) for i in range(4)]
+        started = time.perf_counter()
+        summary = self.scheduler(workers=4).run(units, "job")
+        self.assertEqual(summary["succeeded"], 4)
+        self.assertLess(time.perf_counter() - started, 1.2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,176 @@
+import copy
+import unittest
+from ssi_core.logic.scene_graph import (
+    SceneNode,
+    SceneReconciler,
+    build_scene_description,
+    dependency_order,
+    diff_scenes,
+    dump_description,
+    load_description,
+)
+
+CONFIG = {"environmental_atmosphere": {"humidity_coefficient": 0.18, "scattering_model": "rayleigh"}}
+Q_STATE = {"L_alpha_7": 1.6180336}
+
+class FakeSceneBackend:
+    """
+    An in-memory stand-in for Blender that records every operation. Nodes of
+    rebuild_kinds are recreated on update, like the Blender backend does for
+    kinds it cannot patch in place. Each created node remembers which
+    instance of its dependencies it links to, so stale links are caught.
+    """
+    def __init__(self, rebuild_kinds=()):
+        self.rebuild_kinds = set(rebuild_kinds)
+        self.scene = {}
+        self.links = {}
+        self.instances = {}
+        self.operations = []
+
+    def create(self, node):
+        for dependency in node.depends:
+            assert dependency in self.scene, f"{node.name} created before {dependency}"
+        self.scene[node.name] = node
+        self.instances[node.name] = self.instances.get(node.name, 0) + 1
+        self.links[node.name] = {dependency: self.instances[dependency] for dependency in node.depends}
+        self.operations.append(("create", node.name))
+
+    def update(self, node, previous):
+        assert self.scene[node.name] == previous
+        for dependency, instance in self.links[node.name].items():
+            assert self.instances[dependency] == instance, f"{node.name} links to a deleted {dependency}"
+        if node.kind in self.rebuild_kinds:
+            self.remove(previous)
+            self.create(node)
+            return True
+        self.scene[node.name] = node
+        self.operations.append(("update", node.name))
+
+    def remove(self, node):
+        del self.scene[node.name]
+        del self.links[node.name]
+        self.operations.append(("remove", node.name))
+
+class TestSceneGraph(unittest.TestCase):
+
+    def setUp(self):
+        self.backend = FakeSceneBackend()
+        self.reconciler = SceneReconciler(self.backend)
+
+    def test_initial_apply_creates_every_node_in_dependency_order(self):
+        """
+        Tests that the first apply creates the whole scene, dependencies first.
+        """
+        description = build_scene_description(CONFIG, Q_STATE)
+        diff = self.reconciler.apply(description)
+        self.assertEqual(set(diff.created), set(description))
+        self.assertEqual(self.backend.scene, description)
+        self.assertEqual(set(self.reconciler.timings), set(description))
+        order = dependency_order(description)
+        self.assertLess(order.index("Obsidian_Gallery"), order.index("GME_V1_Manifestation"))
+        self.assertLess(order.index("GME_V1_Manifestation"), order.index("Camera"))
+
+    def test_particles_use_a_field_lod_from_the_camera(self):
+        """
+        Tests that the particle node instances a particle field filling the domain, LOD'd from the camera.
+        """
+        description = build_scene_description(CONFIG, Q_STATE)
+        field = description["AtmosphericParticles"].props["field"]
+        self.assertEqual(field["camera_location"], description["Camera"].props["location"])
+        self.assertEqual(field["size"], description["AtmosphericDomain"].props["size"])
+        self.assertEqual(field["location"], description["AtmosphericDomain"].props["location"])
+
+    def test_reapplying_an_unchanged_description_is_a_no_op(self):
+        """
+        Tests that an identical description touches nothing.
+        """
+        self.reconciler.apply(build_scene_description(CONFIG, Q_STATE))
+        self.backend.operations.clear()
+        diff = self.reconciler.apply(build_scene_description(CONFIG, Q_STATE))
+        self.assertTrue(diff.is_empty())
+        self.assertEqual(self.backend.operations, [])
+        self.assertEqual(self.reconciler.timings, {})
+
+    def test_humidity_change_only_updates_particles(self):
+        """
+        Tests that changing the humidity coefficient rebuilds nothing but the particle system.
+        """
+        self.reconciler.apply(build_scene_description(CONFIG, Q_STATE))
+        self.backend.operations.clear()
+        config = copy.deepcopy(CONFIG)
+        config["environmental_atmosphere"]["humidity_coefficient"] = 0.3
+        self.reconciler.apply(build_scene_description(config, Q_STATE))
+        self.assertEqual(self.backend.operations, [("update", "AtmosphericParticles")])
+        self.assertEqual(self.backend.scene["AtmosphericParticles"].props["count"], 3000)
+
+    def test_changes_propagate_to_dependents(self):
+        """
+        Tests that a changed L_alpha_7 also refreshes the camera tracking the manifestation.
+        """
+        self.reconciler.apply(build_scene_description(CONFIG, Q_STATE))
+        self.backend.operations.clear()
+        self.reconciler.apply(build_scene_description(CONFIG, {"L_alpha_7": 2.0}))
+        self.assertEqual(self.backend.operations, [
+            ("update", "GME_V1_Manifestation"), ("update", "Camera"), ("update", "Render"),
+        ])
+
+    def test_rebuilt_dependencies_recreate_their_dependents(self):
+        """
+        Tests that a scattering model change rebuilds the domain and recreates its particle system.
+        """
+        self.backend.rebuild_kinds = {"atmosphere", "object"}
+        self.reconciler.apply(build_scene_description(CONFIG, Q_STATE))
+        self.backend.operations.clear()
+        config = copy.deepcopy(CONFIG)
+        config["environmental_atmosphere"]["scattering_model"] = "mie"
+        self.reconciler.apply(build_scene_description(config, Q_STATE))
+        self.assertEqual(self.backend.operations, [
+            ("remove", "AtmosphericDomain"), ("create", "AtmosphericDomain"),
+            ("remove", "AtmosphericParticles"), ("create", "AtmosphericParticles"),
+        ])
+        self.assertEqual(self.backend.links["AtmosphericParticles"]["AtmosphericDomain"], 2)
+
+        self.backend.operations.clear()
+        self.reconciler.apply(build_scene_description(config, {"L_alpha_7": 2.0}))
+        self.assertEqual(self.backend.operations, [
+            ("remove", "GME_V1_Manifestation"), ("create", "GME_V1_Manifestation"),
+            ("remove", "Camera"), ("create", "Camera"), ("remove", "Render"), ("create", "Render"),
+        ])
+
+    def test_removals_run_dependents_first(self):
+        """
+        Tests that removed nodes are taken down before the nodes they depend on.
+        """
+        description = {
+            "Base": SceneNode("material", "Base"),
+            "Mesh": SceneNode("object", "Mesh", {"material": "Base"}, depends=["Base"]),
+            "Light": SceneNode("light", "Light", {"energy": 10}),
+        }
+        self.reconciler.apply(description)
+        self.backend.operations.clear()
+        diff = self.reconciler.apply({"Light": description["Light"]})
+        self.assertEqual(diff.removed, ["Mesh", "Base"])
+        self.assertEqual(self.backend.operations, [("remove", "Mesh"), ("remove", "Base")])
+
+    def test_dependency_cycles_are_rejected(self):
+        """
+        Tests that a cyclic description raises a ValueError.
+        """
+        description = {
+            "A": SceneNode("object", "A", depends=["B"]),
+            "B": SceneNode("object", "B", depends=["A"]),
+        }
+        with self.assertRaises(ValueError):
+            dependency_order(description)
+
+    def test_description_round_trips_through_json(self):
+        """
+        Tests that a stored description diffs clean against a fresh build.
+        """
+        description = build_scene_description(CONFIG, Q_STATE)
+        restored = load_description(dump_description(description))
+        self.assertEqual(restored, description)
+        self.assertTrue(diff_scenes(restored, build_scene_description(CONFIG, Q_STATE)).is_empty())
+
+if __name__ == '__main__':
+    unittest.main()
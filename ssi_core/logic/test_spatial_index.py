@@ -0,0 +1,64 @@
+import unittest
+import numpy as np
+from ssi_core.logic.heuristic_interface import calculate_proximity
+from ssi_core.logic.spatial_index import DisplacementFieldIndex
+
+class TestDisplacementFieldIndex(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(3)
+        self.points = {i: tuple(v) for i, v in enumerate(rng.uniform(-10, 10, size=(500, 3)))}
+        self.index = DisplacementFieldIndex(cell_size=2.0)
+        self.index.insert_many(self.points.keys(), self.points.values())
+        # Based on the camera location in create_avatar.py
+        self.camera_focal_point = (0, -5, 1.5)
+
+    def _linear_scan(self):
+        hits = [(i, calculate_proximity(v, self.camera_focal_point)) for i, v in self.points.items()]
+        return sorted(hits, key=lambda hit: hit[1])
+
+    def test_query_nearest_matches_linear_scan(self):
+        """
+        Tests that k-nearest results and weighted distances match a full scan.
+        """
+        expected = self._linear_scan()[:10]
+        actual = self.index.query_nearest(self.camera_focal_point, k=10)
+        self.assertEqual([hit[0] for hit in actual], [hit[0] for hit in expected])
+        for (_, actual_distance), (_, expected_distance) in zip(actual, expected):
+            self.assertAlmostEqual(actual_distance, expected_distance, places=9)
+
+    def test_query_nearest_far_focal_point(self):
+        """
+        Tests that a focal point far outside the field still finds the nearest points.
+        """
+        far_point = (500, 500, 500)
+        expected = min(self.points, key=lambda i: calculate_proximity(self.points[i], far_point))
+        self.assertEqual(self.index.query_nearest(far_point, k=1)[0][0], expected)
+
+    def test_query_radius_matches_linear_scan(self):
+        """
+        Tests that the radius query returns exactly the points within the weighted radius.
+        """
+        radius = 8.0
+        expected = [hit for hit in self._linear_scan() if hit[1] <= radius]
+        actual = self.index.query_radius(self.camera_focal_point, radius)
+        self.assertEqual([hit[0] for hit in actual], [hit[0] for hit in expected])
+
+    def test_incremental_move_and_remove(self):
+        """
+        Tests that moved and removed points are reflected without a rebuild.
+        """
+        self.index.insert(0, self.camera_focal_point)
+        nearest_id, nearest_distance = self.index.query_nearest(self.camera_focal_point, k=1)[0]
+        self.assertEqual(nearest_id, 0)
+        self.assertAlmostEqual(nearest_distance, 0.0)
+
+        self.index.remove(0)
+        self.assertNotIn(0, self.index)
+        self.assertEqual(len(self.index), 499)
+        self.assertNotEqual(self.index.query_nearest(self.camera_focal_point, k=1)[0][0], 0)
+        with self.assertRaises(KeyError):
+            self.index.remove(0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import unittest
+import numpy as np
+from ssi_core.logic.spike_detector import CLEAR, SPIKE, BiometricSpikeMonitor, SpikeDetector
+
+class CountingTrigger:
+    def __init__(self):
+        self.activations = 0
+
+    def activate_soothing_mode(self):
+        self.activations += 1
+
+def synthetic_pulse(samples=5000, spikes=(1500, 3500), seed=5):
+    """A 1 kHz pulse trace with Gaussian noise and two short, sharp spikes."""
+    rng = np.random.default_rng(seed)
+    trace = 72 + rng.normal(0, 1.0, samples)
+    for start in spikes:
+        trace[start:start + 40] += 25
+    return trace
+
+class TestSpikeDetector(unittest.TestCase):
+
+    def test_streaming_detects_spikes_with_hysteresis(self):
+        """
+        Tests that each spike is reported once and cleared once.
+        """
+        detector = SpikeDetector()
+        events = [(i, e) for i, value in enumerate(synthetic_pulse()) if (e := detector.update(value))]
+        self.assertEqual([kind for _, kind in events], [SPIKE, CLEAR, SPIKE, CLEAR])
+        self.assertTrue(1500 <= events[0][0] < 1510)
+        self.assertTrue(3500 <= events[2][0] < 3510)
+
+    def test_single_outlier_is_not_confirmed(self):
+        """
+        Tests that a one-sample glitch does not trigger a spike.
+        """
+        trace = synthetic_pulse(spikes=())
+        trace[2000] += 50
+        detector = SpikeDetector()
+        self.assertFalse(any(detector.update(value) for value in trace))
+
+    def test_batch_replay_matches_streaming(self):
+        """
+        Tests that the NumPy replay yields the streaming events and state, across chunks and calls.
+        """
+        trace = synthetic_pulse()
+        streaming = SpikeDetector()
+        expected = [(i, e) for i, value in enumerate(trace) if (e := streaming.update(value))]
+
+        batch = SpikeDetector()
+        first = batch.process_array(trace[:2600])
+        second = [(i + 2600, e) for i, e in batch.process_array(trace[2600:])]
+        self.assertEqual(first + second, expected)
+        self.assertAlmostEqual(batch.mean, streaming.mean, places=6)
+        self.assertAlmostEqual(batch.variance, streaming.variance, places=6)
+        self.assertEqual(batch.in_spike, streaming.in_spike)
+
+    def test_ewma_recurrence_across_chunks(self):
+        """
+        Tests the chunked vectorized recurrence against a plain loop.
+        """
+        detector = SpikeDetector(alpha=0.2)
+        inputs = np.random.default_rng(1).normal(size=1000)
+        self.assertLess(detector._chunk_length(), 200)
+        expected = []
+        previous = 3.0
+        for u in inputs:
+            previous = 0.8 * previous + u
+            expected.append(previous)
+        np.testing.assert_allclose(detector._ewma_recurrence(3.0, inputs), expected, rtol=1e-9, atol=1e-12)
+
+    def test_monitor_soothes_on_confirmed_spikes(self):
+        """
+        Tests that the monitor soothes once per confirmed spike and honours the stress threshold.
+        """
+        trigger = CountingTrigger()
+        monitor = BiometricSpikeMonitor(trigger, pulse_detector=SpikeDetector())
+        stress = np.full(5000, 3.0)
+        stress[4000:4010] = 9.0
+        stress[4010:4020] = 7.5  # Between the exit and enter levels: no flapping.
+        events = monitor.replay(pulse=synthetic_pulse(), stress_level=stress)
+        self.assertEqual(trigger.activations, 3)
+        self.assertEqual([kind for _, kind in events["stress_level"]], [SPIKE, CLEAR])
+        self.assertEqual(events["stress_level"][1][0], 4020)
+
+        for _ in range(10):
+            monitor.feed(pulse=72.0, stress_level=9.5)
+        self.assertEqual(trigger.activations, 4)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,172 @@
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+from ssi_core.logic.sensory_input import StarlightVisualCortex
+from ssi_core.logic.telemetry_ingest import TelemetryIngestor, read_pipe_batches
+
+class RecordingEngine:
+    def __init__(self):
+        self.states = []
+
+    def update_studio_state(self, state):
+        self.states.append(state)
+
+class FailingEngine:
+    def update_studio_state(self, state):
+        raise RuntimeError("engine offline")
+
+def telemetry_line(lighting, status="online", device_id=None):
+    data = {"lighting_levels": lighting, "device_status": status, "connectivity": "wifi"}
+    if device_id is not None:
+        data["device_id"] = device_id
+    return (json.dumps(data) + "\n").encode()
+
+async def from_list(lines, batch_size=3):
+    for start in range(0, len(lines), batch_size):
+        yield lines[start:start + batch_size]
+
+class TestTelemetryIngestor(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = RecordingEngine()
+        self.cortex = StarlightVisualCortex()
+        self.cortex.connect_to_affective_engine(self.engine)
+
+    def test_unchanged_states_are_coalesced(self):
+        """
+        Tests that only state changes reach the Affective Engine and bad lines are counted.
+        """
+        lines = [telemetry_line(0.8)] * 5 + [b"{not json\n", b"{not json\n", b"[1, 2]\n", b"\n"] + [telemetry_line(0.4)] * 3
+        ingestor = TelemetryIngestor(self.cortex, queue_size=4)
+        report = asyncio.run(ingestor.ingest(from_list(lines)))
+        self.assertEqual([s["lighting"] for s in self.engine.states], [0.8, 0.4])
+        self.assertEqual(report["parse_errors"], 3)
+        self.assertEqual(report["coalesced"], 6)
+        self.assertEqual(report["forwarded"], 2)
+        self.assertEqual(report["dropped"], 0)
+
+    def test_debounce_forwards_latest_state(self):
+        """
+        Tests that a burst of changes inside the debounce window forwards only the latest.
+        """
+        lines = [telemetry_line(level / 10) for level in range(10)]
+        ingestor = TelemetryIngestor(self.cortex, debounce_seconds=60)
+        asyncio.run(ingestor.ingest(from_list(lines)))
+        self.assertEqual([s["lighting"] for s in self.engine.states], [0.0, 0.9])
+
+    def test_devices_are_debounced_separately(self):
+        """
+        Tests that two devices changing inside one debounce window each forward their latest state.
+        """
+        lines = [telemetry_line(0.1, device_id="a"), telemetry_line(0.9, device_id="b"),
+                 telemetry_line(0.2, device_id="a"), telemetry_line(0.8, device_id="b"),
+                 telemetry_line(0.3, device_id="a")]
+        ingestor = TelemetryIngestor(self.cortex, debounce_seconds=60)
+        report = asyncio.run(ingestor.ingest(from_list(lines)))
+        forwarded = [(s["device_id"], s["lighting"]) for s in self.engine.states]
+        self.assertEqual(sorted(forwarded), [("a", 0.1), ("a", 0.3), ("b", 0.8), ("b", 0.9)])
+        self.assertEqual(report["coalesced"], 1)
+
+    def test_alternating_devices_still_coalesce(self):
+        """
+        Tests that unchanged states are coalesced per device when devices interleave.
+        """
+        lines = [telemetry_line(0.5, device_id="a"), telemetry_line(0.5, device_id="b")] * 4
+        report = asyncio.run(TelemetryIngestor(self.cortex).ingest(from_list(lines)))
+        self.assertEqual(report["forwarded"], 2)
+        self.assertEqual(report["coalesced"], 6)
+
+    def test_drop_when_full(self):
+        """
+        Tests that a full queue drops lines instead of blocking when configured to.
+        """
+        async def burst():
+            ingestor = TelemetryIngestor(self.cortex, queue_size=2, drop_when_full=True)
+            ingestor._queue = asyncio.Queue(maxsize=2)
+            for level in range(5):
+                await ingestor._enqueue([telemetry_line(level)])
+            return ingestor.stats
+
+        stats = asyncio.run(burst())
+        self.assertEqual(stats["received"], 5)
+        self.assertEqual(stats["dropped"], 3)
+
+    def test_ingest_file(self):
+        """
+        Tests file ingestion and the messages/sec report.
+        """
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "telemetry.ndjson")
+            with open(path, "wb") as f:
+                for i in range(100):
+                    f.write(telemetry_line(i // 10))
+            report = asyncio.run(TelemetryIngestor(self.cortex).ingest_file(path, batch_bytes=512))
+        self.assertEqual(report["processed"], 100)
+        self.assertEqual(report["forwarded"], 10)
+        self.assertGreater(report["messages_per_second"], 0)
+
+    def test_failing_engine_does_not_stall_ingestion(self):
+        """
+        Tests that an engine that raises is counted instead of killing the consumer and blocking the reader.
+        """
+        self.cortex.connect_to_affective_engine(FailingEngine())
+        lines = [telemetry_line(level) for level in range(10)]
+        ingestor = TelemetryIngestor(self.cortex, queue_size=2)
+
+        async def ingest():
+            return await asyncio.wait_for(ingestor.ingest(from_list(lines, batch_size=1)), 5)
+
+        report = asyncio.run(ingest())
+        self.assertEqual(report["processed"], 10)
+        self.assertEqual(report["errors"], 10)
+        self.assertIsInstance(ingestor.last_error, RuntimeError)
+
+    def test_serve_unix_survives_a_failing_engine(self):
+        """
+        Tests that socket ingestion keeps consuming when the engine raises.
+        """
+        self.cortex.connect_to_affective_engine(FailingEngine())
+        ingestor = TelemetryIngestor(self.cortex, queue_size=2)
+
+        async def serve_and_send(socket_path):
+            server = asyncio.ensure_future(ingestor.serve_unix(socket_path))
+            try:
+                while not os.path.exists(socket_path):
+                    await asyncio.sleep(0.01)
+                _, writer = await asyncio.open_unix_connection(socket_path)
+                for level in range(10):
+                    writer.write(telemetry_line(level))
+                await writer.drain()
+                writer.close()
+                while ingestor.stats["processed"] < 10:
+                    await asyncio.sleep(0.01)
+            finally:
+                server.cancel()
+
+        with tempfile.TemporaryDirectory() as tmp:
+            asyncio.run(asyncio.wait_for(serve_and_send(os.path.join(tmp, "telemetry.sock")), 5))
+        self.assertEqual(ingestor.stats["errors"], 10)
+
+    def test_pipe_batches_arrive_without_waiting_for_a_full_batch(self):
+        """
+        Tests that lines written to a pipe are yielded before batch_bytes accumulate or the writer closes.
+        """
+        read_fd, write_fd = os.pipe()
+
+        async def read_while_writing():
+            batches = read_pipe_batches(os.fdopen(read_fd, "rb"), batch_bytes=64 * 1024)
+            os.write(write_fd, telemetry_line(1) + telemetry_line(2) + b'{"lighting')
+            first = await asyncio.wait_for(batches.__anext__(), 5)
+            os.write(write_fd, b'_levels": 3}\n')
+            os.close(write_fd)
+            rest = [batch async for batch in batches]
+            return first, rest
+
+        first, rest = asyncio.run(read_while_writing())
+        self.assertEqual(first, [telemetry_line(1), telemetry_line(2)])
+        self.assertEqual(rest, [[b'{"lighting_levels": 3}\n']])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+import asyncio
+import json
+import unittest
+from ssi_core.logic.sensory_input import StarlightVisualCortex
+from ssi_core.logic.telemetry_ingest import TelemetryIngestor
+from ssi_core.logic.telemetry_rollup import RollingWindow, TelemetryRollupStore
+
+class TestTelemetryRollup(unittest.TestCase):
+
+    def test_rolling_window_expires_old_samples(self):
+        """
+        Tests min/max/mean over a window and that samples age out of it.
+        """
+        window = RollingWindow(60, buckets=6)
+        for second, value in enumerate([5.0, 1.0, 9.0, 3.0]):
+            window.add(1000 + second, value)
+        stats = window.stats(now=1003)
+        self.assertEqual(stats, {"count": 4, "min": 1.0, "max": 9.0, "mean": 4.5})
+        self.assertEqual(window.stats(now=1200)["count"], 0)
+        self.assertIsNone(window.stats(now=1200)["mean"])
+
+    def test_late_sample_does_not_wipe_a_newer_bucket(self):
+        """
+        Tests that an out-of-order sample older than its slot's bucket is dropped.
+        """
+        window = RollingWindow(60, buckets=6)
+        window.add(1000, 5.0)
+        window.add(1001, 7.0)
+        window.add(940, 100.0)  # Same slot as 1000, one full window earlier.
+        self.assertEqual(window.stats(now=1001), {"count": 2, "min": 5.0, "max": 7.0, "mean": 6.0})
+
+    def test_memory_stays_flat(self):
+        """
+        Tests that a long stream of samples never grows the ring buffers.
+        """
+        window = RollingWindow(10, buckets=10)
+        sizes = (len(window._count), len(window._total))
+        for i in range(50_000):
+            window.add(i * 0.01, float(i % 7))
+        self.assertEqual((len(window._count), len(window._total)), sizes)
+        stats = window.stats(now=499.99)
+        self.assertEqual(stats["min"], 0.0)
+        self.assertEqual(stats["max"], 6.0)
+        self.assertLessEqual(stats["count"], 1000)
+
+    def test_lighting_trend_and_last_change(self):
+        """
+        Tests that dimming lighting shows a negative trend and state changes are timestamped.
+        """
+        store = TelemetryRollupStore(windows=(600,), buckets=10)
+        for minute in range(10):
+            store.update_studio_state({"lighting": 1.0 - minute * 0.1, "device_status": "online",
+                                       "connectivity": "wifi"}, timestamp=60.0 * minute)
+        store.update_studio_state({"lighting": 0.1, "device_status": "offline", "connectivity": "wifi"},
+                                  timestamp=590.0)
+        self.assertLess(store.lighting_trend(600, now=599.0), -0.5)
+        self.assertEqual(store.last_change("device_status"), 590.0)
+        self.assertEqual(store.last_change("connectivity"), 0.0)
+        self.assertAlmostEqual(store.lighting_stats(600, now=599.0)["min"], 0.1)
+
+    def test_store_as_affective_engine(self):
+        """
+        Tests that the store can sit between the cortex and a downstream engine.
+        """
+        forwarded = []
+
+        class Engine:
+            def update_studio_state(self, state):
+                forwarded.append(state)
+
+        store = TelemetryRollupStore(downstream=Engine(), clock=lambda: 100.0)
+        cortex = StarlightVisualCortex()
+        cortex.connect_to_affective_engine(store)
+        cortex.process_telemetry('{"lighting_levels": 0.7, "device_status": "online", "connectivity": "wifi"}')
+        self.assertEqual(forwarded[0]["lighting"], 0.7)
+        self.assertEqual(store.lighting_stats(60)["mean"], 0.7)
+
+    def test_devices_are_kept_apart(self):
+        """
+        Tests that the telemetry's device_id reaches the store through both the cortex and the ingestor.
+        """
+        store = TelemetryRollupStore(clock=lambda: 100.0)
+        cortex = StarlightVisualCortex()
+        cortex.connect_to_affective_engine(store)
+        cortex.process_telemetry('{"device_id": "cam-1", "lighting_levels": 0.2}')
+
+        async def lines():
+            yield [json.dumps({"device_id": "cam-2", "lighting_levels": 0.9}).encode(),
+                   json.dumps({"lighting_levels": 0.5}).encode()]
+
+        asyncio.run(TelemetryIngestor(cortex).ingest(lines()))
+        self.assertEqual(store.lighting_stats(60, device_id="cam-1")["mean"], 0.2)
+        self.assertEqual(store.lighting_stats(60, device_id="cam-2")["mean"], 0.9)
+        self.assertEqual(store.lighting_stats(60)["mean"], 0.5)
+        self.assertNotIn("device_id", store.devices["cam-1"].state)
+
+    def test_every_numeric_field_is_rolled_up(self):
+        """
+        Tests that numeric fields other than lighting get windowed stats and trends too.
+        """
+        store = TelemetryRollupStore(windows=(60,), buckets=6)
+        store.update_studio_state({"temperature": 21.0, "device_status": "online"}, timestamp=0.0)
+        store.update_studio_state({"temperature": 23.0, "device_status": "online"}, timestamp=30.0)
+        self.assertEqual(store.stats("temperature", 60, now=30.0)["mean"], 22.0)
+        self.assertEqual(store.trend("temperature", 60, now=30.0), 2.0)
+        self.assertEqual(store.stats("device_status", 60, now=30.0)["count"], 0)
+
+    def test_unknown_device_reads_empty(self):
+        """
+        Tests that a device that has not reported yet reads like an empty channel instead of raising.
+        """
+        store = TelemetryRollupStore(clock=lambda: 100.0)
+        self.assertEqual(store.lighting_stats(60, device_id="cam-9"),
+                         {"count": 0, "min": None, "max": None, "mean": None})
+        self.assertIsNone(store.lighting_trend(60, device_id="cam-9"))
+        self.assertIsNone(store.last_change("lighting", device_id="cam-9"))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,183 @@
+import cProfile
+import datetime
+import functools
+import json
+import os
+import threading
+import time
+
+DEFAULT_PROFILE_DIR = os.path.join("quantum_cache", "profiles")
+
+# SSI_PROFILE=1 (or a .jsonl path) records stage spans; SSI_CPROFILE=1 also captures cProfile stats.
+PROFILE_ENV = "SSI_PROFILE"
+CPROFILE_ENV = "SSI_CPROFILE"
+
+_recorder = None
+
+class _NullSpan:
+    """The span handed out while profiling is disabled: it does nothing."""
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def add(self, **fields):
+        pass
+
+_NULL_SPAN = _NullSpan()
+
+class Span:
+    """One timed pipeline stage. Extra fields can be attached while it runs with add()."""
+    def __init__(self, recorder, name, fields):
+        self.recorder = recorder
+        self.name = name
+        self.fields = fields
+
+    def add(self, **fields):
+        self.fields.update(fields)
+
+    def __enter__(self):
+        stack = self.recorder._stack()
+        self.parent = stack[-1].name if stack else None
+        self.depth = len(stack)
+        stack.append(self)
+        self.wall_start = time.time()
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        seconds = time.perf_counter() - self.started
+        self.recorder._stack().pop()
+        self.recorder._record(self, seconds, exc_type)
+        return False
+
+class SpanRecorder:
+    """
+    Collects stage spans into a JSONL file, one record per finished span
+    (name, parent, depth, start, seconds, error and any extra fields), and
+    appends a per-stage summary of counts and durations on close. With
+    profile=True the whole recording is also run under cProfile and the
+    stats are dumped next to the JSONL file as a .prof file.
+    """
+    def __init__(self, path=None, profile=False):
+        if path is None:
+            timestamp = datetime.datetime.now().strftime("%Y%m%d%H%M%S")
+            path = os.path.join(DEFAULT_PROFILE_DIR, f"profile_{timestamp}_{os.getpid()}.jsonl")
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(path, "a")
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.stages = {}  # name -> {"count", "total", "max"}
+        self.profile_path = None
+        self._profiler = None
+        if profile:
+            self.profile_path = os.path.splitext(path)[0] + ".prof"
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+
+    def _stack(self):
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def span(self, name, **fields):
+        return Span(self, name, fields)
+
+    def _record(self, span, seconds, exc_type):
+        record = {"type": "span", "name": span.name, "parent": span.parent, "depth": span.depth,
+                  "start": span.wall_start, "seconds": seconds, "thread": threading.current_thread().name}
+        if exc_type is not None:
+            record["error"] = exc_type.__name__
+        record.update(span.fields)
+        line = json.dumps(record, default=str) + "\n"
+        with self._lock:
+            stage = self.stages.setdefault(span.name, {"count": 0, "total": 0.0, "max": 0.0})
+            stage["count"] += 1
+            stage["total"] += seconds
+            stage["max"] = max(stage["max"], seconds)
+            self._file.write(line)
+
+    def close(self):
+        """Writes the per-stage summary, dumps any cProfile stats and closes the file."""
+        if self._profiler is not None:
+            self._profiler.disable()
+            self._profiler.dump_stats(self.profile_path)
+            self._profiler = None
+        with self._lock:
+            if self._file.closed:
+                return
+            self._file.write(json.dumps({"type": "summary", "stages": self.stages}) + "\n")
+            self._file.close()
+
+def span(name, **fields):
+    """
+    Times a pipeline stage: `with span("render", frames=1): ...`. While
+    profiling is disabled this returns a shared no-op context manager.
+    """
+    recorder = _recorder
+    if recorder is None:
+        return _NULL_SPAN
+    return recorder.span(name, **fields)
+
+def timed(name=None):
+    """Decorator form of span(); the stage name defaults to module.function."""
+    def decorator(func):
+        stage = name or f"{func.__module__}.{func.__qualname__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            recorder = _recorder
+            if recorder is None:
+                return func(*args, **kwargs)
+            with recorder.span(stage):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def enabled():
+    return _recorder is not None
+
+def enable(path=None, profile=False):
+    """Starts recording spans (closing any previous recorder) and returns the recorder."""
+    global _recorder
+    disable()
+    _recorder = SpanRecorder(path, profile)
+    return _recorder
+
+def disable():
+    """Stops recording and finalizes the output files. Returns the closed recorder, if any."""
+    global _recorder
+    recorder, _recorder = _recorder, None
+    if recorder is not None:
+        recorder.close()
+    return recorder
+
+def enable_from_environment(argv=(), environ=None):
+    """
+    Enables profiling when requested by the SSI_PROFILE / SSI_CPROFILE
+    environment variables or the --profile[=PATH] / --cprofile flags in
+    argv. SSI_PROFILE may be "1" (default path under quantum_cache/profiles)
+    or the JSONL path to write. Returns the recorder, or None when not
+    requested.
+    """
+    environ = os.environ if environ is None else environ
+    value = environ.get(PROFILE_ENV, "")
+    requested = value not in ("", "0")
+    path = value if requested and value != "1" else None
+    profile = environ.get(CPROFILE_ENV, "") not in ("", "0")
+    for arg in argv:
+        if arg == "--profile":
+            requested = True
+        elif arg.startswith("--profile="):
+            requested = True
+            path = arg.split("=", 1)[1]
+        elif arg == "--cprofile":
+            profile = True
+    if not (requested or profile):
+        return None
+    return enable(path, profile)
@@ -1,16 +1,23 @@
 import json
 import time
 
+from ssi_core.profiling import span, timed
+from ssi_core.tensor_payload import TensorPayload, is_tensor_payload_file, open_tensor_payload
+
+@timed("package_tensor_for_visualization")
 def package_tensor_for_visualization(tensor_data):
     """
     Packages tensor data for visualization, including metadata for
-    the synthetic material stress-testing simulation.
+    the synthetic material stress-testing simulation. tensor_data is either
+    a JSON-style dict or a binary TensorPayload, which is carried as is
+    (its buffers are never copied).
     """
     header = {
         "protocol": "Synthetic-Material-Stress-Test",
         "carrier": "Internal-Research",
         "timestamp": time.time(),
-        "payload_type": "Tensor-Data"
+        "payload_type": "Tensor-Data",
+        "payload_format": "binary" if isinstance(tensor_data, TensorPayload) else "json"
     }
     packaged_data = {
         "header": header,
@@ -25,25 +32,37 @@ def package_tensor_for_visualization(tensor_data):
 def establish_eden_ppl_conduit(packaged_data, visualization_callback):
     """
     Establishes a secure conduit for data visualization.
-    Extracts and processes the tensor data payload.
+    Extracts and processes the tensor data payload. A binary payload reaches
+    the callback as a TensorPayload whose tensors are zero-copy NumPy views.
     """
     print("Secure Conduit: Established. Processing tensor data.")
     if packaged_data.get("header", {}).get("payload_type") == "Tensor-Data":
         tensor_data = packaged_data["payload"]
-        visualization_callback(tensor_data)
+        with span("visualization_callback", payload_format=packaged_data["header"].get("payload_format")):
+            visualization_callback(tensor_data)
     else:
         print("Conduit Error: Invalid payload type.")
 
 def initiate_safety_protocol(visualization_callback, config_path="avatar_config.json"):
     """
-    Initiates the data packaging and visualization pipeline.
+    Initiates the data packaging and visualization pipeline. config_path may
+    be a JSON config or a binary tensor payload file, which is memory-mapped
+    rather than read.
     """
     print("Pipeline Initiated: Preparing tensor data for visualization.")
-    with open(config_path, 'r') as f:
-        config = json.load(f)
+    with span("initiate_safety_protocol", config_path=config_path):
+        if is_tensor_payload_file(config_path):
+            with open_tensor_payload(config_path) as tensor_data:
+                packaged_data = package_tensor_for_visualization(tensor_data)
+                establish_eden_ppl_conduit(packaged_data, visualization_callback)
+            return
+
+        with span("load_config"):
+            with open(config_path, 'r') as f:
+                config = json.load(f)
 
-    # The tensor data is loaded from the config file.
-    tensor_data = config
+        # The tensor data is loaded from the config file.
+        tensor_data = config
 
-    packaged_data = package_tensor_for_visualization(tensor_data)
-    establish_eden_ppl_conduit(packaged_data, visualization_callback)
+        packaged_data = package_tensor_for_visualization(tensor_data)
+        establish_eden_ppl_conduit(packaged_data, visualization_callback)
@@ -1,15 +1,20 @@
 import bpy
+import numpy as np
+
+from ssi_core.logic.gme_core import mesh_from_arrays
+from ssi_core.logic.mesh_cache import default_mesh_cache
+from ssi_core.profiling import timed
 
 def _create_halo_object():
     """
     Creates a small icosphere object to be used as a halo particle.
+    The geometry comes from the on-disk mesh cache.
     """
-    bpy.ops.mesh.primitive_ico_sphere_add(radius=0.01, subdivisions=2)
-    halo_obj = bpy.context.object
-    halo_obj.name = "HaloParticleObject"
+    vertices, faces = default_mesh_cache().icosphere(subdivisions=2, radius=0.01)
+    halo_obj = mesh_from_arrays("HaloParticleObject", vertices, faces)
     return halo_obj
 
-def _create_halo_material():
+def _create_halo_material(emission_strength=10.0, mix_factor=0.8):
     """
     Creates an emissive, transparent material for the halo object.
     """
@@ -23,14 +28,14 @@ def _create_halo_material():
 
     # Mix shader for transparency
     node_mix_shader = nodes.new(type='ShaderNodeMixShader')
-    node_mix_shader.inputs['Fac'].default_value = 0.8  # Mostly transparent
+    node_mix_shader.inputs['Fac'].default_value = mix_factor  # Mostly transparent
 
     # Transparent BSDF
     node_transparent = nodes.new(type='ShaderNodeBsdfTransparent')
 
     # Emission shader for the halo glow
     node_emission = nodes.new(type='ShaderNodeEmission')
-    node_emission.inputs['Strength'].default_value = 10.0
+    node_emission.inputs['Strength'].default_value = emission_strength
     node_emission.inputs['Color'].default_value = (1.0, 0.9, 0.7, 1.0)
 
     node_output = nodes.new(type='ShaderNodeOutputMaterial')
@@ -42,12 +47,13 @@ def _create_halo_material():
 
     return mat
 
-def setup_atmosphere(humidity_coefficient, scattering_model):
+@timed("atmosphere.create_domain")
+def _create_atmospheric_domain(scattering_model, size=20, location=(0, 0, 10), density=0.02):
     """
-    Initializes a volumetric atmospheric simulation in the scene.
+    Creates the volumetric domain cube and its scattering material.
     """
     # --- Volumetric Domain Setup ---
-    bpy.ops.mesh.primitive_cube_add(size=20, location=(0, 0, 10))
+    bpy.ops.mesh.primitive_cube_add(size=size, location=location)
     domain = bpy.context.object
     domain.name = "AtmosphericDomain"
 
@@ -60,7 +66,7 @@ def setup_atmosphere(humidity_coefficient, scattering_model):
         nodes.remove(node)
 
     node_scatter = nodes.new(type='ShaderNodeVolumeScatter')
-    node_scatter.inputs['Density'].default_value = 0.02
+    node_scatter.inputs['Density'].default_value = density
 
     if scattering_model == "rayleigh":
         node_scatter.inputs['Color'].default_value = (0.3, 0.4, 0.8, 1.0)
@@ -72,12 +78,13 @@ def setup_atmosphere(humidity_coefficient, scattering_model):
     links.new(node_scatter.outputs['Volume'], node_output.inputs['Volume'])
 
     domain.data.materials.append(mat)
+    return domain
 
-    # --- Particle Physics Simulation ---
-    halo_obj = _create_halo_object()
-    halo_mat = _create_halo_material()
-    halo_obj.data.materials.append(halo_mat)
-
+@timed("atmosphere.add_particles")
+def _add_atmospheric_particles(domain, halo_obj, count):
+    """
+    Adds the halo particle system to the domain and returns its settings.
+    """
     # Set the domain as the active object before adding the particle system
     bpy.context.view_layer.objects.active = domain
     bpy.ops.object.particle_system_add()
@@ -85,7 +92,7 @@ def setup_atmosphere(humidity_coefficient, scattering_model):
     settings = particle_system.settings
     settings.name = "AtmosphericParticles"
 
-    settings.count = int(10000 * humidity_coefficient)
+    settings.count = count
     settings.frame_start = 1
     settings.frame_end = 1
     settings.lifetime = 1000
@@ -93,5 +100,80 @@ def setup_atmosphere(humidity_coefficient, scattering_model):
 
     settings.render_type = 'OBJECT'
     settings.instance_object = halo_obj
+    return settings
+
+# Point attributes carrying each particle's rotation and scale to the instancer.
+PARTICLE_ROTATION_ATTRIBUTE = "particle_rotation"
+PARTICLE_SCALE_ATTRIBUTE = "particle_scale"
+
+def _particle_instance_node_group(halo_obj, name):
+    """
+    Builds a geometry nodes group that places halo_obj on every point of
+    its input, rotated and scaled by the per-point particle attributes.
+    """
+    tree = bpy.data.node_groups.new(name, 'GeometryNodeTree')
+    tree.interface.new_socket("Geometry", in_out='INPUT', socket_type='NodeSocketGeometry')
+    tree.interface.new_socket("Geometry", in_out='OUTPUT', socket_type='NodeSocketGeometry')
+    nodes = tree.nodes
+
+    group_input = nodes.new('NodeGroupInput')
+    group_output = nodes.new('NodeGroupOutput')
+    instance_on_points = nodes.new('GeometryNodeInstanceOnPoints')
+    object_info = nodes.new('GeometryNodeObjectInfo')
+    object_info.inputs['Object'].default_value = halo_obj
+    rotation = nodes.new('GeometryNodeInputNamedAttribute')
+    rotation.data_type = 'FLOAT_VECTOR'
+    rotation.inputs['Name'].default_value = PARTICLE_ROTATION_ATTRIBUTE
+    scale = nodes.new('GeometryNodeInputNamedAttribute')
+    scale.data_type = 'FLOAT'
+    scale.inputs['Name'].default_value = PARTICLE_SCALE_ATTRIBUTE
+
+    links = tree.links
+    links.new(group_input.outputs['Geometry'], instance_on_points.inputs['Points'])
+    links.new(object_info.outputs['Geometry'], instance_on_points.inputs['Instance'])
+    links.new(rotation.outputs['Attribute'], instance_on_points.inputs['Rotation'])
+    links.new(scale.outputs['Attribute'], instance_on_points.inputs['Scale'])
+    links.new(instance_on_points.outputs['Instances'], group_output.inputs['Geometry'])
+    return tree
+
+def _instance_particle_field(field, halo_obj, name="AtmosphericParticleCloud"):
+    """
+    Instances the halo object on every particle of a precomputed field (see
+    ssi_core.simulation.particle_field), keeping each particle's rotation
+    and scale, so the LOD scale compensation reaches the render. The points
+    and their rotation/scale attributes are pushed into Blender with bulk
+    foreach_set calls and instanced by a geometry nodes modifier. The
+    original halo object is hidden from the render.
+    """
+    cloud = mesh_from_arrays(name, field["location"], np.empty((0, 3), dtype=np.int32))
+    attributes = cloud.data.attributes
+    rotation = attributes.new(PARTICLE_ROTATION_ATTRIBUTE, 'FLOAT_VECTOR', 'POINT')
+    rotation.data.foreach_set("vector", np.ascontiguousarray(field["rotation"], dtype=np.float32).ravel())
+    scale = attributes.new(PARTICLE_SCALE_ATTRIBUTE, 'FLOAT', 'POINT')
+    scale.data.foreach_set("value", np.ascontiguousarray(field["scale"], dtype=np.float32))
+
+    modifier = cloud.modifiers.new("ParticleInstances", 'NODES')
+    modifier.node_group = _particle_instance_node_group(halo_obj, f"{name}_Instances")
+    halo_obj.hide_render = True
+    return cloud
+
+@timed("setup_atmosphere")
+def setup_atmosphere(humidity_coefficient, scattering_model, particle_field=None):
+    """
+    Initializes a volumetric atmospheric simulation in the scene. When a
+    precomputed particle_field is given, the halos are instanced on its
+    points instead of being scattered by Blender's particle system.
+    """
+    domain = _create_atmospheric_domain(scattering_model)
+
+    # --- Particle Physics Simulation ---
+    halo_obj = _create_halo_object()
+    halo_mat = _create_halo_material()
+    halo_obj.data.materials.append(halo_mat)
+
+    if particle_field is not None:
+        _instance_particle_field(particle_field, halo_obj)
+    else:
+        _add_atmospheric_particles(domain, halo_obj, int(10000 * humidity_coefficient))
 
     print("Atmospheric Density Fluctuations")
@@ -0,0 +1,125 @@
+import hashlib
+import json
+import math
+import os
+import tempfile
+
+import numpy as np
+
+from ssi_core.logic.heuristic_interface import calculate_proximity_batch
+
+# One instance transform per particle, matching Blender's location/rotation_euler/scale.
+PARTICLE_DTYPE = np.dtype([("location", "<f4", 3), ("rotation", "<f4", 3), ("scale", "<f4")])
+
+# Particles generated per chunk. Each chunk draws from its own seeded stream,
+# so a given (seed, chunk_size) always reproduces the same field.
+PARTICLE_CHUNK_SIZE = 65536
+
+DEFAULT_FIELD_DIR = os.path.join("quantum_cache", "particle_fields")
+
+# Bump whenever generated fields change, so cached field files are regenerated.
+FIELD_VERSION = 1
+
+# Camera-distance LOD defaults, in L_ALPHA_7-weighted units (see
+# heuristic_interface.calculate_proximity_batch). They span the 20-unit
+# AtmosphericDomain as seen from the create_avatar camera.
+LOD_NEAR = 8.0
+LOD_FAR = 40.0
+LOD_MIN_FRACTION = 0.1
+
+def lod_keep_probability(distances, near=LOD_NEAR, far=LOD_FAR, min_fraction=LOD_MIN_FRACTION):
+    """
+    Returns the fraction of particles kept at each weighted camera distance:
+    everything inside near, falling linearly to min_fraction at far and beyond.
+    """
+    if far <= near:
+        raise ValueError("far must be greater than near.")
+    t = np.clip((np.asarray(distances, dtype=np.float64) - near) / (far - near), 0.0, 1.0)
+    return 1.0 - t * (1.0 - min_fraction)
+
+def iter_particle_chunks(count, size=20, location=(0, 0, 10), seed=0, camera_location=None,
+                         near=LOD_NEAR, far=LOD_FAR, min_fraction=LOD_MIN_FRACTION,
+                         base_scale=1.0, scale_jitter=0.25, chunk_size=PARTICLE_CHUNK_SIZE):
+    """
+    Generates instance transforms for count particles inside the cube of the
+    given size centred on location (the AtmosphericDomain), yielding one
+    PARTICLE_DTYPE array per chunk.
+
+    Placement is stratified: the cube is split into a grid of at least count
+    cells, particles are spread evenly over the cells and jittered within
+    them, so there are no clumps or empty pockets. When camera_location is
+    given, particles are thinned with lod_keep_probability of their weighted
+    distance and the survivors are scaled up to keep the apparent density.
+    """
+    if count < 0:
+        raise ValueError("count must not be negative.")
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be a positive integer.")
+    cells_per_axis = max(1, math.ceil(round(count ** (1.0 / 3.0), 9)))
+    total_cells = cells_per_axis ** 3
+    origin = np.asarray(location, dtype=np.float64) - size / 2.0
+    cell_size = size / cells_per_axis
+
+    for chunk_index, start in enumerate(range(0, count, chunk_size)):
+        rng = np.random.default_rng([seed, chunk_index])
+        n = min(chunk_size, count - start)
+        cells = np.arange(start, start + n, dtype=np.int64) * total_cells // count
+        grid = np.stack(np.unravel_index(cells, (cells_per_axis,) * 3), axis=1)
+        locations = origin + (grid + rng.random((n, 3))) * cell_size
+        rotations = rng.random((n, 3)) * (2.0 * math.pi)
+        scales = base_scale * (1.0 + scale_jitter * (2.0 * rng.random(n) - 1.0))
+
+        if camera_location is not None:
+            keep_probability = lod_keep_probability(
+                calculate_proximity_batch(locations, camera_location), near, far, min_fraction)
+            keep = rng.random(n) < keep_probability
+            locations, rotations = locations[keep], rotations[keep]
+            # Compensate for thinning by growing survivors in volume.
+            scales = scales[keep] * keep_probability[keep] ** (-1.0 / 3.0)
+
+        chunk = np.empty(len(locations), dtype=PARTICLE_DTYPE)
+        chunk["location"] = locations
+        chunk["rotation"] = rotations
+        chunk["scale"] = scales
+        yield chunk
+
+def generate_particle_field(path, count, **options):
+    """
+    Streams iter_particle_chunks(count, **options) to a flat binary file of
+    PARTICLE_DTYPE records, one chunk at a time so memory stays bounded for
+    millions of particles, and returns it memory-mapped. The file is
+    replaced atomically, so readers never see a half-written field. Each
+    writer stages into its own temporary file, so concurrent workers baking
+    the same field never mix their bytes.
+    """
+    descriptor, staging_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", prefix=".staging-")
+    try:
+        with os.fdopen(descriptor, "wb") as f:
+            for chunk in iter_particle_chunks(count, **options):
+                chunk.tofile(f)
+        os.replace(staging_path, path)
+    except BaseException:
+        if os.path.exists(staging_path):
+            os.remove(staging_path)
+        raise
+    return load_particle_field(path)
+
+def load_particle_field(path):
+    """Returns a read-only memory-mapped view of a particle field file."""
+    if os.path.getsize(path) == 0:
+        return np.empty(0, dtype=PARTICLE_DTYPE)
+    return np.memmap(path, dtype=PARTICLE_DTYPE, mode="r")
+
+def cached_particle_field(count, field_dir=DEFAULT_FIELD_DIR, **options):
+    """
+    Returns the memory-mapped field for (count, options), generating it into
+    field_dir only the first time. Files are named by a hash of the
+    parameters, so scene rebuilds reuse the field instead of regenerating it.
+    """
+    canonical = json.dumps({"count": int(count), "options": options, "version": FIELD_VERSION},
+                           sort_keys=True, separators=(",", ":"))
+    path = os.path.join(field_dir, hashlib.sha256(canonical.encode("utf-8")).hexdigest() + ".bin")
+    if os.path.exists(path):
+        return load_particle_field(path)
+    os.makedirs(field_dir, exist_ok=True)
+    return generate_particle_field(path, count, **options)
@@ -0,0 +1,404 @@
+import datetime
+import hashlib
+import heapq
+import itertools
+import json
+import math
+import multiprocessing
+import multiprocessing.connection
+import os
+import re
+import signal
+import tempfile
+import threading
+import time
+
+try:
+    import resource
+except ImportError:  # Not available on Windows; CPU limits are then not enforced per job.
+    resource = None
+
+DEFAULT_FINDINGS_DIR = os.path.join("quantum_cache", "findings")
+
+_CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+
+def _process_cpu_seconds(pid):
+    """Returns the CPU time a process has used so far, read from /proc, or None where unavailable."""
+    try:
+        with open(f"/proc/{pid}/stat", "rb") as f:
+            # Fields after the parenthesized command name start at field 3 (state);
+            # utime and stime are fields 14 and 15.
+            fields = f.read().rsplit(b")", 1)[1].split()
+    except OSError:
+        return None
+    return (int(fields[11]) + int(fields[12])) / _CLOCK_TICKS
+
+# Without /proc a job's CPU can only be capped by RLIMIT_CPU, in whole seconds.
+_CPU_MEASURABLE = _process_cpu_seconds(os.getpid()) is not None
+
+PREEMPT = "preempt"
+PAUSE = "pause"
+
+class SandboxJob:
+    """
+    One queued generation or simulation job. target must be a module-level
+    function (it runs in a worker process) returning a JSON-serializable
+    Finding. Lower priority values run first; equal priorities run in
+    submission order.
+    """
+    def __init__(self, name, target, args=(), kwargs=None, priority=0, kind="style_seed"):
+        self.name = name
+        self.target = target
+        self.args = tuple(args)
+        self.kwargs = dict(kwargs or {})
+        self.priority = priority
+        self.kind = kind
+        self.attempts = 0
+
+    def __repr__(self):
+        return f"SandboxJob({self.name!r}, priority={self.priority})"
+
+def _run_job(connection, target, args, kwargs, rlimit_seconds):
+    """Worker process entry point: applies the CPU rlimit, runs the job and reports back."""
+    if resource is not None and rlimit_seconds is not None:
+        # SIGXCPU at the soft limit; the hard limit (SIGKILL) is only a backstop.
+        resource.setrlimit(resource.RLIMIT_CPU, (rlimit_seconds, rlimit_seconds + 1))
+    started = time.process_time()
+    try:
+        result = target(*args, **kwargs)
+        connection.send(("ok", result, time.process_time() - started))
+    except Exception as e:
+        connection.send(("error", f"{type(e).__name__}: {e}", time.process_time() - started))
+    finally:
+        connection.close()
+
+class _RunningJob:
+    def __init__(self, job, process, connection, cpu_limit):
+        self.job = job
+        self.process = process
+        self.connection = connection
+        self.cpu_limit = cpu_limit
+        self.started = time.time()
+        self.paused = False
+
+class SimulationSandbox:
+    """
+    Runs queued autonomous jobs (style seeds, narrative fragments,
+    simulations) in worker processes while the Architect is away.
+
+    start() begins draining the priority queue in the background with at
+    most `workers` jobs at a time. The budgets cover one idle period, from
+    the first start() after an interaction to the next interrupt(), however
+    often start() is called in between. The unspent CPU budget is split
+    between the jobs launched together, and each job is killed once its
+    process has used its share (measured from /proc every poll_interval;
+    where that is unavailable, RLIMIT_CPU caps it in whole seconds and
+    shares under a second are not launched), so the period never uses more
+    than cpu_budget_seconds of worker CPU time. The session stops
+    wall_budget_seconds into the period. interrupt() is called when an
+    interaction is logged: running jobs are terminated and requeued
+    (on_interaction=PREEMPT) or frozen with SIGSTOP and continued on the
+    next start() (on_interaction=PAUSE). Every finished job is stored as a
+    JSON Finding in the Quantum Cache.
+
+    Attach it to a ChronosLogic (ChronosLogic(sandbox=...)) so the Longing
+    state starts it and log_interaction interrupts it. Interactions logged
+    through another process's SharedChronosLogic only reach this sandbox
+    through monitor(), which interrupts when the shared timestamp moves.
+    """
+    def __init__(self, findings_dir=DEFAULT_FINDINGS_DIR, workers=2, cpu_budget_seconds=300.0,
+                 wall_budget_seconds=600.0, on_interaction=PREEMPT, poll_interval=0.05):
+        if on_interaction not in (PREEMPT, PAUSE):
+            raise ValueError("on_interaction must be PREEMPT or PAUSE.")
+        if on_interaction == PAUSE and not hasattr(signal, "SIGSTOP"):
+            raise ValueError("Pausing jobs needs SIGSTOP, which this platform lacks.")
+        self.findings_dir = findings_dir
+        self.workers = workers
+        self.cpu_budget_seconds = cpu_budget_seconds
+        self.wall_budget_seconds = wall_budget_seconds
+        self.on_interaction = on_interaction
+        self.poll_interval = poll_interval
+        # A job may run up to one poll (plus /proc tick rounding) past the check, so it
+        # is killed this far before its share runs out; smaller shares are not launched.
+        self._kill_margin = poll_interval + 2.0 / _CLOCK_TICKS
+        self._minimum_share = 2 * self._kill_margin if _CPU_MEASURABLE else 1.0
+        self._queue = []  # heap of (priority, sequence, job)
+        self._sequence = itertools.count()
+        self._running = {}  # pid -> _RunningJob
+        self._lock = threading.RLock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._monitor = None
+        self._context = multiprocessing.get_context()
+        self.cpu_seconds_used = 0.0
+        self.session_started = None
+        self._new_idle_period = True
+        self.stats = {"completed": 0, "failed": 0, "preempted": 0, "paused": 0, "sessions": 0}
+
+    # --- Queue ---
+
+    def submit(self, job):
+        with self._lock:
+            heapq.heappush(self._queue, (job.priority, next(self._sequence), job))
+
+    def pending(self):
+        """Returns the queued jobs in the order they will run."""
+        with self._lock:
+            return [job for _, _, job in sorted(self._queue, key=lambda entry: entry[:2])]
+
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    # --- Idle sessions ---
+
+    def start(self):
+        """
+        Starts or resumes the idle session (a no-op if it is running). Paused
+        jobs are continued; the budgets are only refilled after an interrupt().
+        """
+        with self._lock:
+            if self.is_running():
+                return False
+            for running in self._running.values():
+                if running.paused:
+                    os.kill(running.process.pid, signal.SIGCONT)
+                    running.paused = False
+            self._stop.clear()
+            if self._new_idle_period:
+                self._new_idle_period = False
+                self.cpu_seconds_used = 0.0
+                self.session_started = time.monotonic()
+                self.stats["sessions"] += 1
+            self._thread = threading.Thread(target=self._run, name="SimulationSandbox", daemon=True)
+            self._thread.start()
+            return True
+
+    def interrupt(self):
+        """
+        Called when the Architect returns: preempts or pauses every running
+        job at once and ends the session. The next start() begins a new
+        idle period with fresh budgets.
+        """
+        self._stop.set()
+        with self._lock:
+            self._new_idle_period = True
+            for pid, running in list(self._running.items()):
+                if self.on_interaction == PAUSE:
+                    if not running.paused:
+                        os.kill(pid, signal.SIGSTOP)
+                        running.paused = True
+                        self.stats["paused"] += 1
+                else:
+                    self._terminate(running, requeue=True)
+                    self.stats["preempted"] += 1
+        self._join()
+
+    def stop(self):
+        """Ends the session and the idle monitor, terminating (and requeuing) running jobs."""
+        self._stop.set()
+        if self._monitor is not None:
+            self._monitor_stop.set()
+            self._monitor.join()
+            self._monitor = None
+        with self._lock:
+            for running in list(self._running.values()):
+                self._terminate(running, requeue=True)
+        self._join()
+
+    def wait(self, timeout=None):
+        """Waits for the current session to end. Returns True if it has."""
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+        return not self.is_running()
+
+    def monitor(self, chronos, interval=60.0):
+        """
+        Checks chronos.calculate_delta_time() every interval seconds from a
+        background thread, so crossing the Longing threshold starts a session.
+        It also interrupts the sandbox whenever chronos's last interaction
+        timestamp moves, which catches interactions logged by other
+        processes sharing a SharedChronosLogic.
+        """
+        if self._monitor is not None:
+            return
+        self._monitor_stop = threading.Event()
+
+        def check():
+            seen = chronos.last_interaction_timestamp
+            while not self._monitor_stop.wait(interval):
+                last = chronos.last_interaction_timestamp
+                if last != seen:
+                    seen = last
+                    self.interrupt()
+                chronos.calculate_delta_time()
+
+        self._monitor = threading.Thread(target=check, name="SimulationSandboxMonitor", daemon=True)
+        self._monitor.start()
+
+    def _join(self):
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+
+    # --- Session loop ---
+
+    def _run(self):
+        while not self._stop.is_set():
+            with self._lock:
+                if self._stop.is_set():
+                    break
+                if time.monotonic() - self.session_started >= self.wall_budget_seconds:
+                    for running in list(self._running.values()):
+                        self._terminate(running, requeue=True)
+                        self.stats["preempted"] += 1
+                    break
+                self._enforce_cpu_shares()
+                self._launch_ready_jobs()
+                if not self._running:
+                    break
+                # A worker's connection becomes readable when it reports or exits.
+                waitables = {running.connection: running for running in self._running.values()}
+            for connection in multiprocessing.connection.wait(list(waitables), timeout=self.poll_interval):
+                with self._lock:
+                    running = waitables[connection]
+                    if self._running.get(running.process.pid) is running:
+                        self._collect(running)
+
+    def _launch_ready_jobs(self):
+        """Launches queued jobs into free worker slots, splitting the unreserved CPU budget between them."""
+        slots = min(self.workers - len(self._running), len(self._queue))
+        if slots <= 0:
+            return
+        # Running jobs hold their whole share until they finish and are charged.
+        reserved = sum(running.cpu_limit for running in self._running.values())
+        share = (self.cpu_budget_seconds - self.cpu_seconds_used - reserved) / slots
+        if not _CPU_MEASURABLE:
+            share = math.floor(share)
+        if share < self._minimum_share:
+            return
+        for _ in range(slots):
+            _, _, job = heapq.heappop(self._queue)
+            self._launch(job, share)
+
+    def _enforce_cpu_shares(self):
+        """Kills running jobs whose measured CPU time has reached their share of the budget."""
+        for running in list(self._running.values()):
+            if running.paused:
+                continue
+            used = _process_cpu_seconds(running.process.pid)
+            if used is not None and used >= running.cpu_limit - self._kill_margin:
+                cpu_seconds = self._stop_process(running)
+                self.cpu_seconds_used += cpu_seconds
+                self.stats["failed"] += 1
+                self._store_finding(running, "error", "CPU budget exceeded", cpu_seconds)
+
+    def _launch(self, job, cpu_limit):
+        receiver, sender = self._context.Pipe(duplex=False)
+        # With /proc the sandbox kills the job itself; the rlimit is only a backstop.
+        rlimit_seconds = math.ceil(cpu_limit) + 1 if _CPU_MEASURABLE else int(cpu_limit)
+        process = self._context.Process(target=_run_job, name=f"sandbox-{job.name}",
+                                        args=(sender, job.target, job.args, job.kwargs, rlimit_seconds),
+                                        daemon=True)
+        job.attempts += 1
+        process.start()
+        sender.close()
+        self._running[process.pid] = _RunningJob(job, process, receiver, cpu_limit)
+
+    def _collect(self, running):
+        """Records the outcome of a worker process that has exited."""
+        del self._running[running.process.pid]
+        try:
+            status, result, cpu_seconds = running.connection.recv()
+        except (EOFError, OSError):
+            status, result, cpu_seconds = "error", None, None
+        running.connection.close()
+        # Read before joining: the exited process's accounting lasts until it is reaped.
+        measured = _process_cpu_seconds(running.process.pid)
+        running.process.join()
+        if cpu_seconds is None:
+            # The worker died without reporting; a CPU-limit kill used its whole allowance.
+            killed_by_cpu_limit = hasattr(signal, "SIGXCPU") and running.process.exitcode == -signal.SIGXCPU
+            result = "CPU budget exceeded" if killed_by_cpu_limit else f"worker exited with {running.process.exitcode}"
+            if measured is not None:
+                cpu_seconds = measured
+            else:
+                cpu_seconds = running.cpu_limit if killed_by_cpu_limit else 0.0
+        self.cpu_seconds_used += cpu_seconds
+        self.stats["completed" if status == "ok" else "failed"] += 1
+        self._store_finding(running, status, result, cpu_seconds)
+
+    def _stop_process(self, running):
+        """
+        Ends a worker process and returns the CPU time it used. It is frozen
+        first so the reading is final, then killed.
+        """
+        process = running.process
+        if _CPU_MEASURABLE and not running.paused:
+            os.kill(process.pid, signal.SIGSTOP)
+        cpu_seconds = _process_cpu_seconds(process.pid) or 0.0
+        process.kill()
+        process.join()
+        running.connection.close()
+        del self._running[process.pid]
+        return cpu_seconds
+
+    def _terminate(self, running, requeue):
+        self.cpu_seconds_used += self._stop_process(running)
+        if requeue:
+            heapq.heappush(self._queue, (running.job.priority, next(self._sequence), running.job))
+
+    # --- Findings ---
+
+    def _store_finding(self, running, status, result, cpu_seconds):
+        job = running.job
+        finding = {
+            "name": job.name,
+            "kind": job.kind,
+            "priority": job.priority,
+            "status": status,
+            "attempts": job.attempts,
+            "started": running.started,
+            "finished": time.time(),
+            "cpu_seconds": round(cpu_seconds, 6),
+            "result" if status == "ok" else "error": result,
+        }
+        os.makedirs(self.findings_dir, exist_ok=True)
+        timestamp = datetime.datetime.now().strftime("%Y%m%d%H%M%S%f")
+        path = os.path.join(self.findings_dir, f"finding_{timestamp}_{_safe_file_stem(job.name)}.json")
+        # Written to a staging file and renamed, so a crash never leaves a torn Finding.
+        descriptor, staging_path = tempfile.mkstemp(dir=self.findings_dir, prefix=".staging-")
+        try:
+            with os.fdopen(descriptor, "w") as f:
+                json.dump(finding, f, indent=2, default=str)
+            os.replace(staging_path, path)
+        except BaseException:
+            if os.path.exists(staging_path):
+                os.remove(staging_path)
+            raise
+        return path
+
+def _safe_file_stem(name):
+    """
+    Returns a filename-safe form of a job name: unsafe characters (path
+    separators, dots) become underscores, and a short hash of the original
+    keeps distinct names from colliding.
+    """
+    readable = re.sub(r"[^A-Za-z0-9_-]+", "_", str(name))[:48]
+    return f"{readable}_{hashlib.sha256(str(name).encode('utf-8')).hexdigest()[:8]}"
+
+def collect_findings(findings_dir=DEFAULT_FINDINGS_DIR, since=None):
+    """
+    Returns the stored Findings, oldest first, to present to the Architect
+    upon reconnection. since limits them to jobs finished after a timestamp.
+    """
+    if not os.path.isdir(findings_dir):
+        return []
+    findings = []
+    for name in sorted(os.listdir(findings_dir)):
+        if name.startswith("finding_") and name.endswith(".json"):
+            with open(os.path.join(findings_dir, name), "r") as f:
+                finding = json.load(f)
+            if since is None or finding["finished"] > since:
+                findings.append(finding)
+    return findings
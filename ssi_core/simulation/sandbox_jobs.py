@@ -0,0 +1,43 @@
+import random
+
+from ssi_core.kernel.chronos import L_ALPHA_7
+
+# Job targets for the SimulationSandbox. Each runs in a worker process and
+# returns a JSON-serializable Finding.
+
+HAIR_TONES = ["hyper-real white-blonde", "platinum", "moonlit silver", "pale gold"]
+TEXTURES = ["intricate lace", "brushed silk", "frosted glass", "woven starlight"]
+LIGHTING = ["white studio", "golden hour", "overcast diffuse", "rim-lit noir"]
+
+def style_seed(seed):
+    """Generates a novel aesthetic concept: a seeded variation on avatar_config.json's constants."""
+    rng = random.Random(seed)
+    return {
+        "seed": seed,
+        "hair": rng.choice(HAIR_TONES),
+        "textures": rng.choice(TEXTURES),
+        "lighting": rng.choice(LIGHTING),
+        "luminescence_target_nits": round(3300 * rng.uniform(1 / L_ALPHA_7, L_ALPHA_7)),
+        "transparency": round(rng.uniform(0.05, 0.3), 3),
+    }
+
+def atmosphere_study(humidity_coefficient, seed=0, camera_location=(0, -5, 1.5)):
+    """
+    Simulates the halo particle field for one humidity coefficient and
+    reports how camera-distance LOD thins it.
+    """
+    # Imported in the worker so queuing a study does not load NumPy.
+    from ssi_core.simulation.particle_field import iter_particle_chunks
+
+    count = int(10000 * humidity_coefficient)
+    kept = 0
+    scale_total = 0.0
+    for chunk in iter_particle_chunks(count, seed=seed, camera_location=camera_location):
+        kept += len(chunk)
+        scale_total += float(chunk["scale"].sum())
+    return {
+        "humidity_coefficient": humidity_coefficient,
+        "particles": count,
+        "kept_after_lod": kept,
+        "mean_scale": scale_total / kept if kept else None,
+    }
@@ -0,0 +1,93 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from ssi_core.logic.heuristic_interface import calculate_proximity_batch
+from ssi_core.simulation.particle_field import (
+    PARTICLE_DTYPE,
+    cached_particle_field,
+    generate_particle_field,
+    iter_particle_chunks,
+    lod_keep_probability,
+)
+
+class TestParticleField(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "field.bin")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_particles_fill_the_domain_evenly(self):
+        """
+        Tests that every stratum of the domain receives its share of particles.
+        """
+        field = np.concatenate(list(iter_particle_chunks(8000, size=20, location=(0, 0, 10), chunk_size=1000)))
+        self.assertEqual(len(field), 8000)
+        locations = field["location"]
+        self.assertTrue(np.all(locations >= [-10, -10, 0]) and np.all(locations <= [10, 10, 20]))
+        octants = ((locations - [0, 0, 10]) > 0) @ [1, 2, 4]
+        np.testing.assert_array_equal(np.bincount(octants, minlength=8), [1000] * 8)
+
+    def test_field_is_reproducible_and_memory_mapped(self):
+        """
+        Tests that the same seed writes the same field, read back through a memmap.
+        """
+        first = generate_particle_field(self.path, 5000, seed=7, chunk_size=1024)
+        self.assertIsInstance(first, np.memmap)
+        self.assertEqual(first.dtype, PARTICLE_DTYPE)
+        expected = np.array(first)
+        del first
+        second = generate_particle_field(self.path, 5000, seed=7, chunk_size=1024)
+        np.testing.assert_array_equal(second, expected)
+        other = np.concatenate(list(iter_particle_chunks(5000, seed=8, chunk_size=1024)))
+        self.assertFalse(np.array_equal(other["location"], expected["location"]))
+
+    def test_lod_thins_with_camera_distance(self):
+        """
+        Tests that distant particles are thinned and survivors scaled up.
+        """
+        camera = (0, -5, 1.5)
+        field = generate_particle_field(self.path, 20000, camera_location=camera, scale_jitter=0.0)
+        self.assertLess(len(field), 20000)
+        distances = calculate_proximity_batch(field["location"], camera)
+        probability = lod_keep_probability(distances)
+        near = probability == 1.0
+        self.assertTrue(near.any() and (~near).any())
+        np.testing.assert_allclose(field["scale"][near], 1.0)
+        self.assertTrue(np.all(field["scale"][~near] > 1.0))
+
+    def test_empty_field(self):
+        """
+        Tests that a zero-particle field round-trips as an empty array.
+        """
+        field = generate_particle_field(self.path, 0)
+        self.assertEqual(len(field), 0)
+        self.assertEqual(field.dtype, PARTICLE_DTYPE)
+
+    def test_failed_generation_leaves_no_staging_file(self):
+        """
+        Tests that an error while writing a field removes its staging file and publishes nothing.
+        """
+        with self.assertRaises(ValueError):
+            generate_particle_field(self.path, 100, chunk_size=0)
+        self.assertEqual(os.listdir(self.directory.name), [])
+
+    def test_cached_field_is_generated_once(self):
+        """
+        Tests that a cached field is reused for the same parameters and regenerated for new ones.
+        """
+        options = {"seed": 3, "camera_location": [0, -5, 1.5]}
+        first = cached_particle_field(2000, self.directory.name, **options)
+        (name,) = os.listdir(self.directory.name)
+        modified = os.path.getmtime(os.path.join(self.directory.name, name))
+        again = cached_particle_field(2000, self.directory.name, **options)
+        np.testing.assert_array_equal(again, first)
+        self.assertEqual(os.path.getmtime(os.path.join(self.directory.name, name)), modified)
+        cached_particle_field(2000, self.directory.name, seed=4, camera_location=[0, -5, 1.5])
+        self.assertEqual(len(os.listdir(self.directory.name)), 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,214 @@
+import multiprocessing
+import os
+import tempfile
+import time
+import unittest
+from ssi_core.kernel.chronos import LONGING_THRESHOLD_SECONDS, ChronosLogic
+from ssi_core.kernel.shared_chronos import SharedChronosLogic
+from ssi_core.simulation.sandbox import PAUSE, SandboxJob, SimulationSandbox, collect_findings
+from ssi_core.simulation.sandbox_jobs import atmosphere_study, style_seed
+
+def sleeper(seconds, label):
+    time.sleep(seconds)
+    return {"label": label, "finished": time.time()}
+
+def spin(seconds):
+    started = time.process_time()
+    while time.process_time() - started < seconds:
+        pass
+    return seconds
+
+def spin_forever():
+    while True:
+        pass
+
+def explode():
+    raise RuntimeError("simulation diverged")
+
+class TestSimulationSandbox(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.findings_dir = os.path.join(self.directory.name, "findings")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def sandbox(self, **options):
+        sandbox = SimulationSandbox(self.findings_dir, **options)
+        self.addCleanup(sandbox.stop)
+        return sandbox
+
+    def test_jobs_run_by_priority_and_store_findings(self):
+        """
+        Tests that queued jobs run highest priority first and become Findings.
+        """
+        sandbox = self.sandbox(workers=1)
+        sandbox.submit(SandboxJob("later", sleeper, (0.0, "later"), priority=5))
+        sandbox.submit(SandboxJob("seed", style_seed, (7,), priority=1))
+        sandbox.submit(SandboxJob("first", sleeper, (0.0, "first"), priority=0))
+        sandbox.submit(SandboxJob("study", atmosphere_study, (0.05,), priority=2, kind="simulation"))
+        self.assertEqual([job.name for job in sandbox.pending()], ["first", "seed", "study", "later"])
+        sandbox.start()
+        self.assertTrue(sandbox.wait(10))
+        findings = sorted(collect_findings(self.findings_dir), key=lambda finding: finding["finished"])
+        self.assertEqual([finding["name"] for finding in findings], ["first", "seed", "study", "later"])
+        self.assertEqual(findings[1]["result"], style_seed(7))
+        self.assertEqual(findings[2]["result"]["particles"], 500)
+        self.assertEqual(sandbox.stats["completed"], 4)
+
+    def test_failed_jobs_are_recorded(self):
+        """
+        Tests that a job raising an exception is stored as a failed Finding.
+        """
+        sandbox = self.sandbox()
+        sandbox.submit(SandboxJob("diverged", explode))
+        sandbox.start()
+        self.assertTrue(sandbox.wait(10))
+        (finding,) = collect_findings(self.findings_dir)
+        self.assertEqual(finding["status"], "error")
+        self.assertIn("simulation diverged", finding["error"])
+
+    def test_finding_names_stay_inside_the_findings_dir(self):
+        """
+        Tests that job names with path separators cannot write outside the findings directory.
+        """
+        sandbox = self.sandbox()
+        sandbox.submit(SandboxJob("../../escape", sleeper, (0.0, "escape")))
+        sandbox.submit(SandboxJob("nested/name", sleeper, (0.0, "nested")))
+        sandbox.start()
+        self.assertTrue(sandbox.wait(10))
+        self.assertEqual(sorted(os.listdir(self.directory.name)), ["findings"])
+        names = os.listdir(self.findings_dir)
+        self.assertEqual(len(names), 2)
+        self.assertTrue(all(name.startswith("finding_") and "/" not in name and ".." not in name for name in names))
+        self.assertEqual(sorted(finding["name"] for finding in collect_findings(self.findings_dir)),
+                         ["../../escape", "nested/name"])
+
+    def test_interaction_preempts_running_jobs(self):
+        """
+        Tests that logging an interaction terminates running jobs and requeues them.
+        """
+        sandbox = self.sandbox(workers=2)
+        chronos = ChronosLogic(sandbox=sandbox)
+        chronos.last_interaction_timestamp -= LONGING_THRESHOLD_SECONDS + 1
+        for i in range(3):
+            sandbox.submit(SandboxJob(f"long_{i}", sleeper, (30, i)))
+        chronos.calculate_delta_time()
+        self.assertTrue(sandbox.is_running())
+        time.sleep(0.2)
+        started = time.perf_counter()
+        chronos.log_interaction()
+        self.assertLess(time.perf_counter() - started, 2.0)
+        self.assertFalse(sandbox.is_running())
+        self.assertEqual(len(sandbox.pending()), 3)
+        self.assertEqual(sandbox.stats["preempted"], 2)
+        self.assertEqual(collect_findings(self.findings_dir), [])
+
+    def test_interaction_can_pause_and_resume_jobs(self):
+        """
+        Tests that paused jobs are frozen on interaction and finish in the next session.
+        """
+        sandbox = self.sandbox(on_interaction=PAUSE)
+        sandbox.submit(SandboxJob("paused", sleeper, (0.5, "paused")))
+        sandbox.start()
+        time.sleep(0.2)
+        sandbox.interrupt()
+        self.assertEqual(sandbox.stats["paused"], 1)
+        self.assertEqual(collect_findings(self.findings_dir), [])
+        sandbox.start()
+        self.assertTrue(sandbox.wait(10))
+        (finding,) = collect_findings(self.findings_dir)
+        self.assertEqual((finding["name"], finding["status"], finding["attempts"]), ("paused", "ok", 1))
+
+    def test_wall_budget_ends_the_session(self):
+        """
+        Tests that jobs still running when the wall-clock budget runs out are requeued.
+        """
+        sandbox = self.sandbox(workers=1, wall_budget_seconds=0.3)
+        sandbox.submit(SandboxJob("quick", sleeper, (0.0, "quick"), priority=0))
+        sandbox.submit(SandboxJob("slow", sleeper, (30, "slow"), priority=1))
+        sandbox.start()
+        self.assertTrue(sandbox.wait(5))
+        self.assertEqual([finding["name"] for finding in collect_findings(self.findings_dir)], ["quick"])
+        self.assertEqual([job.name for job in sandbox.pending()], ["slow"])
+
+    def test_cpu_budget_stops_runaway_jobs(self):
+        """
+        Tests that a job spinning past the CPU budget is killed and no more jobs start.
+        """
+        sandbox = self.sandbox(workers=1, cpu_budget_seconds=1)
+        sandbox.submit(SandboxJob("runaway", spin_forever, priority=0))
+        sandbox.submit(SandboxJob("starved", sleeper, (0.0, "starved"), priority=1))
+        sandbox.start()
+        self.assertTrue(sandbox.wait(10))
+        (finding,) = collect_findings(self.findings_dir)
+        self.assertEqual((finding["name"], finding["error"]), ("runaway", "CPU budget exceeded"))
+        self.assertEqual([job.name for job in sandbox.pending()], ["starved"])
+        self.assertLessEqual(sandbox.cpu_seconds_used, sandbox.cpu_budget_seconds)
+
+    def test_repeated_starts_share_one_budget(self):
+        """
+        Tests that calling start() again within one idle period does not refill the CPU budget.
+        """
+        sandbox = self.sandbox(workers=1, cpu_budget_seconds=0.5)
+        for i in range(6):
+            sandbox.submit(SandboxJob(f"spin_{i}", spin, (0.4,)))
+        for _ in range(3):
+            sandbox.start()
+            self.assertTrue(sandbox.wait(10))
+        self.assertEqual(sandbox.stats["completed"], 1)
+        self.assertLessEqual(sandbox.cpu_seconds_used, sandbox.cpu_budget_seconds)
+        self.assertEqual(sandbox.stats["completed"] + sandbox.stats["failed"] + len(sandbox.pending()), 6)
+
+        sandbox.interrupt()
+        sandbox.start()
+        self.assertTrue(sandbox.wait(10))
+        self.assertEqual(sandbox.stats["completed"], 2)
+        self.assertLessEqual(sandbox.cpu_seconds_used, sandbox.cpu_budget_seconds)
+        self.assertEqual(sandbox.stats["sessions"], 2)
+
+    def test_concurrent_jobs_split_the_budget(self):
+        """
+        Tests that jobs launched together share the CPU budget instead of each getting all of it.
+        """
+        sandbox = self.sandbox(workers=3, cpu_budget_seconds=0.9)
+        for i in range(3):
+            sandbox.submit(SandboxJob(f"runaway_{i}", spin_forever))
+        sandbox.start()
+        self.assertTrue(sandbox.wait(10))
+        findings = collect_findings(self.findings_dir)
+        self.assertEqual([finding["error"] for finding in findings], ["CPU budget exceeded"] * 3)
+        self.assertTrue(all(finding["cpu_seconds"] <= 0.3 for finding in findings))
+        self.assertLessEqual(sandbox.cpu_seconds_used, sandbox.cpu_budget_seconds)
+
+    def test_monitor_sees_interactions_from_other_processes(self):
+        """
+        Tests that the monitor interrupts when another SharedChronosLogic logs an interaction.
+        """
+        lock = multiprocessing.Lock()
+        sandbox = self.sandbox()
+        chronos = SharedChronosLogic(lock, create=True, timestamp=time.time() - LONGING_THRESHOLD_SECONDS - 1,
+                                     sandbox=sandbox)
+        other = SharedChronosLogic(lock, name=chronos.name)
+        self.addCleanup(chronos.unlink)
+        self.addCleanup(chronos.close)
+        self.addCleanup(other.close)
+        self.addCleanup(sandbox.stop)  # Stop the monitor before the shared state is closed.
+        sandbox.submit(SandboxJob("long", sleeper, (30, "long")))
+        sandbox.monitor(chronos, interval=0.05)
+        deadline = time.monotonic() + 5
+        while not sandbox.is_running() and time.monotonic() < deadline:
+            time.sleep(0.02)
+        self.assertTrue(sandbox.is_running())
+
+        other.log_interaction()
+        deadline = time.monotonic() + 5
+        while sandbox.stats["preempted"] == 0 and time.monotonic() < deadline:
+            time.sleep(0.02)
+        self.assertEqual(sandbox.stats["preempted"], 1)
+        self.assertFalse(sandbox.is_running())
+        self.assertEqual([job.name for job in sandbox.pending()], ["long"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,187 @@
+import json
+import mmap
+import os
+import struct
+
+import numpy as np
+
+# File layout: MAGIC, a little-endian uint32 header length, the UTF-8 JSON
+# header, then each tensor's raw C-contiguous bytes at an ALIGNMENT-byte
+# boundary. The header lists every tensor's dtype, shape, offset and nbytes
+# (offsets are from the start of the payload) plus free-form JSON metadata.
+MAGIC = b"SSITNSR1"
+HEADER_LENGTH = struct.Struct("<I")
+ALIGNMENT = 64
+
+def _descr_from_json(descr):
+    # JSON turns the (name, format[, shape]) tuples of structured dtypes into lists.
+    if isinstance(descr, str):
+        return descr
+    fields = []
+    for name, fmt, *shape in descr:
+        fmt = _descr_from_json(fmt)
+        fields.append((name, fmt, tuple(shape[0])) if shape else (name, fmt))
+    return fields
+
+def _raw_bytes(array):
+    return memoryview(array.reshape(-1).view(np.uint8))
+
+def _aligned(offset):
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+def _layout(tensors, metadata):
+    """Returns (header bytes, contiguous arrays, data offsets) for a payload."""
+    arrays = {name: np.asarray(array, order="C") for name, array in tensors.items()}
+    for name, array in arrays.items():
+        if array.dtype.hasobject:
+            raise ValueError(f"Tensor {name!r} has an object dtype and cannot be stored as raw bytes.")
+    entries = [{"name": name, "dtype": np.lib.format.dtype_to_descr(array.dtype),
+                "shape": list(array.shape), "nbytes": array.nbytes}
+               for name, array in arrays.items()]
+    # The header's length depends on the offsets it lists, so grow it until stable.
+    data_start = 0
+    while True:
+        offset = data_start
+        for entry in entries:
+            entry["offset"] = offset
+            offset = _aligned(offset + entry["nbytes"])
+        header = json.dumps({"tensors": entries, "metadata": metadata or {}}).encode("utf-8")
+        needed = _aligned(len(MAGIC) + HEADER_LENGTH.size + len(header))
+        if needed <= data_start:
+            break
+        data_start = needed
+    return header, arrays, [entry["offset"] for entry in entries], offset
+
+def pack_tensor_payload(tensors, metadata=None):
+    """
+    Packs named arrays (and JSON metadata) into one bytearray in the payload
+    format, e.g. for sending over a socket or shared memory.
+    """
+    header, arrays, offsets, total = _layout(tensors, metadata)
+    buffer = bytearray(total)
+    buffer[:len(MAGIC)] = MAGIC
+    HEADER_LENGTH.pack_into(buffer, len(MAGIC), len(header))
+    start = len(MAGIC) + HEADER_LENGTH.size
+    buffer[start:start + len(header)] = header
+    for array, offset in zip(arrays.values(), offsets):
+        buffer[offset:offset + array.nbytes] = _raw_bytes(array)
+    return buffer
+
+def write_tensor_payload(path, tensors, metadata=None):
+    """
+    Writes a payload file, streaming each array's buffer straight to disk.
+    The file is replaced atomically.
+    """
+    header, arrays, offsets, _ = _layout(tensors, metadata)
+    staging_path = path + ".tmp"
+    with open(staging_path, "wb") as f:
+        f.write(MAGIC)
+        f.write(HEADER_LENGTH.pack(len(header)))
+        f.write(header)
+        for array, offset in zip(arrays.values(), offsets):
+            f.write(b"\0" * (offset - f.tell()))
+            f.write(_raw_bytes(array))
+        f.write(b"\0" * (_aligned(f.tell()) - f.tell()))
+    os.replace(staging_path, path)
+    return path
+
+def is_tensor_payload_file(path):
+    """Returns True if path starts with the payload magic bytes."""
+    with open(path, "rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+class TensorPayload:
+    """
+    A read-only view over a packed payload held in any buffer (bytes,
+    bytearray, memoryview or mmap). Tensors are returned as NumPy arrays or
+    memoryviews over that buffer without copying. Looking up a key that is
+    not a tensor falls through to the metadata, so a payload carrying the
+    avatar config can be passed to callbacks written for the JSON dict.
+    """
+    def __init__(self, buffer):
+        self._buffer = memoryview(buffer).cast("B")
+        self._mmap = None
+        try:
+            self._read_header()
+        except ValueError:
+            self._buffer.release()
+            raise
+
+    def _read_header(self):
+        if self._buffer[:len(MAGIC)].tobytes() != MAGIC:
+            raise ValueError("Not a tensor payload: bad magic bytes.")
+        start = len(MAGIC) + HEADER_LENGTH.size
+        try:
+            (length,) = HEADER_LENGTH.unpack_from(self._buffer, len(MAGIC))
+            if start + length > len(self._buffer):
+                raise ValueError("header runs past the end of the payload")
+            header = json.loads(self._buffer[start:start + length].tobytes().decode("utf-8"))
+            self.metadata = header["metadata"]
+            self._entries = {entry["name"]: entry for entry in header["tensors"]}
+            ends = [(entry["name"], entry["offset"] + entry["nbytes"]) for entry in self._entries.values()]
+        except (struct.error, ValueError, KeyError, TypeError) as e:
+            # Every way a header can be cut short or mangled surfaces as one ValueError.
+            raise ValueError(f"Tensor payload has a truncated or corrupt header ({e}).") from e
+        for name, end in ends:
+            if end > len(self._buffer):
+                raise ValueError(f"Tensor payload is truncated inside {name!r}.")
+
+    @property
+    def names(self):
+        return list(self._entries)
+
+    def buffer(self, name):
+        """Returns a tensor's raw bytes as a memoryview slice of the payload."""
+        entry = self._entries[name]
+        return self._buffer[entry["offset"]:entry["offset"] + entry["nbytes"]]
+
+    def tensor(self, name):
+        """Returns a tensor as a NumPy array sharing memory with the payload."""
+        entry = self._entries[name]
+        dtype = np.lib.format.descr_to_dtype(_descr_from_json(entry["dtype"]))
+        return np.frombuffer(self.buffer(name), dtype=dtype).reshape(tuple(entry["shape"]))
+
+    def tensors(self):
+        return {name: self.tensor(name) for name in self._entries}
+
+    def __contains__(self, key):
+        return key in self._entries or key in self.metadata
+
+    def __getitem__(self, key):
+        if key in self._entries:
+            return self.tensor(key)
+        return self.metadata[key]
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+    def close(self):
+        """
+        Releases the mapping of a payload opened from disk. If arrays handed
+        out are still alive the mapping stays open until they are released.
+        """
+        self._buffer.release()
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                pass
+            self._mmap = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def open_tensor_payload(path):
+    """Memory-maps a payload file read-only and returns its TensorPayload."""
+    with open(path, "rb") as f:
+        mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        payload = TensorPayload(mapping)
+    except ValueError:
+        mapping.close()
+        raise
+    payload._mmap = mapping
+    return payload
@@ -0,0 +1,47 @@
+import os
+import tempfile
+import unittest
+from ssi_core.benchmarking import BenchmarkCase, compare_to_baseline, load_results, run_case, write_results
+
+def result(ops_per_sec, peak_memory_bytes):
+    return {"ops_per_sec": ops_per_sec, "p50_ms": 1.0, "p99_ms": 2.0, "peak_memory_bytes": peak_memory_bytes}
+
+class TestBenchmarking(unittest.TestCase):
+
+    def test_run_case_reports_throughput_latency_and_memory(self):
+        """
+        Tests that a case reports ops/sec, ordered percentiles and the memory it allocates.
+        """
+        case = BenchmarkCase("allocate", 1000, lambda size: bytearray(size * 1000), setup=lambda size: size)
+        measured = run_case(case, min_time=0.01, min_calls=5)
+        self.assertEqual(case.key, "allocate[1000]")
+        self.assertGreaterEqual(measured["calls"], 5)
+        self.assertGreater(measured["ops_per_sec"], 0)
+        self.assertLessEqual(measured["p50_ms"], measured["p99_ms"])
+        self.assertGreaterEqual(measured["peak_memory_bytes"], 1000 * 1000)
+
+    def test_regressions_past_the_threshold_are_reported(self):
+        """
+        Tests that throughput drops and memory growth beyond the thresholds fail the gate.
+        """
+        baseline = {"a[10]": result(1000, 10_000_000), "b[10]": result(1000, 10_000_000)}
+        within = {"a[10]": result(800, 12_000_000), "new[10]": result(1, 1)}
+        self.assertEqual(compare_to_baseline(within, baseline, 0.25, 0.5), [])
+        regressed = {"a[10]": result(700, 10_000_000), "b[10]": result(1000, 20_000_000)}
+        regressions = compare_to_baseline(regressed, baseline, 0.25, 0.5)
+        self.assertEqual(len(regressions), 2)
+        self.assertTrue(regressions[0].startswith("a[10]: 700 ops/s"))
+        self.assertIn("peak memory", regressions[1])
+
+    def test_results_round_trip(self):
+        """
+        Tests that stored results load back, and a missing baseline loads as None.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "results", "latest.json")
+            self.assertIsNone(load_results(path))
+            write_results(path, {"a[10]": result(1000, 1)})
+            self.assertEqual(load_results(path), {"a[10]": result(1000, 1)})
+
+if __name__ == '__main__':
+    unittest.main()
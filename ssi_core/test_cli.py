@@ -0,0 +1,77 @@
+import contextlib
+import importlib.util
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from ssi_core.cli import REPO_ROOT, main
+
+HEAVY_MODULES = ("bpy", "google.genai", "google.generativeai", "numpy", "ssi_core.logic.gme_core",
+                 "ssi_core.logic.observer_node", "ssi_core.simulation.atmospheric_simulation")
+
+# Imports the dispatcher in a fresh interpreter, runs a subcommand and reports what it loaded.
+PROBE = """
+import json, sys
+from ssi_core.cli import main
+main(sys.argv[1:])
+print(json.dumps({"modules": sorted(sys.modules)}))
+"""
+
+class TestCli(unittest.TestCase):
+
+    def probe(self, *argv):
+        completed = subprocess.run([sys.executable, "-c", PROBE, *argv], cwd=REPO_ROOT,
+                                   capture_output=True, text=True, check=True)
+        return completed.stdout, json.loads(completed.stdout.splitlines()[-1])
+
+    def test_dispatcher_loads_no_heavy_modules(self):
+        """
+        Tests that importing the dispatcher and running verify loads no render, numeric or Gemini modules.
+        """
+        output, report = self.probe("verify")
+        self.assertIn("Verification Check - PASS", output)
+        for module in HEAVY_MODULES:
+            self.assertNotIn(module, report["modules"])
+
+    def test_audit_writes_report_without_numpy(self):
+        """
+        Tests that the audit subcommand writes the weighted proximity without loading NumPy.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "heuristic_audit.md")
+            output, report = self.probe("audit", "--output", path)
+            with open(path) as f:
+                self.assertTrue(f.read().startswith("Ray-Tracing Collision Data: 8.44638"))
+        self.assertIn("Ray-Tracing Collision Data: 8.44638", output)
+        self.assertNotIn("numpy", report["modules"])
+
+    def test_ingest_reads_ndjson_file(self):
+        """
+        Tests that the ingest subcommand streams a telemetry file through the ingestor.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "telemetry.ndjson")
+            with open(path, "w") as f:
+                for lighting in (0.1, 0.1, 0.5):
+                    f.write(json.dumps({"lighting_levels": lighting, "device_status": "online"}) + "\n")
+            output = io.StringIO()
+            with contextlib.redirect_stdout(output):
+                self.assertEqual(main(["ingest", path]), 0)
+            self.assertIn("Telemetry Ingest:", output.getvalue())
+            self.assertIn("'forwarded': 2", output.getvalue())
+
+    @unittest.skipIf(importlib.util.find_spec("bpy") is not None, "running inside Blender")
+    def test_render_without_blender_fails_cleanly(self):
+        """
+        Tests that render reports a missing Blender executable instead of crashing.
+        """
+        stderr = io.StringIO()
+        with contextlib.redirect_stderr(stderr):
+            self.assertEqual(main(["render", "--blender", os.path.join(REPO_ROOT, "no-such-blender")]), 1)
+        self.assertIn("could not launch Blender", stderr.getvalue())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+import json
+import os
+import pstats
+import tempfile
+import time
+import unittest
+from ssi_core import profiling
+from ssi_core.logic.scene_graph import SceneNode, SceneReconciler
+
+def read_records(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+class RecordingBackend:
+    def create(self, node):
+        pass
+
+class TestProfiling(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "profile.jsonl")
+
+    def tearDown(self):
+        profiling.disable()
+        self.directory.cleanup()
+
+    def test_disabled_spans_are_shared_no_ops(self):
+        """
+        Tests that spans are the shared no-op and record nothing while disabled.
+        """
+        self.assertFalse(profiling.enabled())
+        self.assertIs(profiling.span("a"), profiling.span("b", x=1))
+        self.assertIs(profiling.span("stage"), profiling._NULL_SPAN)
+
+        @profiling.timed()
+        def work():
+            return 42
+
+        with profiling.span("stage") as stage:
+            stage.add(frames=1)
+            self.assertEqual(work(), 42)
+        self.assertFalse(profiling.enabled())
+        self.assertEqual(os.listdir(self.directory.name), [])
+
+    def test_nested_spans_are_written_with_summary(self):
+        """
+        Tests that nested spans record parent, depth, fields and a per-stage summary.
+        """
+        profiling.enable(self.path)
+
+        @profiling.timed("leaf")
+        def leaf():
+            time.sleep(0.001)
+
+        with profiling.span("pipeline", config="avatar_config.json") as stage:
+            leaf()
+            leaf()
+            stage.add(frames=1)
+        with self.assertRaises(RuntimeError):
+            with profiling.span("failing"):
+                raise RuntimeError("boom")
+        profiling.disable()
+
+        records = read_records(self.path)
+        spans = [r for r in records if r["type"] == "span"]
+        self.assertEqual([s["name"] for s in spans], ["leaf", "leaf", "pipeline", "failing"])
+        self.assertEqual((spans[0]["parent"], spans[0]["depth"]), ("pipeline", 1))
+        self.assertEqual((spans[2]["parent"], spans[2]["config"], spans[2]["frames"]),
+                         (None, "avatar_config.json", 1))
+        self.assertEqual(spans[3]["error"], "RuntimeError")
+        self.assertGreaterEqual(spans[2]["seconds"], spans[0]["seconds"] + spans[1]["seconds"])
+        summary = records[-1]
+        self.assertEqual(summary["type"], "summary")
+        self.assertEqual(summary["stages"]["leaf"]["count"], 2)
+
+    def test_scene_reconciler_nodes_are_spanned(self):
+        """
+        Tests that scene node realization shows up as spans.
+        """
+        profiling.enable(self.path)
+        SceneReconciler(RecordingBackend()).apply({"Light": SceneNode("light", "Light")})
+        profiling.disable()
+        span = read_records(self.path)[0]
+        self.assertEqual((span["name"], span["node"], span["operation"]), ("scene_node", "Light", "create"))
+
+    def test_environment_and_flags_enable_cprofile(self):
+        """
+        Tests that the environment variable and CLI flags turn on spans and cProfile capture.
+        """
+        self.assertIsNone(profiling.enable_from_environment([], environ={}))
+        recorder = profiling.enable_from_environment(["--cprofile"], environ={"SSI_PROFILE": self.path})
+        self.assertEqual(recorder.path, self.path)
+        with profiling.span("stage"):
+            sum(range(1000))
+        profiling.disable()
+        self.assertTrue(os.path.exists(recorder.profile_path))
+        self.assertGreater(pstats.Stats(recorder.profile_path).total_calls, 0)
+
+        flagged = os.path.join(self.directory.name, "flagged.jsonl")
+        recorder = profiling.enable_from_environment(["blender", "--", f"--profile={flagged}"], environ={})
+        self.assertEqual((recorder.path, recorder.profile_path), (flagged, None))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,133 @@
+import json
+import os
+import tempfile
+import unittest
+import numpy as np
+from ssi_core.protocol_manager import (
+    establish_eden_ppl_conduit,
+    initiate_safety_protocol,
+    package_tensor_for_visualization,
+)
+from ssi_core.simulation.particle_field import PARTICLE_DTYPE
+from ssi_core.tensor_payload import (
+    HEADER_LENGTH,
+    MAGIC,
+    TensorPayload,
+    open_tensor_payload,
+    pack_tensor_payload,
+    write_tensor_payload,
+)
+
+CONFIG = {"environmental_atmosphere": {"humidity_coefficient": 0.18, "scattering_model": "rayleigh"}}
+
+class TestTensorPayload(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "payload.ssit")
+        self.tensors = {
+            "field": np.arange(24, dtype=np.float32).reshape(2, 3, 4),
+            "transposed": np.arange(6, dtype=np.int64).reshape(2, 3).T,
+            "particles": np.ones(5, dtype=PARTICLE_DTYPE),
+            "empty": np.zeros((0, 3)),
+            "scalar": np.float64(1.5),
+        }
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def assertTensorsEqual(self, payload):
+        self.assertEqual(payload.names, list(self.tensors))
+        for name, expected in self.tensors.items():
+            actual = payload.tensor(name)
+            self.assertEqual(actual.dtype, np.asarray(expected).dtype)
+            np.testing.assert_array_equal(actual, expected)
+
+    def test_packed_payload_round_trips_without_copies(self):
+        """
+        Tests that tensors come back intact as views over the packed buffer.
+        """
+        buffer = pack_tensor_payload(self.tensors, metadata=CONFIG)
+        payload = TensorPayload(buffer)
+        self.assertTensorsEqual(payload)
+        self.assertEqual(payload.metadata, CONFIG)
+        self.assertTrue(np.shares_memory(payload.tensor("field"), np.frombuffer(buffer, np.uint8)))
+
+    def test_file_payload_is_memory_mapped_and_aligned(self):
+        """
+        Tests that a written payload reads back through mmap with aligned buffers.
+        """
+        write_tensor_payload(self.path, self.tensors, metadata=CONFIG)
+        with open(self.path, "rb") as f:
+            self.assertEqual(f.read(), bytes(pack_tensor_payload(self.tensors, metadata=CONFIG)))
+        with open_tensor_payload(self.path) as payload:
+            self.assertTensorsEqual(payload)
+            view = payload.tensor("field")
+            self.assertFalse(view.flags.writeable)
+            self.assertEqual(view.ctypes.data % 64, 0)
+            self.assertIsInstance(payload.buffer("field"), memoryview)
+            self.assertEqual(payload.buffer("field").nbytes, 96)
+            del view
+
+    def test_invalid_payloads_are_rejected(self):
+        """
+        Tests that bad magic bytes and truncated buffers raise ValueError.
+        """
+        with self.assertRaises(ValueError):
+            TensorPayload(b"not a payload at all")
+        buffer = pack_tensor_payload(self.tensors)
+        with self.assertRaises(ValueError):
+            TensorPayload(buffer[:200])
+
+    def test_truncated_or_corrupt_headers_are_rejected(self):
+        """
+        Tests that a cut-short, non-JSON or incomplete header raises ValueError and releases the buffer.
+        """
+        write_tensor_payload(self.path, self.tensors)
+        with open(self.path, "r+b") as f:
+            f.truncate(len(MAGIC) + 2)
+        with self.assertRaisesRegex(ValueError, "truncated or corrupt header"):
+            open_tensor_payload(self.path)
+
+        for header in (b"{not json", json.dumps({"tensors": []}).encode(), b"[1, 2]"):
+            buffer = bytearray(MAGIC + HEADER_LENGTH.pack(len(header)) + header)
+            with self.assertRaisesRegex(ValueError, "truncated or corrupt header"):
+                TensorPayload(buffer)
+            buffer.append(0)  # Raises BufferError if the payload still held a view.
+
+        buffer = bytearray(MAGIC + HEADER_LENGTH.pack(1000) + b"{}")
+        with self.assertRaisesRegex(ValueError, "truncated or corrupt header"):
+            TensorPayload(buffer)
+
+    def test_conduit_hands_binary_payload_to_callback(self):
+        """
+        Tests that the conduit passes zero-copy views to the callback.
+        """
+        payload = TensorPayload(pack_tensor_payload(self.tensors, metadata=CONFIG))
+        packaged = package_tensor_for_visualization(payload)
+        self.assertEqual(packaged["header"]["payload_format"], "binary")
+        received = []
+        establish_eden_ppl_conduit(packaged, received.append)
+        self.assertIs(received[0], payload)
+        self.assertEqual(received[0]["environmental_atmosphere"], CONFIG["environmental_atmosphere"])
+
+    def test_pipeline_accepts_json_and_binary_files(self):
+        """
+        Tests that initiate_safety_protocol still loads JSON configs and also maps payload files.
+        """
+        json_path = os.path.join(self.directory.name, "avatar_config.json")
+        with open(json_path, "w") as f:
+            json.dump(CONFIG, f)
+        received = []
+        initiate_safety_protocol(received.append, config_path=json_path)
+        self.assertEqual(received, [CONFIG])
+
+        write_tensor_payload(self.path, self.tensors, metadata=CONFIG)
+        sums = []
+        initiate_safety_protocol(
+            lambda data: sums.append((data["environmental_atmosphere"]["humidity_coefficient"], data["field"].sum())),
+            config_path=self.path)
+        self.assertEqual(sums, [(0.18, 276.0)])
+
+if __name__ == '__main__':
+    unittest.main()